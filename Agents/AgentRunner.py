@@ -0,0 +1,118 @@
+import asyncio
+import logging
+
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class AgentRunner:
+    """
+    Run LLM agents concurrently using their asynchronous (aexecute_agent) entry points.
+    """
+
+    @staticmethod
+    async def score_jobs(agent, job_descriptions: List[str], resume_text: str,
+                         max_concurrency: int = 5) -> List[Optional[Dict[str, Any]]]:
+        """
+            Score many job descriptions with one agent, keeping at most max_concurrency calls in flight.
+
+            Args:
+                agent: Any agent exposing aexecute_agent (Gemini, OpenAI or Claude)
+                job_descriptions: The job descriptions to score
+                resume_text: All the content of your resume
+                max_concurrency: Maximum number of simultaneous LLM requests
+
+            Returns:
+                List of scoring dictionaries (or None for failed calls) in the same order as job_descriptions
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def score(index: int, job_description: str):
+            async with semaphore:
+                logger.info("Scoring job %s of %s", index + 1, len(job_descriptions))
+                return await agent.aexecute_agent(job_description, resume_text)
+
+        # gather keeps the results in the same order as the input
+        return await asyncio.gather(*(score(i, d) for i, d in enumerate(job_descriptions)))
+
+    @staticmethod
+    def run_score_jobs(agent, job_descriptions: List[str], resume_text: str,
+                       max_concurrency: int = 5) -> List[Optional[Dict[str, Any]]]:
+        """
+            Synchronous wrapper around score_jobs for scripts that are not running an event loop.
+        """
+        return asyncio.run(AgentRunner.score_jobs(agent, job_descriptions, resume_text, max_concurrency))
+
+    @staticmethod
+    async def _call_with_timeout(name: str, agent, job_description: str, resume_text: str,
+                                 timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        """
+            Run one provider call, returning None instead of raising when it fails or times out.
+
+            An agent whose rate limiter has a call_timeout is not timed here: the limiter bounds every
+            attempt and retries it, while the time spent waiting for quota or backing off is not limited.
+        """
+        rate_limiter = getattr(agent, 'rate_limiter', None)
+        if rate_limiter is not None and rate_limiter.call_timeout is not None:
+            timeout = None
+
+        try:
+            return await asyncio.wait_for(agent.aexecute_agent(job_description, resume_text), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s agent timed out after %s seconds", name, timeout)
+            return None
+        except Exception as e:
+            logger.warning("%s agent failed: %s", name, e)
+            return None
+
+    @staticmethod
+    async def fan_out(agents: Dict[str, Any], job_description: str, resume_text: str,
+                      timeout: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+            Send the same job to every agent at the same time.
+
+            Args:
+                agents: Mapping of provider name to agent, e.g. {'gemini': GeminiLLMAgent()}
+                job_description: The job description
+                resume_text: All the content of your resume
+                timeout: Seconds to wait for each provider, None waits forever. Not applied to
+                         agents whose rate limiter has a call_timeout
+
+            Returns:
+                Mapping of provider name to its scoring dictionary, None for providers that failed or timed out
+        """
+        names = list(agents)
+        responses = await asyncio.gather(*(
+            AgentRunner._call_with_timeout(name, agents[name], job_description, resume_text, timeout)
+            for name in names
+        ))
+
+        return dict(zip(names, responses))
+
+    @staticmethod
+    async def fan_out_jobs(agents: Dict[str, Any], job_descriptions: List[str], resume_text: str,
+                           max_concurrency: int = 5,
+                           timeout: Optional[float] = None) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+            Fan out many jobs to all agents, keeping at most max_concurrency jobs in flight.
+
+            Returns:
+                One provider-to-response mapping per job, in the same order as job_descriptions
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def score(index: int, job_description: str):
+            async with semaphore:
+                logger.info("Scoring job %s of %s with %s", index + 1, len(job_descriptions), ', '.join(agents))
+                return await AgentRunner.fan_out(agents, job_description, resume_text, timeout)
+
+        return await asyncio.gather(*(score(i, d) for i, d in enumerate(job_descriptions)))
+
+    @staticmethod
+    def run_fan_out_jobs(agents: Dict[str, Any], job_descriptions: List[str], resume_text: str,
+                         max_concurrency: int = 5,
+                         timeout: Optional[float] = None) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+            Synchronous wrapper around fan_out_jobs for scripts that are not running an event loop.
+        """
+        return asyncio.run(AgentRunner.fan_out_jobs(agents, job_descriptions, resume_text, max_concurrency, timeout))
@@ -0,0 +1,224 @@
+import time
+import logging
+
+from Agents import Prompt
+from Utils.LoadUtils import LoadUtils
+from Utils.LLMCache import LLMCache
+from Utils.UsageTracker import UsageTracker
+from Utils.RateLimiter import ProviderRateLimiter
+from Utils.ResponseParser import ResponseParser, ResponseParseError
+from Utils.LogManager import LogManager
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+class BaseLLMAgent:
+    """
+    Scoring plumbing shared by the provider agents: response cache, rate limited calls,
+    parsing with retries, and usage tracking.
+
+    A provider agent creates its chat model as self.llm and implements _build_messages, the
+    prefix/suffix layout its provider caches. _score_job can be overridden when the provider
+    needs more than one chat model, as the Gemini context cache does.
+    """
+
+    def __init__(self, provider: str, display_name: str, model: str, temperature: float = 0,
+                 cache: Optional[LLMCache] = None,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 response_parser: Optional[ResponseParser] = None,
+                 screening: bool = False):
+        """
+        Initialize the shared agent state.
+
+        Args:
+            provider: Provider name used by the usage tracker and the response parser ('gemini', 'openai', 'claude')
+            display_name: Provider name used in the log and console messages
+            model: Model name
+            temperature: Sampling temperature
+            cache: Response cache, None disables caching
+            usage_tracker: Tracker receiving tokens and latency of every call
+            rate_limiter: Provider rate limiter every call goes through
+            response_parser: Parser of the scoring answers, one per provider by default
+            screening: Ask only for the overall score, the first tier of a CascadeAgent
+        """
+        self.provider = provider
+        self.display_name = display_name
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+        self.usage_tracker = usage_tracker
+        self.rate_limiter = rate_limiter
+        self.response_parser = response_parser or ResponseParser(provider)
+        self.llm = None
+
+        # A screening agent is the first tier of a CascadeAgent: short prompt, only overall_score is returned
+        self.screening = screening
+        self.score_operation = 'screen' if screening else 'score'
+        if screening:
+            self.base_prompt_template = Prompt.SCREENING_PROMPT
+            self.base_prompt_prefix = Prompt.SCREENING_PROMPT_PREFIX
+            self.base_prompt_suffix = Prompt.SCREENING_PROMPT_SUFFIX
+        else:
+            self.base_prompt_template = Prompt.RESUME_PROMPT
+            self.base_prompt_prefix = Prompt.RESUME_PROMPT_PREFIX
+            self.base_prompt_suffix = Prompt.RESUME_PROMPT_SUFFIX
+        self._prefix_resume = None
+        self._prefix = None
+        self.prompt_cache_stats = {'calls': 0, 'input_tokens': 0, 'cached_input_tokens': 0}
+
+    def _render_prefix(self, resume_text: str) -> str:
+        """Render the stable instructions + resume prefix, once per resume."""
+        if self._prefix is None or self._prefix_resume != resume_text:
+            self._prefix = self.base_prompt_prefix.format(full_resume = resume_text)
+            self._prefix_resume = resume_text
+        return self._prefix
+
+    def _build_messages(self, job_description: str, resume_text: str) -> list:
+        """Build the cacheable prefix and the per-job suffix messages for one job description."""
+        raise NotImplementedError
+
+    def _invoke(self, llm, messages: list, **kwargs):
+        """Call the chat model, through the rate limiter (quota, 429/5xx retries) when one is configured."""
+        if self.rate_limiter is None:
+            return llm.invoke(messages, **kwargs)
+        return self.rate_limiter.invoke(llm, messages, **kwargs)
+
+    async def _ainvoke(self, llm, messages: list, **kwargs):
+        """Asynchronous version of _invoke."""
+        if self.rate_limiter is None:
+            return await llm.ainvoke(messages, **kwargs)
+        return await self.rate_limiter.ainvoke(llm, messages, **kwargs)
+
+    def _score_response(self, llm, messages: list, **kwargs) -> Dict[str, Any]:
+        """Call the chat model and parse the scoring answer, asking again only when it cannot be repaired."""
+        for attempt in range(self.response_parser.max_retries + 1):
+            started = time.perf_counter()
+            response = self._invoke(llm, messages, **kwargs)
+            self._record_usage(self.score_operation, response, time.perf_counter() - started)
+            try:
+                return self.response_parser.parse_scoring(response.content, retry=attempt > 0,
+                                                          screening=self.screening)
+            except ResponseParseError as e:
+                if attempt == self.response_parser.max_retries:
+                    raise
+                messages = self.response_parser.retry_messages(messages, response.content, e)
+
+    async def _ascore_response(self, llm, messages: list, **kwargs) -> Dict[str, Any]:
+        """Asynchronous version of _score_response."""
+        for attempt in range(self.response_parser.max_retries + 1):
+            started = time.perf_counter()
+            response = await self._ainvoke(llm, messages, **kwargs)
+            self._record_usage(self.score_operation, response, time.perf_counter() - started)
+            try:
+                return self.response_parser.parse_scoring(response.content, retry=attempt > 0,
+                                                          screening=self.screening)
+            except ResponseParseError as e:
+                if attempt == self.response_parser.max_retries:
+                    raise
+                messages = self.response_parser.retry_messages(messages, response.content, e)
+
+    def _score_job(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Send the scoring prompt of one job and return the parsed answer."""
+        messages = self._build_messages(job_description, resume_text)
+        logger.info("Enhanced %s Prompt: %s", self.display_name, LogManager.payload(messages[-1].content))
+        return self._score_response(self.llm, messages)
+
+    async def _ascore_job(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Asynchronous version of _score_job."""
+        messages = self._build_messages(job_description, resume_text)
+        logger.info("Enhanced %s Prompt: %s", self.display_name, LogManager.payload(messages[-1].content))
+        return await self._ascore_response(self.llm, messages)
+
+    def _record_usage(self, operation: str, response=None, latency: Optional[float] = None,
+                      cache_hit: bool = False, error: bool = False) -> None:
+        """Accumulate the prompt cache stats and report tokens and latency of one call to the usage tracker."""
+        usage = None
+        if response is not None:
+            usage = LoadUtils.get_token_usage(response)
+            self.prompt_cache_stats['calls'] += 1
+            self.prompt_cache_stats['input_tokens'] += usage['input_tokens']
+            self.prompt_cache_stats['cached_input_tokens'] += usage['cached_input_tokens']
+            logger.info("%s call took %.2fs, cached input tokens: %s of %s", self.display_name, latency,
+                        usage['cached_input_tokens'], usage['input_tokens'])
+
+        if self.usage_tracker is not None:
+            self.usage_tracker.record(self.provider, self.model, operation, usage, latency, cache_hit, error)
+
+    def _cache_key(self, prompt_template: str, resume_text: str, job_description: str, *extra: Any) -> Optional[str]:
+        """Build the response cache key, None when no cache is configured."""
+        if self.cache is None:
+            return None
+        return LLMCache.make_key(self.model, self.temperature, prompt_template, resume_text, job_description, *extra)
+
+    def _cache_get(self, cache_key: Optional[str]):
+        """Return a cached response, None on a miss or when no cache is configured."""
+        return self.cache.get(cache_key) if cache_key is not None else None
+
+    def _cache_put(self, cache_key: Optional[str], value) -> None:
+        """Store a successful response in the cache."""
+        if cache_key is not None and value is not None:
+            self.cache.put(cache_key, value)
+
+    def execute_agent(self, job_description: str, resume_text: str) -> Optional[Dict[str, Any]]:
+        """
+            Score a job description against the resume.
+
+            Args:
+                job_description: The job description
+                resume_text: All the content of your resume
+
+            Returns:
+                Dictionary with the scoring result (see ResponseParser.ScoringResult), or None if the call fails
+        """
+        logger.info("Starting %s Agent Execution", self.display_name)
+
+        try:
+            cache_key = self._cache_key(self.base_prompt_template, resume_text, job_description)
+            cached_response = self._cache_get(cache_key)
+            if cached_response is not None:
+                logger.info("%s scoring served from cache", self.display_name)
+                self._record_usage(self.score_operation, cache_hit=True)
+                return cached_response
+
+            # Parse, repair and validate the JSON response
+            json_response = self._score_job(job_description, resume_text)
+            logger.info("Scoring Values: %s", json_response['scoring_breakdown'])
+            self._cache_put(cache_key, json_response)
+
+            return json_response
+        except Exception as e:
+            print(f"Execute {self.display_name} Agent Failure: {e}")
+            self._record_usage(self.score_operation, error=True)
+            return None
+
+    async def aexecute_agent(self, job_description: str, resume_text: str) -> Optional[Dict[str, Any]]:
+        """
+            Asynchronous version of execute_agent, same contract.
+
+            Args:
+                job_description: The job description
+                resume_text: All the content of your resume
+
+            Returns:
+                Dictionary with the scoring result, or None if the call fails
+        """
+        logger.info("Starting %s Agent Async Execution", self.display_name)
+
+        try:
+            cache_key = self._cache_key(self.base_prompt_template, resume_text, job_description)
+            cached_response = self._cache_get(cache_key)
+            if cached_response is not None:
+                logger.info("%s scoring served from cache", self.display_name)
+                self._record_usage(self.score_operation, cache_hit=True)
+                return cached_response
+
+            json_response = await self._ascore_job(job_description, resume_text)
+            logger.info("Scoring Values: %s", json_response['scoring_breakdown'])
+            self._cache_put(cache_key, json_response)
+
+            return json_response
+        except Exception as e:
+            print(f"Execute {self.display_name} Agent Async Failure: {e}")
+            self._record_usage(self.score_operation, error=True)
+            return None
@@ -0,0 +1,286 @@
+import io
+import json
+import logging
+import os
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from Utils.LoadUtils import LoadUtils
+
+logger = logging.getLogger(__name__)
+
+# Every backend takes provider neutral requests and returns provider neutral answers:
+#   request: {'custom_id', 'model', 'temperature', 'system', 'prompt', 'json_output'}
+#   answer:  {'text': str or None, 'usage': token counts as LoadUtils.get_token_usage, 'error': str or None}
+# status() is 'running', 'completed' or 'failed'. The provider SDK is imported when the backend is created.
+
+def _answer(text: Optional[str] = None, usage: Optional[Dict[str, int]] = None,
+            error: Optional[str] = None) -> Dict[str, Any]:
+    return {'text': text, 'usage': usage, 'error': error}
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API: the requests are uploaded as a JSONL file and run against /v1/chat/completions."""
+
+    MAX_REQUESTS = 50000
+    RUNNING = ('validating', 'in_progress', 'finalizing')
+
+    def __init__(self, client=None, completion_window: str = '24h'):
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI()
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        lines = []
+        for request in requests:
+            body = {
+                'model': request['model'],
+                'temperature': request['temperature'],
+                'messages': [{'role': 'system', 'content': request['system']},
+                             {'role': 'user', 'content': request['prompt']}]
+            }
+            if request['json_output']:
+                body['response_format'] = {'type': 'json_object'}
+            lines.append(json.dumps({'custom_id': request['custom_id'], 'method': 'POST',
+                                     'url': '/v1/chat/completions', 'body': body}))
+
+        input_file = self.client.files.create(
+            file=('jobsearch_batch.jsonl', io.BytesIO('\n'.join(lines).encode('utf-8'))),
+            purpose='batch'
+        )
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint='/v1/chat/completions',
+                                           completion_window=self.completion_window)
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        status = self.client.batches.retrieve(batch_id).status
+        if status in self.RUNNING:
+            return 'running'
+        # An expired batch still returns the requests it finished
+        return 'completed' if status in ('completed', 'expired') else 'failed'
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        answers = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get('response') or {}
+                body = response.get('body') or {}
+                if entry.get('error') or response.get('status_code') != 200:
+                    answers[entry['custom_id']] = _answer(error=str(entry.get('error') or body.get('error')))
+                    continue
+
+                usage = body.get('usage') or {}
+                answers[entry['custom_id']] = _answer(body['choices'][0]['message']['content'], {
+                    'input_tokens': usage.get('prompt_tokens', 0) or 0,
+                    'output_tokens': usage.get('completion_tokens', 0) or 0,
+                    'cached_input_tokens': (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0) or 0,
+                    'cache_creation_tokens': 0
+                })
+        return answers
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(batch_id)
+
+class AnthropicBatchBackend:
+    """Anthropic Message Batches, the shared system prompt keeps its cache_control breakpoint."""
+
+    MAX_REQUESTS = 100000
+
+    def __init__(self, client=None, max_tokens: int = 4096):
+        if client is None:
+            import anthropic
+            client = anthropic.Anthropic()
+        self.client = client
+        self.max_tokens = max_tokens
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch = self.client.messages.batches.create(requests=[
+            {
+                'custom_id': request['custom_id'],
+                'params': {
+                    'model': request['model'],
+                    'max_tokens': self.max_tokens,
+                    'temperature': request['temperature'],
+                    'system': [{'type': 'text', 'text': request['system'], 'cache_control': {'type': 'ephemeral'}}],
+                    'messages': [{'role': 'user', 'content': request['prompt']}]
+                }
+            }
+            for request in requests
+        ])
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        # Individual failures are reported per request, an ended batch always has results
+        return 'completed' if self.client.messages.batches.retrieve(batch_id).processing_status == 'ended' else 'running'
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        answers = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type != 'succeeded':
+                answers[entry.custom_id] = _answer(error=f"{entry.result.type}: {getattr(entry.result, 'error', '')}")
+                continue
+
+            message = entry.result.message
+            usage = message.usage
+            cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+            cache_creation = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+            answers[entry.custom_id] = _answer(
+                ''.join(block.text for block in message.content if block.type == 'text'),
+                {
+                    # Anthropic input_tokens leaves out the cache reads and writes, the tracker expects them included
+                    'input_tokens': usage.input_tokens + cache_read + cache_creation,
+                    'output_tokens': usage.output_tokens,
+                    'cached_input_tokens': cache_read,
+                    'cache_creation_tokens': cache_creation
+                }
+            )
+        return answers
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.messages.batches.cancel(batch_id)
+
+class GeminiBatchBackend:
+    """Gemini Batch Mode with inline requests, the answers come back in request order."""
+
+    # Inline requests are limited to 20MB per batch
+    MAX_REQUESTS = 2000
+    FAILED = ('JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED')
+
+    def __init__(self, client=None):
+        if client is None:
+            from google import genai
+            client = genai.Client(api_key=os.environ['google_api_key'])
+        self.client = client
+        self._custom_ids: Dict[str, List[str]] = {}
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        inlined_requests = []
+        for request in requests:
+            config = {'system_instruction': request['system'], 'temperature': request['temperature']}
+            if request['json_output']:
+                config['response_mime_type'] = 'application/json'
+            inlined_requests.append({'contents': [{'role': 'user', 'parts': [{'text': request['prompt']}]}],
+                                     'config': config})
+
+        # One model per batch job, every request of a submission comes from the same agent
+        batch = self.client.batches.create(model=requests[0]['model'], src=inlined_requests,
+                                           config={'display_name': 'jobsearch-scoring'})
+        self._custom_ids[batch.name] = [request['custom_id'] for request in requests]
+        return batch.name
+
+    def status(self, batch_id: str) -> str:
+        state = self.client.batches.get(name=batch_id).state.name
+        if state == 'JOB_STATE_SUCCEEDED':
+            return 'completed'
+        return 'failed' if state in self.FAILED else 'running'
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.get(name=batch_id)
+        answers = {}
+        for custom_id, entry in zip(self._custom_ids.pop(batch_id, []), batch.dest.inlined_responses or []):
+            if entry.error is not None or entry.response is None:
+                answers[custom_id] = _answer(error=str(entry.error))
+                continue
+
+            usage = entry.response.usage_metadata
+            answers[custom_id] = _answer(entry.response.text, {
+                'input_tokens': getattr(usage, 'prompt_token_count', 0) or 0,
+                'output_tokens': getattr(usage, 'candidates_token_count', 0) or 0,
+                'cached_input_tokens': getattr(usage, 'cached_content_token_count', 0) or 0,
+                'cache_creation_tokens': 0
+            })
+        return answers
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(name=batch_id)
+
+class LocalBatchBackend:
+    """
+    File based stand-in for the provider batch APIs, for tests and the offline benchmark.
+
+    A submission is written to directory as a JSONL file of requests. Once completion_delay
+    seconds have passed, the next status check answers every request with llm (any chat model
+    with invoke, e.g. FakeChatModel) and writes the answers to a results JSONL file.
+    """
+
+    MAX_REQUESTS = 50000
+
+    def __init__(self, llm, directory: str = './Cache/batches', completion_delay: float = 0.0, max_workers: int = 8):
+        """
+        Initialize the backend.
+
+        Args:
+            llm: Chat model answering the requests
+            directory: Where the request and result files are written
+            completion_delay: Seconds a batch stays running after it is submitted
+            max_workers: Requests answered at the same time
+        """
+        self.llm = llm
+        self.directory = directory
+        self.completion_delay = completion_delay
+        self.max_workers = max(1, max_workers)
+        os.makedirs(directory, exist_ok=True)
+        self._submitted: Dict[str, float] = {}
+
+    def _path(self, batch_id: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.{kind}.jsonl")
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch_id = f"local-{uuid.uuid4().hex[:12]}"
+        with open(self._path(batch_id, 'requests'), 'w', encoding='utf-8') as requests_file:
+            for request in requests:
+                requests_file.write(json.dumps(request) + '\n')
+        self._submitted[batch_id] = time.monotonic()
+        return batch_id
+
+    def _answer_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        from langchain_core.messages import SystemMessage, HumanMessage
+
+        try:
+            response = self.llm.invoke([SystemMessage(content=request['system']), HumanMessage(content=request['prompt'])])
+        except Exception as e:
+            return dict(_answer(error=str(e)), custom_id=request['custom_id'])
+        return dict(_answer(response.content, LoadUtils.get_token_usage(response)), custom_id=request['custom_id'])
+
+    def status(self, batch_id: str) -> str:
+        if os.path.exists(self._path(batch_id, 'results')):
+            return 'completed'
+        if batch_id not in self._submitted:
+            return 'failed'
+        if time.monotonic() - self._submitted[batch_id] < self.completion_delay:
+            return 'running'
+
+        with open(self._path(batch_id, 'requests'), encoding='utf-8') as requests_file:
+            requests = [json.loads(line) for line in requests_file if line.strip()]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            answers = list(executor.map(self._answer_request, requests))
+
+        # Written under a temporary name, a status check never sees a partial results file
+        partial_path = self._path(batch_id, 'partial')
+        with open(partial_path, 'w', encoding='utf-8') as results_file:
+            for answer in answers:
+                results_file.write(json.dumps(answer) + '\n')
+        os.replace(partial_path, self._path(batch_id, 'results'))
+        return 'completed'
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        answers = {}
+        with open(self._path(batch_id, 'results'), encoding='utf-8') as results_file:
+            for line in results_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    answers[entry.pop('custom_id')] = entry
+        return answers
+
+    def cancel(self, batch_id: str) -> None:
+        self._submitted.pop(batch_id, None)
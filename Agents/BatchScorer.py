@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from Agents.BatchBackends import OpenAIBatchBackend, AnthropicBatchBackend, GeminiBatchBackend
+from Agents.CascadeAgent import CascadeAgent
+from Utils.LLMCache import LLMCache
+from Utils.ResponseParser import ResponseParseError
+
+logger = logging.getLogger(__name__)
+
+class BatchScorer:
+    """
+    Score a whole scrape through the providers' batch APIs instead of one interactive call per job.
+
+    Every new posting goes into one submission per provider (OpenAI Batch, Anthropic Message Batches,
+    Gemini Batch Mode), billed at half the interactive price and outside the per-minute quotas, so
+    no rate limiter is involved. The submissions are polled until they complete and the answers are
+    parsed, cached and tracked like the interactive ones, in the same shape as AgentRunner.run_fan_out_jobs.
+    """
+
+    BACKENDS = {
+        'gemini': GeminiBatchBackend,
+        'openai': OpenAIBatchBackend,
+        'claude': AnthropicBatchBackend
+    }
+
+    def __init__(self, backends: Dict[str, Any], poll_interval: float = 60.0, max_wait: float = 24 * 3600):
+        """
+        Initialize the scorer.
+
+        Args:
+            backends: Mapping of provider name to batch backend, see default_backends
+            poll_interval: Seconds between two status checks of a submission
+            max_wait: Seconds after which a submission still running is cancelled and its jobs left unscored
+        """
+        self.backends = backends
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self.stats = {name: {'batches': 0, 'requests': 0, 'succeeded': 0, 'failed': 0, 'cache_hits': 0,
+                             'wait_seconds': 0.0} for name in backends}
+
+    @staticmethod
+    def default_backends(providers: List[str]) -> Dict[str, Any]:
+        """Create the provider batch backend of every provider name."""
+        return {name: BatchScorer.BACKENDS[name]() for name in providers}
+
+    def _count(self, name: str, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[name][key] += amount
+
+    def score(self, agents: Dict[str, Any], job_descriptions: List[str],
+              resume_text: str) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+            Score every job description with every agent, one batch submission per provider.
+
+            Args:
+                agents: Mapping of provider name to agent (or CascadeAgent), each needs a backend
+                job_descriptions: The job descriptions to score
+                resume_text: All the content of your resume
+
+            Returns:
+                One mapping of provider name to scoring dictionary per job description, in the same
+                order, None for requests that failed or could not be parsed
+        """
+        if not job_descriptions:
+            return []
+
+        # Providers are submitted and polled side by side, the slowest batch sets the wait
+        with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+            futures = {name: executor.submit(self._score_provider, name, agent, job_descriptions, resume_text)
+                       for name, agent in agents.items()}
+            provider_results = {name: future.result() for name, future in futures.items()}
+
+        return [{name: provider_results[name][index] for name in agents} for index in range(len(job_descriptions))]
+
+    def _score_provider(self, name: str, agent, job_descriptions: List[str],
+                        resume_text: str) -> List[Optional[Dict[str, Any]]]:
+        """Scoring results of one provider, a cascade sends only the jobs passing the screening batch to the full batch."""
+        try:
+            if not isinstance(agent, CascadeAgent):
+                return self._run_batches(name, agent, job_descriptions, resume_text)
+
+            results = [agent.screen_result(response)
+                       for response in self._run_batches(name, agent.screener, job_descriptions, resume_text)]
+            passed = [index for index, result in enumerate(results) if result is None]
+            full_results = self._run_batches(name, agent.scorer, [job_descriptions[index] for index in passed], resume_text)
+            for index, result in zip(passed, full_results):
+                results[index] = result
+            return results
+        except Exception as e:
+            logger.error("%s batch scoring failed: %s", name, e)
+            return [None] * len(job_descriptions)
+
+    def _run_batches(self, name: str, agent, job_descriptions: List[str],
+                     resume_text: str) -> List[Optional[Dict[str, Any]]]:
+        """Answer the cached jobs from the LLM cache and submit the others, in chunks the provider accepts."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job_descriptions)
+        operation = f"batch_{agent.score_operation}"
+        cache_keys = [LLMCache.make_key(agent.model, agent.temperature, agent.base_prompt_template, resume_text, description)
+                      if agent.cache is not None else None for description in job_descriptions]
+
+        pending = []
+        for index, cache_key in enumerate(cache_keys):
+            cached_response = agent.cache.get(cache_key) if cache_key is not None else None
+            if cached_response is not None:
+                results[index] = cached_response
+                self._count(name, 'cache_hits')
+                self._record_usage(agent, name, operation, cache_hit=True)
+            else:
+                pending.append(index)
+
+        # The instructions + resume prefix is identical in every request, providers cache it across the batch
+        system = agent.base_prompt_prefix.format(full_resume = resume_text)
+        requests = [{
+            'custom_id': f"job-{index}",
+            'model': agent.model,
+            'temperature': agent.temperature,
+            'system': system,
+            'prompt': agent.base_prompt_suffix.format(job_desc = job_descriptions[index]),
+            'json_output': True
+        } for index in pending]
+
+        backend = self.backends[name]
+        for start in range(0, len(requests), backend.MAX_REQUESTS):
+            chunk = requests[start:start + backend.MAX_REQUESTS]
+            try:
+                answers = self._wait_for_batch(name, backend, chunk)
+            except Exception as e:
+                # The jobs of a batch that could not be submitted or polled are scored on the next run
+                logger.error("%s batch of %s requests failed: %s", name, len(chunk), e)
+                answers = {}
+
+            for request in chunk:
+                index = int(request['custom_id'].split('-')[1])
+                answer = answers.get(request['custom_id'])
+                if answer is None or answer['error'] is not None:
+                    logger.warning("%s batch request %s failed: %s", name, request['custom_id'],
+                                   answer['error'] if answer else 'no answer')
+                    self._count(name, 'failed')
+                    self._record_usage(agent, name, operation, error=True)
+                    continue
+
+                self._record_usage(agent, name, operation, answer['usage'])
+                try:
+                    results[index] = agent.response_parser.parse_scoring(answer['text'], screening=agent.screening)
+                except ResponseParseError:
+                    # A batch answer is not asked again, the job is scored on the next run
+                    self._count(name, 'failed')
+                    self._record_usage(agent, name, operation, error=True)
+                    continue
+
+                self._count(name, 'succeeded')
+                if cache_keys[index] is not None:
+                    agent.cache.put(cache_keys[index], results[index])
+
+        return results
+
+    def _wait_for_batch(self, name: str, backend, requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit one batch and poll it until it completes.
+
+        Returns:
+            Answers by custom_id, empty when the batch failed or did not complete within max_wait
+        """
+        batch_id = backend.submit(requests)
+        self._count(name, 'batches')
+        self._count(name, 'requests', len(requests))
+        logger.info("%s batch %s submitted with %s requests", name, batch_id, len(requests))
+
+        started = time.monotonic()
+        status = backend.status(batch_id)
+        while status == 'running':
+            if time.monotonic() - started > self.max_wait:
+                logger.warning("%s batch %s still running after %ss, cancelled", name, batch_id, self.max_wait)
+                backend.cancel(batch_id)
+                status = 'failed'
+                break
+            time.sleep(self.poll_interval)
+            status = backend.status(batch_id)
+
+        waited = time.monotonic() - started
+        self._count(name, 'wait_seconds', waited)
+        if status != 'completed':
+            logger.error("%s batch %s %s after %.1fs, its jobs are scored on the next run", name, batch_id, status, waited)
+            return {}
+        logger.info("%s batch %s %s after %.1fs", name, batch_id, status, waited)
+        return backend.results(batch_id)
+
+    @staticmethod
+    def _record_usage(agent, name: str, operation: str, usage: Optional[Dict[str, int]] = None,
+                      cache_hit: bool = False, error: bool = False) -> None:
+        if agent.usage_tracker is not None:
+            agent.usage_tracker.record(name, agent.model, operation, usage, None, cache_hit, error)
+
+    def summary(self) -> Dict[str, Any]:
+        """Batches, requests, answers and seconds spent waiting, per provider."""
+        with self._lock:
+            return {name: dict(stats, wait_seconds=round(stats['wait_seconds'], 1)) for name, stats in self.stats.items()}
+
+    def log_summary(self) -> None:
+        """Write the batch scoring summary to the log."""
+        logger.info("Batch scoring summary: %s", self.summary())
@@ -0,0 +1,116 @@
+import logging
+import threading
+
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CascadeAgent:
+    """
+    Two-tier scoring for one provider.
+
+    A screening agent (created with screening=True, usually on a smaller model) returns only the
+    overall score of a job. The full RESUME_PROMPT evaluation, with gaps, keywords and rewritten
+    bullets, is only requested for jobs at or above screening_threshold. The cascade has the agent
+    interface, so JobPipeline and AgentRunner use it like any provider agent; everything except
+    scoring (resume customization, prompt cache stats, response parser) is the full agent's.
+    """
+
+    def __init__(self, screener, scorer, screening_threshold: int = 60):
+        """
+        Initialize the cascade.
+
+        Args:
+            screener: Agent created with screening=True
+            scorer: Agent running the full evaluation
+            screening_threshold: Minimum screening score that gets the full evaluation, keep it
+                below the customization score so no job that would be customized is screened out
+        """
+        self.screener = screener
+        self.scorer = scorer
+        self.screening_threshold = screening_threshold
+        self._lock = threading.Lock()
+        self.stats = {'screened': 0, 'passed': 0, 'screened_out': 0, 'screen_failed': 0}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes the cascade does not define
+        if name == 'scorer':
+            raise AttributeError(name)
+        return getattr(self.scorer, name)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def screen_result(self, screen_response: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Decide from the screening answer whether the job needs the full evaluation.
+
+        Returns:
+            The scoring result of a screened out job, None when the full evaluation must run
+        """
+        if screen_response is None:
+            # A failed screening never drops a job, it is scored as if there were no cascade
+            self._count('screen_failed')
+            return None
+
+        self._count('screened')
+        score = screen_response['overall_score']
+        if score >= self.screening_threshold:
+            self._count('passed')
+            return None
+
+        self._count('screened_out')
+        logger.info("Screening score %s below %s, full evaluation skipped", score, self.screening_threshold)
+        note = f"Not evaluated: screening score {score} below {self.screening_threshold}"
+        # Copy, the screening answer may be the object held by the response cache
+        return dict(screen_response, ats_compatibility={'score': None, 'issues': note}, summary=note)
+
+    def execute_agent(self, job_description: str, resume_text: str) -> Optional[Dict[str, Any]]:
+        """
+            Screen the job and run the full evaluation only when it reaches the threshold.
+
+            Args:
+                job_description: The job description
+                resume_text: All the content of your resume
+
+            Returns:
+                The full scoring result, the screening result for a screened out job, or None if the call fails
+        """
+        screened_out = self.screen_result(self.screener.execute_agent(job_description, resume_text))
+        if screened_out is not None:
+            return screened_out
+        return self.scorer.execute_agent(job_description, resume_text)
+
+    async def aexecute_agent(self, job_description: str, resume_text: str) -> Optional[Dict[str, Any]]:
+        """
+            Asynchronous version of execute_agent.
+
+            Args:
+                job_description: The job description
+                resume_text: All the content of your resume
+
+            Returns:
+                The full scoring result, the screening result for a screened out job, or None if the call fails
+        """
+        screened_out = self.screen_result(await self.screener.aexecute_agent(job_description, resume_text))
+        if screened_out is not None:
+            return screened_out
+        return await self.scorer.aexecute_agent(job_description, resume_text)
+
+    def close(self) -> None:
+        """Release what either tier holds at the provider, e.g. a Gemini context cache."""
+        for agent in (self.screener, self.scorer):
+            if hasattr(agent, 'close'):
+                agent.close()
+
+    def summary(self) -> Dict[str, Any]:
+        """Jobs screened, passed to the full evaluation, screened out, and failed screenings."""
+        with self._lock:
+            summary = dict(self.stats, screening_threshold=self.screening_threshold)
+        summary['screened_out_rate'] = round(summary['screened_out'] / summary['screened'], 3) if summary['screened'] else 0.0
+        return summary
+
+    def log_summary(self) -> None:
+        """Write the cascade summary to the log."""
+        logger.info("%s scoring cascade summary: %s", self.scorer.model, self.summary())
@@ -1,53 +1,37 @@
-import os
-import json
 import logging
 
-from Agents import Prompt 
-from Utils.LoadUtils import LoadUtils
-from typing import Dict, Optional, List, Tuple, Any
+from Agents.BaseLLMAgent import BaseLLMAgent
+from Utils.LLMCache import LLMCache
+from Utils.UsageTracker import UsageTracker
+from Utils.RateLimiter import ProviderRateLimiter
+from Utils.ResponseParser import ResponseParser
+from typing import Optional
 
 from langchain_anthropic import ChatAnthropic
-from langchain_core.prompts import PromptTemplate
+from langchain_core.messages import SystemMessage, HumanMessage
 
 logger = logging.getLogger(__name__)
 
-class ClaudeLLMAgent:
-    def __init__(self, model='claude-3-haiku-20240307', temperature=0):
+class ClaudeLLMAgent(BaseLLMAgent):
+    def __init__(self, model='claude-3-haiku-20240307', temperature=0, cache: Optional[LLMCache] = None,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 response_parser: Optional[ResponseParser] = None,
+                 screening: bool = False):
+        super().__init__('claude', 'Claude', model, temperature, cache, usage_tracker, rate_limiter,
+                         response_parser, screening)
+
         self.llm = ChatAnthropic(
             model=model,
             temperature=temperature
             #, max_output_tokens=500
         )
-        
-        self.base_prompt_template = Prompt.RESUME_PROMPT
-
-    def execute_agent(self, job_description: str, resume_text: str) -> Dict[str, Any]:
-        """
-            Execute a call using Claude LLM .
-        
-            Args:
-                job_desc: The job description
-                full_resume: All the content of your resume
-                            
-            Returns:
-                Dictionary with 'score' (int), 'recommendation' (str), 'ats_score (str) and 'ats_issues' (str) keys
-        """
-
-        try:
-            prompt = PromptTemplate.from_template (
-                template = self.base_prompt_template
-                #, input_variables = ["full_resume","job_desc"]
-            )
-
-            enhanced_prompt = prompt.format(full_resume = resume_text, job_desc = job_description )
-            logger.warning(f"Enhanced Claude Prompt: {enhanced_prompt}")
-
-            response = self.llm.invoke(enhanced_prompt)
 
-            # Parse the JSON response
-            result = json.loads(response.content)
-            return result
+    def _build_messages(self, job_description: str, resume_text: str) -> list:
+        """Build the cacheable prefix and the per-job suffix messages for one job description."""
+        prefix = self._render_prefix(resume_text)
+        suffix = self.base_prompt_suffix.format(job_desc = job_description)
 
-        except Exception as e:
-            print(f"Execute Claude Agent Failure: {e}")
-            return None
+        # cache_control marks the end of the cached prefix for Anthropic prompt caching
+        return [SystemMessage(content=[{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]),
+                HumanMessage(content=suffix)]
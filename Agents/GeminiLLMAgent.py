@@ -1,19 +1,51 @@
 import os
-import json
+import re
+import hashlib
+import time
 import logging
-import asyncio
+import threading
 
 from Agents import Prompt 
-from Utils.LoadUtils import LoadUtils
-from typing import Dict, Optional, List, Tuple, Any
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain.chains import RetrievalQA
-from langchain_core.documents import Document
+from Agents.BaseLLMAgent import BaseLLMAgent
+from Utils.LLMCache import LLMCache
+from Utils.UsageTracker import UsageTracker
+from Utils.RateLimiter import ProviderRateLimiter
+from Utils.ResponseParser import ResponseParser
+from Utils.LogManager import LogManager
+from typing import Dict, Optional, Any
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import SystemMessage, HumanMessage
 
 logger = logging.getLogger(__name__)
 
-class GeminiLLMAgent:
-    def __init__(self, model='gemini-2.0-flash', temperature=0):
+class GeminiLLMAgent(BaseLLMAgent):
+    # A context cache is recreated this many seconds before its TTL runs out
+    CONTEXT_CACHE_REFRESH = 120
+    # Seconds before creating a context cache is tried again after a failure
+    CONTEXT_CACHE_RETRY = 300
+    # Errors of a call referencing a context cache the server no longer has
+    CONTEXT_CACHE_GONE = re.compile(r"cached.?content|not.?found|expired", re.IGNORECASE)
+
+    def __init__(self, model='gemini-2.0-flash', temperature=0, cache: Optional[LLMCache] = None,
+                 use_context_cache: bool = True, context_cache_ttl: int = 3600,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 response_parser: Optional[ResponseParser] = None,
+                 screening: bool = False):
+
+        super().__init__('gemini', 'Gemini', model, temperature, cache, usage_tracker, rate_limiter,
+                         response_parser, screening)
+
+        # Gemini context caching: the instructions + resume prefix is uploaded once and referenced by name
+        self.use_context_cache = use_context_cache
+        self.context_cache_ttl = context_cache_ttl
+        self._context_cache_lock = threading.Lock()
+        self._context_cache_key = None
+        self._context_llm = None
+        self._context_client = None
+        self._context_cache_name = None
+        self._context_cache_expires = 0.0
+        self._context_cache_retry_at = 0.0
 
         self.llm = ChatGoogleGenerativeAI(
             model=model,
@@ -22,44 +54,136 @@ class GeminiLLMAgent:
             #, max_output_tokens=500
         )
         
-        self.base_prompt_template = Prompt.RESUME_PROMPT
         self.base_customization_resume_template = Prompt.RESUME_CUSTOMIZATION
+        self.base_customization_prefix = Prompt.RESUME_CUSTOMIZATION_PREFIX
+        self.base_customization_suffix = Prompt.RESUME_CUSTOMIZATION_SUFFIX
 
-    def execute_agent(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+    def _get_context_llm(self, prefix: str):
         """
-            Execute a call using Gemini LLM .
-        
-            Args:
-                job_description: The job description
-                resume_text: All the content of your resume
-                            
-            Returns:
-                Dictionary with 'score' (int), 'recommendation' (str), 'ats_score (str) and 'ats_issues' (str) keys
+            Return a chat model bound to a Gemini context cache holding the prefix, None if caching is unavailable.
+
+            The cache is recreated shortly before its TTL expires. A failed creation is tried again
+            after CONTEXT_CACHE_RETRY seconds, the full prompt is sent in the meantime.
         """
-        logger.info("Starting Gemini Agent Execution")
+        if not self.use_context_cache:
+            return None
 
-        
-        #print(f"Prompt: {enhanced_prompt}")
+        prefix_key = hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+        now = time.monotonic()
+
+        with self._context_cache_lock:
+            if (self._context_llm is not None and self._context_cache_key == prefix_key
+                    and now < self._context_cache_expires - min(self.CONTEXT_CACHE_REFRESH, self.context_cache_ttl / 2)):
+                return self._context_llm
+            if self._context_cache_key == prefix_key and now < self._context_cache_retry_at:
+                return None
+
+            try:
+                from google import genai
+                from google.genai import types
+
+                if self._context_client is None:
+                    self._context_client = genai.Client(api_key=os.environ['google_api_key'])
+                context_cache = self._context_client.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=prefix,
+                        ttl=f"{self.context_cache_ttl}s",
+                        display_name='jobsearch-resume-prefix'
+                    )
+                )
+                # The replaced cache is not deleted, calls still using it finish before it expires
+                self._context_llm = ChatGoogleGenerativeAI(
+                    model=self.model,
+                    google_api_key=os.environ['google_api_key'],
+                    temperature=self.temperature,
+                    cached_content=context_cache.name
+                )
+                self._context_cache_name = context_cache.name
+                self._context_cache_expires = now + self.context_cache_ttl
+                logger.info("Gemini context cache created: %s", context_cache.name)
+            except Exception as e:
+                # e.g. prefix below the minimum cacheable size, fall back to sending the full prompt
+                logger.warning("Gemini context cache unavailable, sending the full prompt: %s", e)
+                self._context_llm = None
+                self._context_cache_name = None
+                self._context_cache_retry_at = now + self.CONTEXT_CACHE_RETRY
+
+            self._context_cache_key = prefix_key
+            return self._context_llm
+
+    def _drop_context_cache(self, context_llm) -> None:
+        """Forget a context cache the server no longer has, the next call creates a new one."""
+        with self._context_cache_lock:
+            if self._context_llm is context_llm:
+                logger.warning("Gemini context cache %s is gone, creating a new one", self._context_cache_name)
+                self._context_llm = None
+                self._context_cache_name = None
+                self._context_cache_key = None
+
+    def close(self) -> None:
+        """Delete the context cache of the run, it would otherwise be billed until its TTL expires."""
+        with self._context_cache_lock:
+            name, self._context_cache_name = self._context_cache_name, None
+            self._context_llm = None
+            self._context_cache_key = None
+        if name is None:
+            return
         try:
-            enhanced_prompt = self.base_prompt_template.format(
-                full_resume = resume_text,
-                job_desc = job_description
-            )
-            #logger.warning(f"Enhanced Gemini Prompt: {enhanced_prompt}")
+            self._context_client.caches.delete(name=name)
+            logger.info("Gemini context cache deleted: %s", name)
+        except Exception as e:
+            logger.warning("Gemini context cache %s could not be deleted: %s", name, e)
+
+    def _full_request(self, job_description: str, resume_text: str):
+        """Chat model and messages sending the whole prompt, without a context cache."""
+        return self.llm, [SystemMessage(content=self._render_prefix(resume_text)),
+                          HumanMessage(content=self.base_prompt_suffix.format(job_desc = job_description))]
+
+    def _build_request(self, job_description: str, resume_text: str):
+        """
+            Build the chat model and messages for one job.
+
+            Returns:
+                Tuple of (chat model, messages). With a context cache only the job suffix is sent.
+        """
+        context_llm = self._get_context_llm(self._render_prefix(resume_text))
+        if context_llm is not None:
+            return context_llm, [HumanMessage(content=self.base_prompt_suffix.format(job_desc = job_description))]
+
+        return self._full_request(job_description, resume_text)
 
-            response = self.llm.invoke(enhanced_prompt,
-                                     response_format={"type": "json_object"}
-                                       )
-            #logger.warning(f"Response Gemini Agent Prompt: {response}")
-            #print(type(response))
-            json_response = LoadUtils.convert_to_json(response)
-            logger.info(f"Scoring Values: {json_response['scoring_breakdown']}")
+    def _context_cache_gone(self, llm, error: Exception) -> bool:
+        """True when a call through a context cache failed because the cache expired or was deleted."""
+        if llm is self.llm:
+            return False
+        return (ProviderRateLimiter.status_code(error) == 404
+                or bool(self.CONTEXT_CACHE_GONE.search(f"{type(error).__name__} {error}")))
 
-            return json_response 
+    def _score_job(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Score one job, sending the full prompt once more when the context cache was gone."""
+        llm, messages = self._build_request(job_description, resume_text)
+        try:
+            return self._score_response(llm, messages, response_format={"type": "json_object"})
         except Exception as e:
-            print(f"Execute Gemini Agent Failure: {e}")
-            return None
-        
+            if not self._context_cache_gone(llm, e):
+                raise
+            self._drop_context_cache(llm)
+            llm, messages = self._full_request(job_description, resume_text)
+            return self._score_response(llm, messages, response_format={"type": "json_object"})
+
+    async def _ascore_job(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Asynchronous version of _score_job."""
+        llm, messages = self._build_request(job_description, resume_text)
+        try:
+            return await self._ascore_response(llm, messages, response_format={"type": "json_object"})
+        except Exception as e:
+            if not self._context_cache_gone(llm, e):
+                raise
+            self._drop_context_cache(llm)
+            llm, messages = self._full_request(job_description, resume_text)
+            return await self._ascore_response(llm, messages, response_format={"type": "json_object"})
+
     def LLM_Resume_Customization(self, job_description: str, resume_text: str, recommendations: str, ats_recommendations: str ):
         """
             Execute an Asynchronous call using Gemini LLM to get a Resume taylor to the job description.
@@ -75,19 +199,34 @@ class GeminiLLMAgent:
         """
          
         try:
-            enhanced_prompt = self.base_customization_resume_template.format(
-                full_resume = resume_text,
+            cache_key = self._cache_key(self.base_customization_resume_template, resume_text, job_description,
+                                        recommendations, ats_recommendations)
+            cached_response = self._cache_get(cache_key)
+            if cached_response is not None:
+                logger.info("Gemini resume customization served from cache")
+                self._record_usage('customize', cache_hit=True)
+                return cached_response
+
+            # Same resume first, job specific inputs last, so the prefix can be reused by the provider
+            enhanced_prompt = self.base_customization_suffix.format(
                 job_desc = job_description,
                 recommendations = recommendations,
                 ats_suggestions = ats_recommendations
             )
-            logger.warning(f"Enhanced Gemini Prompt for Resume Customization: {enhanced_prompt}")
+            logger.info("Enhanced Gemini Prompt for Resume Customization: %s", LogManager.payload(enhanced_prompt))
 
-            response = self.llm.invoke(enhanced_prompt)
+            started = time.perf_counter()
+            response = self._invoke(self.llm, [
+                SystemMessage(content=self.base_customization_prefix.format(full_resume = resume_text)),
+                HumanMessage(content=enhanced_prompt)
+            ])
+            self._record_usage('customize', response, time.perf_counter() - started)
             response_text = response.content
-            logger.warning(f"Enhanced Gemini Customized Resume: {response_text}")
+            logger.info("Enhanced Gemini Customized Resume: %s", LogManager.payload(response_text))
+            self._cache_put(cache_key, response_text)
 
             return response_text 
         except Exception as e:
             print(f"Enhance Resume by Gemini Agent Failure: {e}")
-            return None
\ No newline at end of file
+            self._record_usage('customize', error=True)
+            return None
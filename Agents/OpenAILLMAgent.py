@@ -1,20 +1,28 @@
-import os
-import json
 import logging
 import openai
 
-from Agents import Prompt 
-from Utils.LoadUtils import LoadUtils
-from typing import Dict, Optional, List, Tuple, Any
+from Agents.BaseLLMAgent import BaseLLMAgent
+from Utils.LLMCache import LLMCache
+from Utils.UsageTracker import UsageTracker
+from Utils.RateLimiter import ProviderRateLimiter
+from Utils.ResponseParser import ResponseParser
+from typing import Optional
 
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
+from langchain_core.messages import SystemMessage, HumanMessage
 
 
 logger = logging.getLogger(__name__)
 
-class OpenAILLMAgent:
-    def __init__(self, model='gpt-4o-mini', temperature=0):
+class OpenAILLMAgent(BaseLLMAgent):
+    def __init__(self, model='gpt-4o-mini', temperature=0, cache: Optional[LLMCache] = None,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 response_parser: Optional[ResponseParser] = None,
+                 screening: bool = False):
+
+        super().__init__('openai', 'OpenAI', model, temperature, cache, usage_tracker, rate_limiter,
+                         response_parser, screening)
 
         self.llm = ChatOpenAI(
             model=model,
@@ -23,36 +31,12 @@ class OpenAILLMAgent:
         ).bind(
             response_format={"type": "json_object"}
         )
-        
-        self.base_prompt_template = Prompt.RESUME_PROMPT
-
-    def execute_agent(self, job_description: str, resume_text: str) -> Dict[str, Any]:
-        """
-            Execute a call using OpenAI LLM .
-        
-            Args:
-                job_desc: The job description
-                full_resume: All the content of your resume
-                            
-            Returns:
-                Dictionary with 'score' (int), 'recommendation' (str), 'ats_score (str) and 'ats_issues' (str) keys
-        """
-
-        try:
-            prompt = PromptTemplate.from_template (
-                template = self.base_prompt_template
-                #, input_variables = ["full_resume","job_desc"]
-            )
-
-            enhanced_prompt = prompt.format(full_resume = resume_text, job_desc = job_description )
-            logger.warning(f"Enhanced OpenAI Prompt: {enhanced_prompt}")
-
-            response = self.llm.invoke(enhanced_prompt)
-
-            # Parse the JSON response
-            result = json.loads(response.content)
-            return result
-
-        except Exception as e:
-            print(f"Execute OpenAI Agent Failure: {e}")
-            return None
\ No newline at end of file
+
+    def _build_messages(self, job_description: str, resume_text: str) -> list:
+        """Build the cacheable prefix and the per-job suffix messages for one job description."""
+        prefix = self._render_prefix(resume_text)
+        suffix = self.base_prompt_suffix.format(job_desc = job_description)
+
+        # OpenAI caches identical prompt prefixes automatically, the prefix just has to come first and stay byte-identical
+        return [SystemMessage(content=prefix),
+                HumanMessage(content=suffix)]
@@ -1,4 +1,7 @@
-RESUME_PROMPT = """
+# The scoring prompt is split in a stable prefix (instructions, schema and resume) and a
+# per-job suffix, so providers can cache the prefix across jobs:
+# Anthropic cache_control, Gemini context caching and OpenAI automatic prefix caching.
+RESUME_PROMPT_PREFIX = """
         You are an elite AI resume strategist, modeled after a top 1% HR and recruitment expert from a leading FAANG company. Your expertise lies in identifying talent and coaching candidates to perfection. Your tone is professional, constructive, and highly actionable, aimed at empowering the candidate to land an interview.
         
         Your task is to meticulously evaluate the provided resume against the specific job description. You must analyze every section and provide comprehensive, structured feedback.
@@ -9,12 +12,6 @@ RESUME_PROMPT = """
         - Base your entire analysis strictly on the information contained within the `<resume>` and `<job>` tags. 
         - All feedback must be customized to the job description provided. Avoid generic or vague advice; each recommendation should directly relate to the role’s requirements or the candidate’s experience.
                 
-        **Resume and Job Description:**
-        
-        <resume>{full_resume}</resume>
-
-        <job>{job_desc}</job>
-
         **Required JSON Output Schema and Instructions:**
         {{
     'overall_score': 'A holistic score from 0-100 representing the candidate's fit for the role. This should be a weighted average of the scoring_breakdown. Calculate overall_score as a weighted average rounded to the nearest integer. Formula: (skills_match × 0.35) + (experience_relevance × 0.35) + (keywords_coverage × 0.20) + (years_of_experience × 0.10 if not null, otherwise redistribute that 10% proportionally to other components).',
@@ -74,27 +71,46 @@ RESUME_PROMPT = """
     'summary': 'The summary should provide a recruiter-style conclusion (2–3 sentences) that reflects the candidate's readiness for interview shortlisting — balancing strengths and gaps.'
 }}
 
+        **Candidate Resume:**
+
+        <resume>{full_resume}</resume>
     """
-RESUME_CUSTOMIZATION = """
-    You are an elite professional resume writer with expertise in ATS (Applicant Tracking Systems) optimization and modern hiring practices. Your task is to improve an existing resume to better match a specific job description while maintaining authenticity, accuracy, and the candidate’s unique voice.
+RESUME_PROMPT_SUFFIX = """
+        **Job Description:**
 
-    Input Data
-    Current Resume:
-    <resume>
-    {resume_content}
-    </resume>
-    Target Job Description:
-    <job>
-    {job_description}
-    </job>
-    Recommendations for Improvement:
-    <recommendations>
-    {recommendations}
-    </recommendations>
-    ATS Optimization Suggestions:
-    <ats_suggestions>
-    {ats_suggestions}
-    </ats_suggestions>
+        <job>{job_desc}</job>
+
+        Evaluate the resume above against this job description and return only the JSON object described in the schema.
+    """
+RESUME_PROMPT = RESUME_PROMPT_PREFIX + RESUME_PROMPT_SUFFIX
+
+# Short first tier of the scoring cascade (see CascadeAgent): only the overall score is asked for,
+# so a job that will not reach the screening threshold costs a few output tokens instead of the full evaluation.
+SCREENING_PROMPT_PREFIX = """
+        You are an experienced technical recruiter screening job postings for a candidate.
+
+        Rate how well the resume fits the job description with a single holistic score from 0 to 100. Weigh the required skills and the relevance of the work experience most, then the coverage of the job's keywords and the years of experience asked for.
+
+        **CRITICAL INSTRUCTIONS:**
+        - Your output MUST be a single, raw, valid JSON object with exactly one key: {{"overall_score": <integer from 0 to 100>}}
+        - Do NOT add any other key, explanation, or markdown formatting.
+        - Base the score strictly on the information contained within the `<resume>` and `<job>` tags.
+
+        **Candidate Resume:**
+
+        <resume>{full_resume}</resume>
+    """
+SCREENING_PROMPT_SUFFIX = """
+        **Job Description:**
+
+        <job>{job_desc}</job>
+
+        Return only the overall_score JSON object.
+    """
+SCREENING_PROMPT = SCREENING_PROMPT_PREFIX + SCREENING_PROMPT_SUFFIX
+
+RESUME_CUSTOMIZATION_PREFIX = """
+    You are an elite professional resume writer with expertise in ATS (Applicant Tracking Systems) optimization and modern hiring practices. Your task is to improve an existing resume to better match a specific job description while maintaining authenticity, accuracy, and the candidate’s unique voice.
 
     Guidelines and Constraints
     Core Principles
@@ -159,6 +175,26 @@ RESUME_CUSTOMIZATION = """
      The document flows logically and tells a compelling career story
      All recommendations and ATS suggestions have been considered and applied where appropriate
 
+    Current Resume:
+    <resume>
+    {full_resume}
+    </resume>
+    """
+RESUME_CUSTOMIZATION_SUFFIX = """
+    Target Job Description:
+    <job>
+    {job_desc}
+    </job>
+    Recommendations for Improvement:
+    <recommendations>
+    {recommendations}
+    </recommendations>
+    ATS Optimization Suggestions:
+    <ats_suggestions>
+    {ats_suggestions}
+    </ats_suggestions>
+
     Output
     Provide only the improved resume in markdown format. Do not include explanations, comments, or meta-discussion about the changes made. The output should be ready to save as a markdown file and convert to PDF.
-    """
\ No newline at end of file
+    """
+RESUME_CUSTOMIZATION = RESUME_CUSTOMIZATION_PREFIX + RESUME_CUSTOMIZATION_SUFFIX
@@ -1,9 +1,28 @@
-from .GeminiLLMAgent import GeminiLLMAgent
-from .OpenAILLMAgent import OpenAILLMAgent
-from .ClaudeLLMAgent import ClaudeLLMAgent
+import importlib
+
+from .AgentRunner import AgentRunner
+from .CascadeAgent import CascadeAgent
+
+# Each agent module imports its provider's LangChain client (BatchScorer the LoadUtils stack), they are only loaded when first used
+_LAZY_AGENTS = {
+    'GeminiLLMAgent': '.GeminiLLMAgent',
+    'OpenAILLMAgent': '.OpenAILLMAgent',
+    'ClaudeLLMAgent': '.ClaudeLLMAgent',
+    'BatchScorer': '.BatchScorer'
+}
+
+def __getattr__(name):
+    if name in _LAZY_AGENTS:
+        agent_class = getattr(importlib.import_module(_LAZY_AGENTS[name], __name__), name)
+        globals()[name] = agent_class
+        return agent_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'GeminiLLMAgent',
     'OpenAILLMAgent',
-    'ClaudeLLMAgent'
+    'ClaudeLLMAgent',
+    'AgentRunner',
+    'CascadeAgent',
+    'BatchScorer'
 ]
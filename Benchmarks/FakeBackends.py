@@ -0,0 +1,304 @@
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from Pipeline.JobPosting import JobPosting
+from Sheets.GoogleSheetsManager import GoogleSheetsManager
+from Utils.ResponseParser import ScoringResult
+
+class SyntheticJobFeed:
+    """
+    Deterministic stand-in for LinkedinScraper: generates postings with realistic descriptions
+    (sections, boilerplate, salary text on some of them) and repeats some job ids like the real feed does.
+    """
+
+    TITLES = ['Product Manager', 'Senior Product Manager', 'Group Product Manager', 'Technical Product Manager',
+              'Principal Product Manager', 'Product Owner', 'Director of Product', 'Data Engineer']
+    COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Tyrell']
+    SKILLS = ['roadmap', 'stakeholder management', 'SQL', 'A/B testing', 'agile', 'Python', 'B2B SaaS',
+              'payments', 'machine learning', 'analytics', 'pricing', 'go-to-market', 'APIs', 'platform']
+
+    BOILERPLATE = (
+        "About Us\n{company} is a leading company on a mission to change how the world works. "
+        "Our culture values ownership, curiosity and kindness.\n\n"
+        # LinkedIn innerText lists have no bullets, one item per line
+        "Benefits\nMedical, dental and vision insurance\n401(k) matching\nUnlimited PTO\nHome office stipend\n\n"
+        "Equal Opportunity Employer\n{company} is an equal opportunity employer and considers all applicants "
+        "without regard to race, color, religion, sex, national origin, disability or protected veteran status. "
+        "We provide reasonable accommodation to applicants with disabilities."
+    )
+
+    def __init__(self, count: int, seed: int = 7, duplicate_rate: float = 0.05, salary_rate: float = 0.6,
+                 delay: float = 0.0):
+        """
+        Initialize the feed.
+
+        Args:
+            count: Number of postings emitted
+            seed: Random seed, the same seed always produces the same feed
+            duplicate_rate: Share of postings that repeat an earlier job id
+            salary_rate: Share of postings that publish a salary range
+            delay: Seconds to wait between postings, to simulate scraping time
+        """
+        self.count = count
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.salary_rate = salary_rate
+        self.delay = delay
+
+    def job_id(self, position: int) -> str:
+        return str(4000000000 + position)
+
+    def _description(self, rng: random.Random, title: str, company: str) -> str:
+        skills = rng.sample(self.SKILLS, 5)
+        paragraphs = [
+            f"{company} is hiring a {title} to own the roadmap of our {skills[0]} products.",
+            "Responsibilities\n" + '\n'.join(
+                f"- Lead {skill} initiatives with engineering, design and sales" for skill in skills),
+            "Requirements\n" + '\n'.join(
+                f"- {rng.randint(3, 10)}+ years of experience with {skill}" for skill in skills[:3]),
+        ]
+        if rng.random() < self.salary_rate:
+            low = rng.randrange(110, 220, 5) * 1000
+            paragraphs.append(f"Salary range: ${low:,} - ${low + rng.randrange(20, 80, 5) * 1000:,} per year")
+        paragraphs.append(self.BOILERPLATE.format(company=company))
+        return '\n\n'.join(paragraphs)
+
+    def __iter__(self) -> Iterator[JobPosting]:
+        rng = random.Random(self.seed)
+        for position in range(self.count):
+            if position and rng.random() < self.duplicate_rate:
+                job_position = rng.randrange(position)
+            else:
+                job_position = position
+            # Posting content only depends on its id, so a repeated id is an identical posting
+            job_rng = random.Random(self.seed * 1000003 + job_position)
+            title = job_rng.choice(self.TITLES)
+            company = job_rng.choice(self.COMPANIES)
+            job_id = self.job_id(job_position)
+
+            yield JobPosting(job_id, 'United States', title, company, 'Remote', '2025-01-01', '1 day ago',
+                             f"https://www.linkedin.com/jobs/view/{job_id}", '', ['Remote', 'Full-time'],
+                             self._description(job_rng, title, company), ', '.join(job_rng.sample(self.SKILLS, 3)))
+
+    def run(self, on_data: Callable[[JobPosting], None]) -> None:
+        """Emit every posting to on_data, like the scraper's Events.DATA handler."""
+        for posting in self:
+            if self.delay:
+                time.sleep(self.delay)
+            on_data(posting)
+
+class FakeMessage:
+    """Minimal AIMessage: the content and the usage_metadata read by LoadUtils.get_token_usage."""
+
+    __slots__ = ('content', 'usage_metadata')
+
+    def __init__(self, content: str, usage_metadata: Dict[str, Any]):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+class FakeChatModel:
+    """
+    Chat model stand-in with the invoke/ainvoke interface the agents use.
+
+    Latency follows a log-normal distribution around latency_median, a share of calls fail, a share of
+    scoring answers is malformed, and the usage metadata reports the prompt prefix as cached after the
+    first call, like provider prompt caching. A job gets the same score from every call, so a screening
+    answer agrees with the full evaluation.
+    """
+
+    JOB = re.compile(r"<job>(.*?)</job>", re.DOTALL)
+
+    def __init__(self, latency_median: float = 0.05, latency_sigma: float = 0.5, error_rate: float = 0.0,
+                 json_fence: bool = False, seed: int = 11, malformed_rate: float = 0.0):
+        """
+        Initialize the fake model.
+
+        Args:
+            latency_median: Median seconds per call
+            latency_sigma: Spread of the log-normal latency distribution (0 gives a constant latency)
+            error_rate: Share of calls that raise, like a provider error or timeout
+            json_fence: Wrap the JSON in a ```json fence, as Gemini answers
+            seed: Random seed for latencies, failures and scores
+            malformed_rate: Share of scoring answers written as a Python dict with a trailing comma
+        """
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.json_fence = json_fence
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+
+    @staticmethod
+    def _text(content: Any) -> str:
+        if isinstance(content, list):
+            return ''.join(part.get('text', '') if isinstance(part, dict) else str(part) for part in content)
+        return str(content)
+
+    def _draw(self) -> tuple:
+        """Draw latency, failure and score under the lock so concurrent calls stay reproducible per call order."""
+        with self._lock:
+            self.calls += 1
+            latency = self.latency_median * math.exp(self.latency_sigma * self._rng.gauss(0, 1))
+            return (latency, self._rng.random() < self.error_rate, self._rng.randint(40, 95),
+                    self._rng.random() < self.malformed_rate)
+
+    def _respond(self, messages: List[Any], failed: bool, score: int, malformed: bool = False) -> FakeMessage:
+        if failed:
+            raise RuntimeError("Fake provider error")
+
+        texts = [self._text(getattr(message, 'content', message)) for message in messages]
+        job = self.JOB.search(texts[-1])
+        if job is not None:
+            score = 40 + zlib.crc32(job.group(1).encode('utf-8')) % 56
+
+        if 'only the overall_score' in texts[-1]:
+            # SCREENING_PROMPT answer
+            content = json.dumps({'overall_score': score})
+        # Resume customization prompts carry the scoring recommendations, scoring prompts do not
+        elif '<recommendations>' not in texts[-1]:
+            # Every RESUME_PROMPT field, so the parser and sheet columns see a complete answer
+            answer: ScoringResult = {
+                'overall_score': score,
+                'scoring_breakdown': {
+                    'skills_match': min(100, score + 5),
+                    'experience_relevance': score,
+                    'keywords_coverage': max(0, score - 10),
+                    'years_of_experience': min(100, score + 10)
+                },
+                'gaps': ['No SQL experience listed', 'Agile ceremonies not mentioned'],
+                'keyword_analysis': {'missing_keywords': ['SQL', 'agile']},
+                'improvement_recommendations': [
+                    {'priority': 'High', 'category': 'Skills', 'recommendation': 'Quantify roadmap impact',
+                     'example_before': 'Owned roadmap', 'example_after': 'Owned roadmap growing revenue 20%'},
+                    {'priority': 'Medium', 'category': 'Keywords', 'recommendation': 'Mention A/B testing',
+                     'example_before': 'Ran experiments', 'example_after': 'Ran A/B tests on pricing'}
+                ],
+                'ats_compatibility': {'score': score - 5, 'issues': 'Missing keywords: SQL, agile'},
+                'summary': f"Solid product match scored {score}, missing SQL and agile keywords"
+            }
+            # The defects ResponseParser repairs: single quotes, Python literals, trailing comma
+            content = repr(answer)[:-1] + ',}' if malformed else json.dumps(answer)
+            if self.json_fence:
+                content = f"```json\n{content}\n```"
+        else:
+            content = "# Jane Doe\n\n## Experience\n\n- Product Manager, Acme\n"
+
+        prefix = texts[0] if len(texts) > 1 else ''
+        with self._lock:
+            cached = prefix in self._seen_prefixes
+            self._seen_prefixes.add(prefix)
+
+        input_tokens = sum(len(text) for text in texts) // 4
+        return FakeMessage(content, {
+            'input_tokens': input_tokens,
+            'output_tokens': len(content) // 4,
+            'input_token_details': {'cache_read': len(prefix) // 4 if cached else 0}
+        })
+
+    def invoke(self, messages: List[Any], **kwargs) -> FakeMessage:
+        latency, failed, score, malformed = self._draw()
+        time.sleep(latency)
+        return self._respond(messages, failed, score, malformed)
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> FakeMessage:
+        latency, failed, score, malformed = self._draw()
+        await asyncio.sleep(latency)
+        return self._respond(messages, failed, score, malformed)
+
+class InMemorySheetsService:
+    """
+    In-memory stand-in for the googleapiclient Sheets service, supporting the
+    spreadsheets().values().get(...) and .append(...) calls GoogleSheetsManager makes.
+    """
+
+    RANGE = re.compile(r"^(?P<sheet>[^!]+)!(?P<first_col>[A-Z]+)(?P<first_row>\d*):(?P<last_col>[A-Z]+)(?P<last_row>\d*)$")
+
+    def __init__(self, rows: Optional[List[List[Any]]] = None, latency: float = 0.0):
+        """
+        Initialize the service.
+
+        Args:
+            rows: Initial sheet content, header row included
+            latency: Seconds added to every request, to simulate the API round trip
+        """
+        self.rows: List[List[Any]] = [list(row) for row in rows or []]
+        self.latency = latency
+        self.requests = {'get': 0, 'append': 0}
+        self._lock = threading.Lock()
+
+    # The manager chains spreadsheets().values(), both return the service itself
+    def spreadsheets(self) -> 'InMemorySheetsService':
+        return self
+
+    def values(self) -> 'InMemorySheetsService':
+        return self
+
+    @staticmethod
+    def _column_index(letters: str) -> int:
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - ord('A') + 1
+        return index - 1
+
+    def _execute(self, handler: Callable[[], Dict[str, Any]]) -> '_Request':
+        return _Request(handler, self.latency)
+
+    def get(self, spreadsheetId: str, range: str) -> '_Request':
+        def handler() -> Dict[str, Any]:
+            match = self.RANGE.match(range)
+            first_col, last_col = self._column_index(match['first_col']), self._column_index(match['last_col'])
+            first_row = int(match['first_row'] or 1)
+            with self._lock:
+                self.requests['get'] += 1
+                values = [row[first_col:last_col + 1] for row in self.rows[first_row - 1:]]
+            return {'values': values} if values else {}
+        return self._execute(handler)
+
+    def append(self, spreadsheetId: str, range: str, valueInputOption: str, insertDataOption: str,
+               body: Dict[str, Any]) -> '_Request':
+        def handler() -> Dict[str, Any]:
+            sheet = range.split('!')[0]
+            new_rows = [list(row) for row in body['values']]
+            with self._lock:
+                self.requests['append'] += 1
+                first_row = len(self.rows) + 1
+                self.rows.extend(new_rows)
+            last_row = first_row + len(new_rows) - 1
+            return {'updates': {'updatedRows': len(new_rows), 'updatedRange': f"{sheet}!A{first_row}:Z{last_row}"}}
+        return self._execute(handler)
+
+class _Request:
+    """Deferred request, runs when execute() is called like a googleapiclient HttpRequest."""
+
+    __slots__ = ('handler', 'latency')
+
+    def __init__(self, handler: Callable[[], Dict[str, Any]], latency: float):
+        self.handler = handler
+        self.latency = latency
+
+    def execute(self) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.handler()
+
+class InMemorySheetsManager(GoogleSheetsManager):
+    """GoogleSheetsManager backed by an InMemorySheetsService instead of the Google API."""
+
+    def __init__(self, service: InMemorySheetsService, sheet_name: str = 'Jobs', **kwargs):
+        self._service = service
+        kwargs.setdefault('flush_on_exit', False)
+        super().__init__(credentials_file='', spreadsheet_id='benchmark', sheet_name=sheet_name, **kwargs)
+
+    def _authenticate(self, credentials_file: str) -> InMemorySheetsService:
+        return self._service
@@ -0,0 +1,361 @@
+import argparse
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from typing import Any, Dict, List, Optional
+
+import Agents
+from Agents.BatchBackends import LocalBatchBackend
+from Pipeline.JobPipeline import JobPipeline
+from Pipeline.JobPosting import JobPosting
+from Sheets.JobIndex import JobIndex
+from Utils.LoadUtils import LoadUtils
+from Utils.RelevanceGate import RelevanceGate
+from Utils.DescriptionCompactor import DescriptionCompactor
+from Utils.UsageTracker import UsageTracker
+from Utils.PdfRenderPool import PdfRenderPool
+from Utils.LogManager import LogManager
+from Benchmarks.FakeBackends import SyntheticJobFeed, FakeChatModel, InMemorySheetsService, InMemorySheetsManager
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_RESUME = """
+Jane Doe - Senior Product Manager
+Experience: 8 years leading B2B SaaS and payments products. Owned the roadmap of an analytics platform,
+ran A/B testing and pricing experiments, partnered with engineering on APIs and machine learning features,
+stakeholder management across sales and go-to-market. Skills: SQL, Python, agile, roadmap, analytics.
+"""
+
+class StageTimer:
+    """
+    Accumulates the time spent in selected methods by temporarily wrapping them.
+
+    Times are summed over every call, so with concurrent workers a stage can add up to more than the wall time.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._originals: List[tuple] = []
+
+    def _add(self, stage: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+
+    def wrap(self, owner: Any, name: str, stage: str) -> None:
+        """Time every call of owner.name (instance method, class staticmethod, sync or async) as stage."""
+        static_attribute = inspect.getattr_static(owner, name)
+        original = getattr(owner, name)
+
+        if inspect.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self._add(stage, time.perf_counter() - started)
+        else:
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self._add(stage, time.perf_counter() - started)
+
+        self._originals.append((owner, name, static_attribute, inspect.isclass(owner)))
+        setattr(owner, name, staticmethod(timed) if isinstance(static_attribute, staticmethod) else timed)
+
+    def restore(self) -> None:
+        """Put back every wrapped method, class attributes included."""
+        for owner, name, static_attribute, is_class in reversed(self._originals):
+            if is_class:
+                setattr(owner, name, static_attribute)
+            else:
+                # The wrapper was set on the instance, removing it exposes the class method again
+                delattr(owner, name)
+        self._originals.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: {'calls': int(entry['calls']), 'seconds': round(entry['seconds'], 3)}
+                for stage, entry in sorted(self.stages.items())}
+
+class PipelineBenchmark:
+    """
+    Offline end-to-end benchmark of JobPipeline.
+
+    The real agents, GoogleSheetsManager, JobIndex and pipeline stages run unchanged, only the
+    network boundaries are replaced: the scraper by a SyntheticJobFeed, the chat models inside the
+    agents by FakeChatModel, and the Sheets API by an InMemorySheetsService.
+    """
+
+    def __init__(self, providers: Optional[List[str]] = None, mode: str = 'streaming',
+                 max_concurrency: int = 5, queue_size: int = 50, latency_median: float = 0.05,
+                 latency_sigma: float = 0.5, error_rate: float = 0.0, sheets_latency: float = 0.0,
+                 existing_ratio: float = 0.1, customize: bool = True, pdf_workers: int = 0,
+                 trace_memory: bool = True, seed: int = 7, malformed_rate: float = 0.0,
+                 cascade: bool = False, screening_threshold: int = 60, provider_batch: bool = False):
+        """
+        Initialize the benchmark.
+
+        Args:
+            providers: Providers to run, 'gemini' is always included
+            mode: 'streaming' (run_streaming) or 'batch' (run_batch)
+            max_concurrency: Jobs scored at the same time
+            queue_size: Streaming queue size
+            latency_median: Median seconds per fake LLM call
+            latency_sigma: Spread of the log-normal LLM latency
+            error_rate: Share of fake LLM calls that fail
+            sheets_latency: Seconds added to every fake Sheets request
+            existing_ratio: Share of the feed already present in the sheet before the run
+            customize: Run resume customization and PDF rendering for good matches
+            pdf_workers: Render PDFs in a PdfRenderPool with this many processes, 0 renders inline
+            trace_memory: Measure peak Python memory with tracemalloc (slows the run down)
+            seed: Random seed of the feed and the fake models
+            malformed_rate: Share of fake scoring answers that need repairing
+            cascade: Score through a CascadeAgent, the full evaluation only for jobs passing the screening
+            screening_threshold: Screening score needed for the full evaluation
+            provider_batch: Score through a BatchScorer with LocalBatchBackend files, implies mode 'batch'
+        """
+        self.providers = ['gemini'] + [name for name in (providers or []) if name != 'gemini']
+        self.mode = 'batch' if provider_batch else mode
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.sheets_latency = sheets_latency
+        self.existing_ratio = existing_ratio
+        self.customize = customize
+        self.pdf_workers = pdf_workers
+        self.trace_memory = trace_memory
+        self.seed = seed
+        self.malformed_rate = malformed_rate
+        self.cascade = cascade
+        self.screening_threshold = screening_threshold
+        self.provider_batch = provider_batch
+
+    def _build_agents(self, usage_tracker: UsageTracker) -> Dict[str, Any]:
+        """Create the real agents and swap their chat models for fakes."""
+        # The provider clients are never called, they only need a key to be constructed
+        for variable in ('google_api_key', 'OPENAI_API_KEY', 'ANTHROPIC_API_KEY'):
+            os.environ.setdefault(variable, 'benchmark')
+
+        # Agents are imported on first use, a single provider run never loads the other clients
+        factories = {
+            'gemini': lambda **options: Agents.GeminiLLMAgent(use_context_cache=False, usage_tracker=usage_tracker,
+                                                              **options),
+            'openai': lambda **options: Agents.OpenAILLMAgent(usage_tracker=usage_tracker, **options),
+            'claude': lambda **options: Agents.ClaudeLLMAgent(usage_tracker=usage_tracker, **options)
+        }
+
+        def fake_model(name: str, seed: int) -> FakeChatModel:
+            return FakeChatModel(self.latency_median, self.latency_sigma, self.error_rate,
+                                 json_fence=(name == 'gemini'), seed=seed, malformed_rate=self.malformed_rate)
+
+        agents = {}
+        for offset, name in enumerate(self.providers):
+            agent = factories[name]()
+            agent.llm = fake_model(name, self.seed + offset)
+            if self.cascade:
+                screener = factories[name](response_parser=agent.response_parser, screening=True)
+                screener.llm = fake_model(name, self.seed + offset + len(self.providers))
+                agent = Agents.CascadeAgent(screener, agent, screening_threshold=self.screening_threshold)
+            agents[name] = agent
+        return agents
+
+    def _seed_sheet(self, feed: SyntheticJobFeed) -> InMemorySheetsService:
+        """Sheet with the header and a share of the feed already written by an earlier run."""
+        rows = [JobPosting.COLUMNS]
+        existing = int(feed.count * self.existing_ratio)
+        if existing:
+            for position in range(0, feed.count, feed.count // existing):
+                rows.append([feed.job_id(position), 'United States', 'Existing job', 'Acme'])
+        return InMemorySheetsService(rows, latency=self.sheets_latency)
+
+    def run(self, count: int) -> Dict[str, Any]:
+        """
+        Run the pipeline on count synthetic postings.
+
+        Returns:
+            Dictionary with wall time, jobs/sec, per-stage time, peak memory and request counts
+        """
+        feed = SyntheticJobFeed(count, seed=self.seed)
+        service = self._seed_sheet(feed)
+        seeded_rows = len(service.rows)
+        usage_tracker = UsageTracker()
+        timer = StageTimer()
+
+        with tempfile.TemporaryDirectory() as work_directory:
+            os.environ['pdf_directory'] = work_directory
+
+            manager = InMemorySheetsManager(service)
+            job_index = JobIndex(manager, os.path.join(work_directory, 'job_index.sqlite'))
+            agents = self._build_agents(usage_tracker)
+            batch_scorer = None
+            if self.provider_batch:
+                # The file based stand-in answers each batch with the provider's fake chat model
+                batch_scorer = Agents.BatchScorer({
+                    name: LocalBatchBackend(getattr(agent, 'scorer', agent).llm,
+                                            os.path.join(work_directory, 'batches'), max_workers=self.max_concurrency)
+                    for name, agent in agents.items()
+                }, poll_interval=0.01)
+            pipeline = JobPipeline(
+                agents=agents,
+                manager=manager,
+                job_index=job_index,
+                resume_text=BENCHMARK_RESUME,
+                max_concurrency=self.max_concurrency,
+                queue_size=self.queue_size,
+                customization_score=80 if self.customize else 101,
+                pdf_pool=PdfRenderPool(self.pdf_workers) if self.pdf_workers else None,
+                relevance_gate=RelevanceGate(BENCHMARK_RESUME),
+                description_compactor=DescriptionCompactor(),
+                batch_scorer=batch_scorer
+            )
+
+            timer.wrap(job_index, 'sync', 'index_sync')
+            timer.wrap(pipeline, 'filter_job', 'filter')
+            timer.wrap(pipeline, 'build_row', 'build_row')
+            timer.wrap(manager, 'add_records', 'sheets_write')
+            timer.wrap(LoadUtils, 'extract_salary_columns', 'salary_batch')
+            timer.wrap(LoadUtils, 'save_to_pdf', 'pdf')
+            # A cascade delegates customization to its full agent
+            timer.wrap(getattr(agents['gemini'], 'scorer', agents['gemini']), 'LLM_Resume_Customization', 'customize')
+            if pipeline.pdf_pool is not None:
+                # Rendering happens in the worker processes, only the final wait is visible here
+                timer.wrap(pipeline.pdf_pool, 'close', 'pdf_wait')
+            for name, agent in agents.items():
+                timer.wrap(agent, 'aexecute_agent', f"score_{name}")
+            if batch_scorer is not None:
+                timer.wrap(batch_scorer, 'score', 'score_batches')
+
+            if self.trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+
+            try:
+                # The pipeline prints progress for every posting, keep it out of the report
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    job_index.sync()
+                    if self.mode == 'streaming':
+                        pipeline.run_streaming(lambda: feed.run(pipeline.submit))
+                    else:
+                        job_postings = []
+                        scrape_started = time.perf_counter()
+                        feed.run(job_postings.append)
+                        timer._add('scrape', time.perf_counter() - scrape_started)
+                        pipeline.run_batch(job_postings)
+                    if pipeline.pdf_pool is not None:
+                        pipeline.pdf_pool.close()
+            finally:
+                wall = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+                if self.trace_memory:
+                    tracemalloc.stop()
+                timer.restore()
+                job_index.close()
+
+        return {
+            'postings': count,
+            'mode': self.mode,
+            'providers': self.providers,
+            'max_concurrency': self.max_concurrency,
+            'wall_seconds': round(wall, 3),
+            'jobs_per_second': round(count / wall, 2) if wall else None,
+            'rows_written': len(service.rows) - seeded_rows,
+            'stages': timer.summary(),
+            'peak_memory_mb': round(peak / (1024 * 1024), 2) if peak is not None else None,
+            'sheets_requests': dict(service.requests),
+            'llm_usage': usage_tracker.summary()['totals'],
+            'response_parsing': {name: agent.response_parser.summary() for name, agent in agents.items()},
+            'cascade': {name: agent.summary() for name, agent in agents.items()} if self.cascade else None,
+            'batch_scoring': batch_scorer.summary() if batch_scorer is not None else None,
+            'pdf_pool': pipeline.pdf_pool.summary() if pipeline.pdf_pool is not None else None
+        }
+
+    @staticmethod
+    def format_result(result: Dict[str, Any]) -> str:
+        """One human-readable block per run."""
+        lines = [f"{result['postings']} postings ({result['mode']}, {', '.join(result['providers'])}, "
+                 f"concurrency {result['max_concurrency']}): {result['wall_seconds']}s, "
+                 f"{result['jobs_per_second']} jobs/s, {result['rows_written']} rows written, "
+                 f"peak memory {result['peak_memory_mb']} MB"]
+        for stage, entry in result['stages'].items():
+            lines.append(f"    {stage:<16} {entry['seconds']:>10.3f}s  {entry['calls']:>7} calls")
+        lines.append(f"    sheets requests {result['sheets_requests']}, llm calls {result['llm_usage']['calls']}, "
+                     f"output tokens {result['llm_usage']['output_tokens']}, "
+                     f"estimated cost ${result['llm_usage']['estimated_cost_usd']}")
+        for name, parsing in result['response_parsing'].items():
+            lines.append(f"    {name} answers repaired {parsing['repaired']}, retried {parsing['retries']}, "
+                         f"failed {parsing['failed']}")
+        for name, cascade in (result['cascade'] or {}).items():
+            lines.append(f"    {name} screened {cascade['screened']}, full evaluations {cascade['passed']}, "
+                         f"screened out {cascade['screened_out']}")
+        return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description='Offline JobPipeline benchmark with fake scraper, LLM and Sheets backends')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Number of postings per run')
+    parser.add_argument('--mode', choices=['streaming', 'batch'], default='streaming')
+    parser.add_argument('--providers', nargs='+', default=['gemini'], choices=['gemini', 'openai', 'claude'])
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Median fake LLM latency in milliseconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Share of fake scoring answers that need repairing')
+    parser.add_argument('--cascade', action='store_true', help='Screen every job before the full evaluation')
+    parser.add_argument('--screening-threshold', type=int, default=60, help='Screening score needed for the full evaluation')
+    parser.add_argument('--provider-batch', action='store_true', help='Score through provider batches (local file stand-in)')
+    parser.add_argument('--sheets-latency-ms', type=float, default=0)
+    parser.add_argument('--pdf-workers', type=int, default=0, help='Render PDFs in this many processes, 0 renders inline')
+    parser.add_argument('--no-customize', action='store_true', help='Skip resume customization and PDF rendering')
+    parser.add_argument('--no-memory', action='store_true', help='Do not trace memory (faster, no peak memory)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    # Same logging setup as jobsearch.py, so log formatting is part of the measured cost
+    LogManager.configure(os.devnull, level=logging.INFO)
+
+    benchmark = PipelineBenchmark(
+        providers=args.providers,
+        mode=args.mode,
+        max_concurrency=args.concurrency,
+        latency_median=args.latency_ms / 1000,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        cascade=args.cascade,
+        screening_threshold=args.screening_threshold,
+        provider_batch=args.provider_batch,
+        sheets_latency=args.sheets_latency_ms / 1000,
+        customize=not args.no_customize,
+        pdf_workers=args.pdf_workers,
+        trace_memory=not args.no_memory
+    )
+
+    results = []
+    for size in args.sizes:
+        result = benchmark.run(size)
+        results.append(result)
+        print(PipelineBenchmark.format_result(result))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    return results
+
+if __name__ == '__main__':
+    main()
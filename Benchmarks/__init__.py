@@ -0,0 +1,11 @@
+from .FakeBackends import SyntheticJobFeed, FakeChatModel, InMemorySheetsService, InMemorySheetsManager
+from .PipelineBenchmark import PipelineBenchmark, StageTimer
+
+__all__ = [
+    'SyntheticJobFeed',
+    'FakeChatModel',
+    'InMemorySheetsService',
+    'InMemorySheetsManager',
+    'PipelineBenchmark',
+    'StageTimer'
+]
@@ -0,0 +1,485 @@
+import asyncio
+import logging
+
+import pandas as pd
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Agents.AgentRunner import AgentRunner
+from Utils.LoadUtils import LoadUtils
+from Utils.LogManager import LogManager
+from Pipeline.JobPosting import JobPosting, JobBatch
+
+logger = logging.getLogger(__name__)
+
+class JobPipeline:
+    """
+    Salary filter, dedupe, LLM scoring and Google Sheets write for scraped job postings.
+
+    Postings can be processed as one batch after scraping (run_batch) or streamed while
+    the scraper is still running (run_streaming), in which case the scraper pushes each
+    posting onto a bounded queue consumed by max_concurrency workers.
+    """
+
+    def __init__(self, agents: Dict[str, Any], manager, job_index, resume_text: str,
+                 min_salary: float = 160000, salary_check: str = 'any',
+                 max_concurrency: int = 5, provider_timeout: Optional[float] = 120,
+                 queue_size: int = 50, customization_score: int = 80, relevance_gate=None,
+                 description_compactor=None, pdf_pool=None, journal=None, batch_scorer=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            agents: Mapping of provider name to agent, 'gemini' is required and drives resume customization
+            manager: GoogleSheetsManager the scored rows are written to
+            job_index: Job ids already in the sheet (JobIndex or any container supporting 'in' and add)
+            resume_text: All the content of your resume
+            min_salary: Minimum salary threshold for postings that publish a salary
+            salary_check: How to compare the salary range to min_salary (see LoadUtils.meets_minimum_salary)
+            max_concurrency: Jobs scored at the same time
+            provider_timeout: Seconds to wait for each LLM provider before leaving its columns empty, agents
+                              whose rate limiter has a call_timeout are bounded per attempt instead
+            queue_size: Postings the scraper can get ahead of the scoring workers before it blocks
+            customization_score: Minimum Gemini score that triggers a customized resume
+            relevance_gate: Optional RelevanceGate that skips postings with a low local fit estimate
+            description_compactor: Optional DescriptionCompactor applied to the description sent to the LLM
+            pdf_pool: Optional PdfRenderPool, customized resumes are then rendered in worker processes
+                      instead of blocking the scoring loop (close the pool to wait for them)
+            journal: Optional RunJournal recording the stage of every job, so an interrupted run can be resumed
+            batch_scorer: Optional BatchScorer, run_batch then scores all new postings through the
+                          provider batch APIs instead of interactive calls
+        """
+        self.agents = agents
+        self.manager = manager
+        self.job_index = job_index
+        self.resume_text = resume_text
+        self.min_salary = min_salary
+        self.salary_check = salary_check
+        self.max_concurrency = max_concurrency
+        self.provider_timeout = provider_timeout
+        self.queue_size = queue_size
+        self.customization_score = customization_score
+        self.relevance_gate = relevance_gate
+        self.description_compactor = description_compactor
+        self.pdf_pool = pdf_pool
+        self.journal = journal
+        self.batch_scorer = batch_scorer
+        # Compacted description per job id, computed once and reused for scoring and customization
+        self._prompt_descriptions: Dict[Any, str] = {}
+
+        self.pending_ids = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        # Journal entries of the jobs being resumed, by job id (see run_resume)
+        self._resume_entries: Dict[Any, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def salary_info(self, description: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Parse the salary of one description and check it against the threshold.
+
+        Returns:
+            Tuple of (salary info dictionary, salary in threshold). Postings without a salary,
+            or with salary keywords but no amount, are kept.
+        """
+        salary_info = LoadUtils.extract_salary_info(description)
+
+        if salary_info['has_salary'] and salary_info['salary_text'] is not None:
+            in_threshold = LoadUtils.meets_minimum_salary(description, self.min_salary, self.salary_check, salary_info)
+        else:
+            in_threshold = True
+
+        return salary_info, in_threshold
+
+    def prompt_description(self, posting: JobPosting) -> str:
+        """Return the description sent to the LLM, compacted once per posting when a compactor is set."""
+        if self.description_compactor is None:
+            return posting.description
+
+        if posting.job_id not in self._prompt_descriptions:
+            self._prompt_descriptions[posting.job_id] = self.description_compactor.compact(posting.description)
+        return self._prompt_descriptions[posting.job_id]
+
+    @staticmethod
+    def _log_stage(job_id: Any, stage: str, **fields: Any) -> None:
+        """Structured per-job log record, its fields are JSON keys when the log is written as JSON."""
+        logger.info("Job %s reached stage %s", job_id, stage, extra=dict(fields, job_id=job_id, stage=stage))
+
+    def _record_stage(self, job_id: Any, stage: str, **data: Any) -> None:
+        """Log the stage a job reached and record it in the journal, when one is configured."""
+        fields = {}
+        if data.get('reason'):
+            fields['reason'] = data['reason']
+        if data.get('responses'):
+            fields['scores'] = {name: response.get('overall_score')
+                                for name, response in data['responses'].items() if response}
+        self._log_stage(job_id, stage, **fields)
+
+        if self.journal is not None:
+            self.journal.record(job_id, stage, **data)
+
+    def _record_failure(self, job_id: Any, error: Any) -> None:
+        """Log the error of a job and record it in the journal, it is retried from its last stage on resume."""
+        logger.info("Job %s failed: %s", job_id, error, extra={'job_id': job_id, 'stage': 'failed', 'error': str(error)})
+        if self.journal is not None:
+            self.journal.fail(job_id, error)
+
+    def filter_job(self, posting: JobPosting, salary_info: Optional[Dict[str, Any]] = None,
+                   in_threshold: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """
+        Apply the salary filter and the duplicate check to one posting.
+
+        Args:
+            posting: Scraped posting
+            salary_info: Precomputed salary info (batch mode), parsed here when None
+            in_threshold: Precomputed salary threshold check, used together with salary_info
+
+        Returns:
+            The salary info of a new posting worth scoring, None if the posting is skipped
+        """
+        logger.info("Title: %s ", posting.title)
+        logger.info("Company: %s ", posting.company)
+
+        if salary_info is None:
+            salary_info, in_threshold = self.salary_info(posting.description)
+
+        logger.info("Has Salary : %s ", salary_info['has_salary'])
+        logger.info("Has Salary : %s ", salary_info['salary_text'])
+        logger.info("Has Salary in Threshold: %s ", in_threshold)
+
+        if not in_threshold:
+            logger.info("Skipping Record, salary : %s , Salary Info Low: %s", posting.title, salary_info['salary_text'])
+            self._record_stage(posting.job_id, 'skipped', reason='salary below threshold')
+            return None
+
+        if posting.job_id in self.job_index or posting.job_id in self.pending_ids:
+            print(f"Value exists: {posting.company}")
+            logger.info("Job already in Google Sheets ")
+            self._log_stage(posting.job_id, 'skipped', reason='already in the sheet')
+            if self.journal is not None:
+                self.journal.skip_duplicate(posting.job_id)
+            return None
+
+        if self.relevance_gate is not None and not self.relevance_gate.should_score(posting.job_id, self.prompt_description(posting)):
+            self._prompt_descriptions.pop(posting.job_id, None)
+            self._record_stage(posting.job_id, 'skipped', reason='relevance below cutoff')
+            return None
+
+        print(f"Record does not exist:x {posting.company}")
+        logger.info("Job will be added to Google Sheets ")
+        self.pending_ids.add(posting.job_id)
+        self._record_stage(posting.job_id, 'filtered', salary_info=salary_info)
+
+        return salary_info
+
+    @staticmethod
+    def provider_columns(provider_response: Optional[Dict[str, Any]]) -> List[Any]:
+        """
+        Build the score, recommendations, ATS score and ATS issues cells for a secondary provider.
+        Returns empty cells when the provider failed or timed out.
+        """
+        if provider_response is None:
+            return ['', '', '', '']
+
+        provider_formatted_list = '\n'.join([
+            f"• [{rec['priority']}] {rec['category']}: {rec['recommendation']}"
+            for rec in provider_response['improvement_recommendations']
+        ])
+
+        return [provider_response['overall_score'], provider_formatted_list,
+                provider_response['ats_compatibility']['score'], provider_response['ats_compatibility']['issues']]
+
+    def build_row(self, posting: JobPosting, salary_info: Dict[str, Any],
+                  responses: Dict[str, Optional[Dict[str, Any]]]) -> Optional[List[Any]]:
+        """
+        Append the provider results to the posting and return its sheet row, customizing the resume for good matches.
+
+        Returns:
+            The row to write, None when Gemini failed (the job is retried on the next run)
+        """
+        try:
+            return self._build_row(posting, salary_info, responses)
+        finally:
+            self._prompt_descriptions.pop(posting.job_id, None)
+
+    def _build_row(self, posting: JobPosting, salary_info: Dict[str, Any],
+                   responses: Dict[str, Optional[Dict[str, Any]]]) -> Optional[List[Any]]:
+        llm_response = responses.get('gemini')
+
+        if llm_response is None:
+            logger.info("Gemini scoring failed, skipping job: %s", posting.job_id)
+            self.pending_ids.discard(posting.job_id)
+            self._record_failure(posting.job_id, 'Gemini scoring failed')
+            return None
+
+        logger.info("Gemini LLM responses: ")
+
+        recommendations = llm_response['improvement_recommendations']
+        formatted_list = '\n'.join([
+            f"• [{rec['priority']}] {rec['category']}: {rec['recommendation']}, before: {rec['example_before']} , after: {rec['example_after']} "
+            for rec in recommendations
+        ])
+
+        logger.info("Score: %s ", llm_response['overall_score'])
+        if self.relevance_gate is not None:
+            self.relevance_gate.record_llm_score(posting.job_id, llm_response['overall_score'])
+        logger.info("Recommendations: %s ", LogManager.payload(formatted_list))
+        logger.info("ATS Score: %s ", llm_response['ats_compatibility']['score'])
+        logger.info("ATS Issues: %s ", llm_response['ats_compatibility']['issues'])
+
+        if llm_response['overall_score'] >= self.customization_score:
+            self.customize_resume(posting, formatted_list, llm_response['ats_compatibility']['issues'])
+
+        posting.extend(salary_info['salary_text'],
+                       llm_response['overall_score'],
+                       formatted_list,
+                       llm_response['ats_compatibility']['score'],
+                       llm_response['ats_compatibility']['issues'])
+
+        for name in self.agents:
+            if name == 'gemini':
+                continue
+            provider_response = responses.get(name)
+            logger.info("%s Score: %s ", name, provider_response['overall_score'] if provider_response else 'no response')
+            posting.extend(*self.provider_columns(provider_response))
+
+        return posting.to_row()
+
+    def customize_resume(self, posting: JobPosting, formatted_list: str, ats_issues: Any) -> bool:
+        """
+        Ask Gemini for a resume tailored to the posting and save it as PDF.
+
+        Returns:
+            True if the PDF was written, or queued on the pdf_pool
+        """
+        llm_customization_resume_response = self.agents['gemini'].LLM_Resume_Customization(
+            self.prompt_description(posting), self.resume_text, formatted_list, ats_issues)
+        logger.info("Gemini LLM responses for Resume Customization:  %s", LogManager.payload(llm_customization_resume_response))
+
+        if llm_customization_resume_response is None:
+            return False
+
+        if self.pdf_pool is not None:
+            self.pdf_pool.submit(llm_customization_resume_response, posting.job_id, posting.title)
+            return True
+
+        resume_writing_response = LoadUtils.save_to_pdf(llm_customization_resume_response, posting.job_id, posting.title)
+        if resume_writing_response:
+            print(f"Saving Custimized Resume correctly.")
+        return resume_writing_response
+
+    def write_row(self, row: List[Any]) -> None:
+        """Buffer a row for the sheet and register the rows a flush confirms."""
+        self._register_written(self.manager.queue_record(row))
+
+    def flush(self) -> None:
+        """Write whatever is still buffered."""
+        self._register_written(self.manager.flush())
+
+    def _register_written(self, results: List[Dict[str, Any]]) -> None:
+        """Add the rows a flush confirmed to the job index."""
+        for result in results:
+            if result['added']:
+                self.job_index.add(result['record'], result['row'])
+                self._record_stage(result['record'][0], 'written')
+            else:
+                # The journal keeps the row, resuming the run writes it again
+                self._record_failure(result['record'][0], result['message'])
+
+    def _score_and_build(self, posting: JobPosting, salary_info: Dict[str, Any],
+                         responses: Dict[str, Optional[Dict[str, Any]]]) -> Optional[List[Any]]:
+        """Journal the provider responses, then build (and customize) the row of one job."""
+        if responses.get('gemini') is not None:
+            self._record_stage(posting.job_id, 'scored', responses=responses)
+
+        row = self.build_row(posting, salary_info, responses)
+        if row is not None:
+            self._record_stage(posting.job_id, 'customized', row=row)
+        return row
+
+    # ------------------------------------------------------------------
+    # Batch mode
+    # ------------------------------------------------------------------
+
+    def run_batch(self, job_postings: List[JobPosting]) -> None:
+        """
+        Process postings that were all scraped beforehand.
+
+        Salaries are parsed in one vectorized pass, then every new posting is scored concurrently,
+        or in one provider batch submission per provider when a batch_scorer is set.
+        """
+        batch = JobBatch(job_postings)
+
+        if self.journal is not None:
+            for posting in batch:
+                self.journal.add_posting(posting)
+
+        # Learn the term statistics from the whole batch before the first fit estimate
+        if self.relevance_gate is not None:
+            self.relevance_gate.add_documents(batch.column('description'), batch.column('job_id'))
+
+        # Parse the salary of every description once, in one vectorized pass
+        salary_columns = LoadUtils.extract_salary_columns(batch.column('description'), self.min_salary, self.salary_check)
+
+        # Jobs that passed the salary and duplicate checks, scored together afterwards
+        pending_jobs = []
+
+        for posting, salary_row in zip(batch, salary_columns.itertuples(index=False)):
+            try:
+                salary_info = {
+                    'has_salary': bool(salary_row.has_salary),
+                    'salary_text': None if pd.isna(salary_row.salary_text) else salary_row.salary_text,
+                    'amount': None if pd.isna(salary_row.salary_min) else (salary_row.salary_min, salary_row.salary_max)
+                }
+                in_threshold = salary_info['salary_text'] is None or bool(salary_row.meets_threshold)
+
+                salary_info = self.filter_job(posting, salary_info, in_threshold)
+                if salary_info is not None:
+                    pending_jobs.append((posting, salary_info))
+            except Exception as e:
+                # One bad posting must not stop the run
+                print(f"Error in Jobs Search: {e}")
+                logger.error("Filtering failed on job %s: %s", posting.job_id, e)
+                self._record_failure(posting.job_id, e)
+                continue
+
+        # Score all new jobs concurrently, results come back in the same order as pending_jobs
+        job_descriptions = [self.prompt_description(job[0]) for job in pending_jobs]
+        if self.batch_scorer is not None:
+            logger.info("Scoring %s jobs with provider batches on %s", len(pending_jobs), ', '.join(self.agents))
+            provider_responses = self.batch_scorer.score(self.agents, job_descriptions, self.resume_text)
+        else:
+            logger.info("Scoring %s jobs with up to %s concurrent jobs on %s", len(pending_jobs), self.max_concurrency, ', '.join(self.agents))
+            provider_responses = AgentRunner.run_fan_out_jobs(self.agents, job_descriptions, self.resume_text,
+                                                              self.max_concurrency, self.provider_timeout)
+
+        for (posting, salary_info), responses in zip(pending_jobs, provider_responses):
+            try:
+                row = self._score_and_build(posting, salary_info, responses)
+                if row is not None:
+                    self.write_row(row)
+            except Exception as e:
+                print(f"Error in Jobs Search: {e}")
+                logger.error("Building the row failed on job %s: %s", posting.job_id, e)
+                self.pending_ids.discard(posting.job_id)
+                self._record_failure(posting.job_id, e)
+                continue
+
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+
+    def submit(self, posting: JobPosting) -> None:
+        """
+        Push a scraped posting onto the scoring queue, called from the scraper's on_data thread.
+
+        Blocks while the queue is full, so scraping slows down when scoring falls behind.
+        """
+        if self._loop is None or self._queue is None:
+            raise RuntimeError("JobPipeline.submit called outside run_streaming")
+
+        if self.journal is not None:
+            self.journal.add_posting(posting)
+
+        asyncio.run_coroutine_threadsafe(self._queue.put(posting), self._loop).result()
+
+    def run_streaming(self, produce: Callable[[], None]) -> None:
+        """
+        Score postings while they are being scraped.
+
+        Args:
+            produce: Blocking function that runs the scraper, whose on_data handler calls submit
+        """
+        asyncio.run(self._run_streaming(produce))
+
+    def run_resume(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Finish the jobs of an interrupted run from their last journaled stage, without scraping again.
+
+        Args:
+            entries: Unfinished jobs, as returned by RunJournal.unfinished
+        """
+        self._resume_entries = {entry['job_id']: entry for entry in entries}
+        logger.info("Resuming %s jobs of run %s", len(entries), self.journal.run_id if self.journal else 'unknown')
+
+        def produce() -> None:
+            for entry in entries:
+                self.submit(entry['posting'])
+
+        self.run_streaming(produce)
+
+    async def _run_streaming(self, produce: Callable[[], None]) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=max(1, self.queue_size))
+        self._write_lock = asyncio.Lock()
+
+        workers = [asyncio.create_task(self._worker(i)) for i in range(max(1, self.max_concurrency))]
+
+        try:
+            # The scraper blocks, so it runs in its own thread while the workers consume the queue
+            await asyncio.to_thread(produce)
+        except Exception as e:
+            print(f"Error while scraping: {e}")
+        finally:
+            for _ in workers:
+                await self._queue.put(None)
+            await asyncio.gather(*workers)
+            self._register_written(await asyncio.to_thread(self.manager.flush))
+            self._loop = None
+            self._queue = None
+
+    async def _worker(self, worker_id: int) -> None:
+        """Take postings off the queue and run them through every stage until the end marker arrives."""
+        while True:
+            posting = await self._queue.get()
+            if posting is None:
+                return
+
+            try:
+                await self._process(posting)
+            except Exception as e:
+                # One bad posting must not stop the worker
+                print(f"Error in Jobs Search: {e}")
+                logger.error("Worker %s failed on job %s: %s", worker_id, posting.job_id, e)
+                self.pending_ids.discard(posting.job_id)
+                self._record_failure(posting.job_id, e)
+
+    async def _process(self, posting: JobPosting) -> None:
+        """Filter, score, build and write one posting, starting after the last journaled stage when resuming."""
+        entry = self._resume_entries.pop(posting.job_id, None)
+        stage = entry['stage'] if entry is not None else 'scraped'
+
+        if stage == 'scraped':
+            salary_info = self.filter_job(posting)
+            if salary_info is None:
+                return
+        else:
+            # Written before the crash, but the journal was not updated in time
+            if posting.job_id in self.job_index:
+                self._record_stage(posting.job_id, 'written')
+                return
+            self.pending_ids.add(posting.job_id)
+            salary_info = entry['salary_info']
+
+        if stage == 'customized':
+            row = entry['row']
+        else:
+            if stage == 'scored':
+                responses = entry['responses']
+            else:
+                responses = await AgentRunner.fan_out(self.agents, self.prompt_description(posting), self.resume_text, self.provider_timeout)
+
+            # Customization and PDF rendering are blocking, keep them off the event loop
+            row = await asyncio.to_thread(self._score_and_build, posting, salary_info, responses)
+            if row is None:
+                return
+
+        async with self._write_lock:
+            results = await asyncio.to_thread(self.manager.queue_record, row)
+        self._register_written(results)
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from typing import Any, List, Optional, Sequence
+
+class JobPosting:
+    """
+    One scraped job posting plus the result columns appended by the pipeline.
+
+    Uses __slots__ so thousands of postings stay small, and replaces the untyped
+    12-element lists that were indexed as record[0], record[10], ...
+    """
+
+    # Sheet column headers, in the same order as FIELDS
+    COLUMNS = ['Job_ID', 'Location', 'Title', 'Company', 'Place', 'Date', 'Date_Text',
+               'Link', 'Apply_Link', 'Inisghts', 'Description', 'Skills']
+
+    FIELDS = ('job_id', 'location', 'title', 'company', 'place', 'date', 'date_text',
+              'link', 'apply_link', 'insights', 'description', 'skills')
+
+    __slots__ = FIELDS + ('results',)
+
+    def __init__(self, job_id: str, location: str = '', title: str = '', company: str = '',
+                 place: str = '', date: Any = '', date_text: str = '', link: str = '',
+                 apply_link: str = '', insights: Any = None, description: str = '', skills: Any = None):
+        self.job_id = job_id
+        self.location = location
+        self.title = title
+        self.company = company
+        self.place = place
+        self.date = date
+        self.date_text = date_text
+        self.link = link
+        self.apply_link = apply_link
+        self.insights = insights
+        # Extra safety: ensure it's a string
+        self.description = description if isinstance(description, str) else (str(description) if description else '')
+        self.skills = skills
+        self.results: List[Any] = []
+
+    @classmethod
+    def from_event(cls, data) -> 'JobPosting':
+        """Build a posting from the scraper's EventData."""
+        return cls(data.job_id, data.location, data.title, data.company, data.place, data.date, data.date_text,
+                   data.link, data.apply_link, data.insights, data.description, data.skills)
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'JobPosting':
+        """Build a posting from a row laid out as COLUMNS (e.g. a saved CSV), extra cells become results."""
+        padded_row = list(row) + [''] * (len(cls.FIELDS) - len(row))
+        posting = cls(*padded_row[:len(cls.FIELDS)])
+        posting.results.extend(padded_row[len(cls.FIELDS):])
+        return posting
+
+    def extend(self, *values: Any) -> None:
+        """Append result columns (salary, scores, recommendations...) after the scraped ones."""
+        self.results.extend(values)
+
+    def to_row(self) -> List[Any]:
+        """Return the sheet row: the scraped columns followed by the result columns."""
+        return [getattr(self, field) for field in self.FIELDS] + self.results
+
+    def __repr__(self) -> str:
+        return f"JobPosting(job_id={self.job_id!r}, title={self.title!r}, company={self.company!r})"
+
+class JobBatch:
+    """
+    Columnar view over a list of postings for vectorized stages such as salary extraction.
+    """
+
+    __slots__ = ('postings',)
+
+    def __init__(self, postings: List[JobPosting]):
+        self.postings = postings
+
+    def column(self, field: str) -> pd.Series:
+        """Return one field of every posting as a Series indexed by position."""
+        return pd.Series([getattr(posting, field) for posting in self.postings], dtype=object)
+
+    def frame(self, fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Return the selected fields (all scraped fields by default) as a DataFrame, one column at a time."""
+        fields = fields or JobPosting.FIELDS
+        return pd.DataFrame({field: self.column(field) for field in fields})
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def __iter__(self):
+        return iter(self.postings)
@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from Pipeline.JobPosting import JobPosting
+
+logger = logging.getLogger(__name__)
+
+class RunJournal:
+    """
+    Crash-safe SQLite journal of the stage every job of a run has reached.
+
+    Stages are scraped -> filtered -> scored -> customized -> written, or skipped. The data each
+    stage produced (posting, salary info, LLM responses, sheet row) is stored with it, so an
+    interrupted run can be resumed from the last completed stage without scraping or paying
+    for the LLM calls again.
+    """
+
+    STAGES = ('scraped', 'filtered', 'scored', 'customized', 'written', 'skipped')
+
+    # Stages a job does not leave
+    FINAL_STAGES = ('written', 'skipped')
+
+    def __init__(self, db_path: str = './Cache/run_journal.sqlite', run_id: Optional[str] = None):
+        """
+        Open the journal.
+
+        Args:
+            db_path: Path to the SQLite database file, created if it does not exist
+            run_id: Run to continue, a new run is started when None
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Written from the scraper thread, the event loop and the worker threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL keeps every committed stage on disk even if the process is killed, without a full sync per job
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS runs (
+                   run_id TEXT PRIMARY KEY,
+                   started_at REAL NOT NULL,
+                   status TEXT NOT NULL
+               )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                   run_id TEXT NOT NULL,
+                   job_id TEXT NOT NULL,
+                   stage TEXT NOT NULL,
+                   posting TEXT,
+                   salary_info TEXT,
+                   responses TEXT,
+                   row TEXT,
+                   error TEXT,
+                   updated_at REAL NOT NULL,
+                   PRIMARY KEY (run_id, job_id)
+               )"""
+        )
+
+        if run_id is None:
+            run_id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            self._conn.execute("INSERT OR IGNORE INTO runs (run_id, started_at, status) VALUES (?, ?, 'running')",
+                               (run_id, time.time()))
+        else:
+            self._conn.execute("UPDATE runs SET status = 'running' WHERE run_id = ?", (run_id,))
+        self._conn.commit()
+        self.run_id = run_id
+
+    @staticmethod
+    def latest_unfinished_run(db_path: str = './Cache/run_journal.sqlite') -> Optional[str]:
+        """Id of the most recent run that did not complete, None if every run completed."""
+        if not os.path.exists(db_path):
+            return None
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute(
+                "SELECT run_id FROM runs WHERE status != 'completed' ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    @staticmethod
+    def _dump(value: Any) -> Optional[str]:
+        return None if value is None else json.dumps(value, default=str)
+
+    def add_posting(self, posting: JobPosting) -> None:
+        """Journal a scraped posting, a job id already in the journal keeps its stage."""
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR IGNORE INTO jobs (run_id, job_id, stage, posting, updated_at)
+                   VALUES (?, ?, 'scraped', ?, ?)""",
+                (self.run_id, str(posting.job_id), self._dump(posting.to_row()[:len(JobPosting.FIELDS)]), time.time())
+            )
+            self._conn.commit()
+
+    def record(self, job_id: Any, stage: str, salary_info: Optional[Dict[str, Any]] = None,
+               responses: Optional[Dict[str, Any]] = None, row: Optional[List[Any]] = None,
+               reason: Optional[str] = None) -> None:
+        """
+        Move a job to stage, keeping the data of the earlier stages.
+
+        Args:
+            job_id: Job id
+            stage: One of STAGES
+            salary_info: Salary info (filtered)
+            responses: Provider responses (scored)
+            row: Sheet row including the LLM columns (customized)
+            reason: Why the job was skipped, kept in the error column
+        """
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown journal stage: {stage}")
+
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO jobs (run_id, job_id, stage, salary_info, responses, row, error, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (run_id, job_id) DO UPDATE SET
+                       stage = excluded.stage,
+                       salary_info = COALESCE(excluded.salary_info, salary_info),
+                       responses = COALESCE(excluded.responses, responses),
+                       row = COALESCE(excluded.row, row),
+                       error = excluded.error,
+                       updated_at = excluded.updated_at""",
+                (self.run_id, str(job_id), stage, self._dump(salary_info), self._dump(responses), self._dump(row),
+                 reason, time.time())
+            )
+            self._conn.commit()
+
+    def skip_duplicate(self, job_id: Any) -> None:
+        """
+        Mark a job already in the sheet as skipped. Only a job still at the scraped stage moves, a
+        repeated posting of a job this run already filtered shares its entry and must not overwrite it.
+        """
+        with self._lock:
+            self._conn.execute(
+                """UPDATE jobs SET stage = 'skipped', error = 'already in the sheet', updated_at = ?
+                   WHERE run_id = ? AND job_id = ? AND stage = 'scraped'""",
+                (time.time(), self.run_id, str(job_id))
+            )
+            self._conn.commit()
+
+    def fail(self, job_id: Any, error: Any) -> None:
+        """Record the error of a job, it stays at its last completed stage and is retried on resume."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET error = ?, updated_at = ? WHERE run_id = ? AND job_id = ?",
+                (str(error), time.time(), self.run_id, str(job_id))
+            )
+            self._conn.commit()
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """
+        Jobs of the run that were not written or skipped.
+
+        Returns:
+            One dictionary per job with 'job_id', 'stage', 'posting' (JobPosting), 'salary_info',
+            'responses', 'row' and 'error' keys, in the order they were scraped
+        """
+        placeholders = ', '.join('?' * len(self.FINAL_STAGES))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT job_id, stage, posting, salary_info, responses, row, error FROM jobs
+                    WHERE run_id = ? AND stage NOT IN ({placeholders}) AND posting IS NOT NULL
+                    ORDER BY rowid""",
+                (self.run_id,) + self.FINAL_STAGES
+            ).fetchall()
+
+        entries = []
+        for job_id, stage, posting, salary_info, responses, row, error in rows:
+            entries.append({
+                'job_id': job_id,
+                'stage': stage,
+                'posting': JobPosting.from_row(json.loads(posting)),
+                'salary_info': json.loads(salary_info) if salary_info else None,
+                'responses': json.loads(responses) if responses else None,
+                'row': json.loads(row) if row else None,
+                'error': error
+            })
+        return entries
+
+    def summary(self) -> Dict[str, Any]:
+        """Number of jobs per stage and number of jobs with an error."""
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT stage, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY stage", (self.run_id,)
+            ).fetchall())
+            failed = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND error IS NOT NULL AND stage != 'skipped'",
+                (self.run_id,)
+            ).fetchone()[0]
+
+        return {'run_id': self.run_id, 'stages': counts, 'failed': failed}
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Mark the run completed when every job reached a final stage, incomplete otherwise.
+
+        Returns:
+            The journal summary
+        """
+        summary = self.summary()
+        unfinished = sum(count for stage, count in summary['stages'].items() if stage not in self.FINAL_STAGES)
+        status = 'completed' if unfinished == 0 else 'incomplete'
+
+        with self._lock:
+            self._conn.execute("UPDATE runs SET status = ? WHERE run_id = ?", (status, self.run_id))
+            self._conn.commit()
+
+        summary['status'] = status
+        logger.info("Run journal summary: %s", summary)
+        return summary
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,10 @@
+from .JobPosting import JobPosting, JobBatch
+from .JobPipeline import JobPipeline
+from .RunJournal import RunJournal
+
+__all__ = [
+    'JobPosting',
+    'JobBatch',
+    'JobPipeline',
+    'RunJournal'
+]
@@ -2,11 +2,14 @@ import json
 import pandas as pd
 import numpy as np 
 import logging
+import atexit
+import re
+import threading
+import time
 
-# Google Sheets imports
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 class GoogleSheetsManager:
     """
@@ -15,7 +18,9 @@ class GoogleSheetsManager:
 
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
-    def __init__(self, credentials_file: str, spreadsheet_id: str, sheet_name: str = 'Sheet1'):
+    def __init__(self, credentials_file: str, spreadsheet_id: str, sheet_name: str = 'Sheet1',
+                 flush_rows: int = 25, flush_bytes: int = 512 * 1024, flush_interval: float = 60.0,
+                 flush_on_exit: bool = True):
         """
         Initialize the Google Sheets Manager.
         
@@ -23,13 +28,38 @@ class GoogleSheetsManager:
             credentials_file: Path to service account JSON credentials file
             spreadsheet_id: The ID of the Google Spreadsheet
             sheet_name: Name of the sheet tab (default: 'Sheet1')
+            flush_rows: Buffered rows that trigger a write (see queue_record)
+            flush_bytes: Approximate buffered payload size in bytes that triggers a write
+            flush_interval: Seconds a queued record waits at most, a background timer writes the buffer then
+            flush_on_exit: Write any buffered rows when the interpreter exits, failed rows are logged
         """
         self.spreadsheet_id = spreadsheet_id
         self.sheet_name = sheet_name
         self.service = self._authenticate(credentials_file)
 
+        self.flush_rows = flush_rows
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buffer: List[List[Any]] = []
+        self._buffer_bytes = 0
+        self._last_flush = time.monotonic()
+        self._buffer_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Statuses of rows written by the timer, handed to the caller by its next queue_record or flush
+        self._timer_statuses: List[Dict[str, Any]] = []
+
+        # In-memory existence indexes, one set of key tuples per key_columns tuple (None means all columns)
+        self._indexes: Dict[Optional[Tuple[int, ...]], Set[Tuple[str, ...]]] = {}
+
+        if flush_on_exit:
+            atexit.register(self._flush_on_exit)
+
     def _authenticate(self, credentials_file: str):
         """Authenticate and return Google Sheets service."""
+        # googleapiclient takes a noticeable part of startup to import, only pay for it when connecting
+        from google.oauth2.service_account import Credentials
+        from googleapiclient.discovery import build
+
         creds = Credentials.from_service_account_file(
             credentials_file, 
             scopes=self.SCOPES
@@ -87,10 +117,80 @@ class GoogleSheetsManager:
         
         return result.get('values', [])
     
+    def read_rows(self, start_row: int = 1, columns: str = 'A:Z') -> List[List[Any]]:
+        """
+        Read rows starting at start_row, limited to a column span.
+        
+        Args:
+            start_row: First sheet row to read (1-indexed, row 1 is the header)
+            columns: Column span such as 'A:H', so long text columns can be left out
+        
+        Returns:
+            List of rows, where each row is a list of cell values
+        """
+        first_column, last_column = columns.split(':')
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f'{self.sheet_name}!{first_column}{start_row}:{last_column}'
+        ).execute()
+        
+        return result.get('values', [])
+    
+    @staticmethod
+    def _index_key(row: List[Any], key_columns: Optional[Tuple[int, ...]]) -> Tuple[str, ...]:
+        """
+        Build the lookup key of a row for the given key columns.
+        
+        Values are compared as strings, which is how the Sheets API returns them.
+        Without key columns the whole row is used, ignoring trailing empty cells.
+        """
+        if key_columns is None:
+            values = ['' if value is None else str(value) for value in row]
+            while values and values[-1] == '':
+                values.pop()
+            return tuple(values)
+
+        return tuple(str(row[i]) if i < len(row) and row[i] is not None else '' for i in key_columns)
+
+    def _get_index(self, key_columns: Optional[Tuple[int, ...]]) -> Set[Tuple[str, ...]]:
+        """Return the index for key_columns, downloading the sheet once to build it if needed."""
+        if key_columns not in self._indexes:
+            existing_records = self.read_all_records()
+
+            # Skip header row if it exists
+            data_rows = existing_records[1:] if len(existing_records) > 1 else existing_records
+
+            self._indexes[key_columns] = {self._index_key(row, key_columns) for row in data_rows}
+            logger.info("Built record index on columns %s with %s rows", key_columns, len(data_rows))
+
+        return self._indexes[key_columns]
+
+    def _update_indexes(self, record: List[Any]) -> None:
+        """Add a record that was just written to every index already built."""
+        for key_columns, index in self._indexes.items():
+            index.add(self._index_key(record, key_columns))
+
+    def invalidate_index(self, key_columns: Optional[List[int]] = None) -> None:
+        """
+        Drop cached existence indexes so the next record_exists re-reads the sheet.
+        
+        Args:
+            key_columns: Only drop the index for these key columns. If None, drops every index.
+        """
+        if key_columns:
+            self._indexes.pop(tuple(key_columns), None)
+        else:
+            self._indexes.clear()
+
     def record_exists(self, record: List[Any], key_columns: Optional[List[int]] = None) -> bool:
         """
         Check if a record exists in the sheet based on key columns.
         
+        The sheet is read once per key_columns combination to build an in-memory index,
+        later checks are O(1) lookups without network I/O. Rows written through
+        add_record/add_records are added to the index, call invalidate_index after
+        the sheet is edited elsewhere.
+        
         Args:
             record: The record to check (list of values)
             key_columns: List of column indices to use as keys (0-indexed).
@@ -99,33 +199,8 @@ class GoogleSheetsManager:
         Returns:
             True if record exists, False otherwise
         """
-        existing_records = self.read_all_records()
-        
-        # Skip header row if it exists
-        if len(existing_records) > 1:
-            data_rows = existing_records[1:]
-        else:
-            data_rows = existing_records
-        
-        for row in data_rows:
-            # Pad row with empty strings if shorter than record
-            padded_row = row + [''] * (len(record) - len(row))
-            
-            if key_columns:
-                # Compare only specified key columns
-                match = all(
-                    padded_row[i] == record[i] 
-                    for i in key_columns 
-                    if i < len(padded_row) and i < len(record)
-                )
-            else:
-                # Compare all columns
-                match = padded_row[:len(record)] == record
-            
-            if match:
-                return True
-        
-        return False
+        key_tuple = tuple(key_columns) if key_columns else None
+        return self._index_key(record, key_tuple) in self._get_index(key_tuple)
     
     def add_record(self, record: List[Any], skip_if_exists: bool = True, 
                    key_columns: Optional[List[int]] = None) -> Dict[str, Any]:
@@ -162,6 +237,8 @@ class GoogleSheetsManager:
                 insertDataOption='INSERT_ROWS',
                 body=body
             ).execute()
+
+            self._update_indexes(cleaned_record)
             
             return {
                 'added': True,
@@ -174,4 +251,142 @@ class GoogleSheetsManager:
                 'added': False,
                 'message': 'Record insert failure'
             }
-    
+
+    def add_records(self, records: List[List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Append many records to the sheet with a single API call.
+        
+        Args:
+            records: The records to add (list of lists of values)
+        
+        Returns:
+            One dictionary per record, in order, with 'added' (bool), 'message' (str),
+            'row' (sheet row number or None) and 'record' (the cleaned record) keys
+        """
+        if not records:
+            return []
+
+        cleaned_records = [self._clean_record(record) for record in records]
+
+        try:
+            result = self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A:A',
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body={'values': cleaned_records}
+            ).execute()
+        except Exception as e:
+            logger.error("Appending %s records failed: %s", len(cleaned_records), e)
+            return [
+                {'added': False, 'message': 'Record insert failure', 'row': None, 'record': record}
+                for record in cleaned_records
+            ]
+
+        updates = result.get('updates', {})
+        updated_rows = updates.get('updatedRows', 0)
+        first_row = self._first_row(updates.get('updatedRange', ''))
+
+        statuses = []
+        for offset, record in enumerate(cleaned_records):
+            added = offset < updated_rows
+            if added:
+                self._update_indexes(record)
+            statuses.append({
+                'added': added,
+                'message': 'Record added' if added else 'Record not reported as written',
+                'row': first_row + offset if added and first_row is not None else None,
+                'record': record
+            })
+
+        logger.info("Appended %s of %s records in one request", updated_rows, len(cleaned_records))
+        return statuses
+
+    def queue_record(self, record: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Buffer a record and write the buffer once it reaches flush_rows or flush_bytes.
+        
+        A record never waits longer than flush_interval: the first record of an empty buffer
+        starts a timer that writes the buffer from a background thread. The statuses of rows the
+        timer wrote are returned by the next queue_record or flush call, so callers still register
+        every row on their own thread, as long as they call flush() once they are done queueing.
+        
+        Args:
+            record: The record to add (list of values)
+        
+        Returns:
+            Per-row statuses (see add_records) of the rows written since the previous call, empty if nothing was flushed
+        """
+        cleaned_record = self._clean_record(record)
+        with self._buffer_lock:
+            self._buffer.append(cleaned_record)
+            self._buffer_bytes += len(json.dumps(cleaned_record, default=str))
+
+            if (len(self._buffer) >= self.flush_rows
+                    or self._buffer_bytes >= self.flush_bytes
+                    or self.flush_interval <= 0):
+                return self.flush()
+
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+                # A pending timer must not keep the interpreter alive, the exit flush writes the rows
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+            return self._take_timer_statuses()
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Write every buffered record with a single append call.
+        
+        Returns:
+            Per-row statuses (see add_records) of the written rows, including rows the timer wrote since the previous call
+        """
+        with self._buffer_lock:
+            statuses = self._take_timer_statuses()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if not self._buffer:
+                return statuses
+
+            records, self._buffer, self._buffer_bytes = self._buffer, [], 0
+            self._last_flush = time.monotonic()
+
+            return statuses + self.add_records(records)
+
+    def _take_timer_statuses(self) -> List[Dict[str, Any]]:
+        """Hand over the statuses of rows written by the flush timer."""
+        statuses, self._timer_statuses = self._timer_statuses, []
+        return statuses
+
+    def _flush_on_timer(self) -> None:
+        """Write the buffer once flush_interval has passed since its first record was queued."""
+        with self._buffer_lock:
+            # A timer that fired while flush() held the lock was cancelled too late, the buffer now
+            # belongs to the timer flush() or a later queue_record started
+            if self._flush_timer is not threading.current_thread():
+                return
+            self._flush_timer = None
+            if not self._buffer:
+                return
+            records, self._buffer, self._buffer_bytes = self._buffer, [], 0
+            self._last_flush = time.monotonic()
+            self._timer_statuses.extend(self.add_records(records))
+            logger.info("Flush timer wrote %s buffered records", len(records))
+
+    def _flush_on_exit(self) -> None:
+        """Write what is still buffered at interpreter exit, nobody is left to register the rows so failures are logged."""
+        failed = [status for status in self.flush() if not status['added']]
+        for status in failed:
+            job_id = status['record'][0] if status['record'] else None
+            logger.error("Record %s was not written at exit: %s", job_id, status['message'])
+        if failed:
+            print(f"{len(failed)} records could not be written to the sheet at exit, see the log")
+
+    @staticmethod
+    def _first_row(updated_range: str) -> Optional[int]:
+        """Extract the first row number from an A1 range such as 'Jobs!A10:Q12'."""
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        return int(match.group(1)) if match else None
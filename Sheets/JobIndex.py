@@ -0,0 +1,153 @@
+import logging
+import os
+import sqlite3
+
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class JobIndex:
+    """
+    Local SQLite mirror of the key columns of the Jobs sheet.
+
+    Only rows past the last synced row are downloaded, so startup no longer pulls the
+    description and recommendation cells of every job already in the sheet.
+    """
+
+    # Column span mirrored from the sheet: Job_ID, Location, Title, Company, Place, Date, Date_Text, Link
+    KEY_COLUMNS = 'A:H'
+
+    def __init__(self, manager, db_path: str = './Cache/job_index.sqlite'):
+        """
+        Initialize the job index.
+
+        Args:
+            manager: GoogleSheetsManager used to read new rows
+            db_path: Path to the SQLite database file, created if it does not exist
+        """
+        self.manager = manager
+        self.db_path = db_path
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if columns and 'sheet' not in columns:
+            # Mirrors written before rows were keyed by sheet cannot be attributed, they are downloaded again
+            logger.info("Job index predates per-sheet rows, rebuilding it")
+            self._conn.execute("DROP TABLE jobs")
+            self._conn.execute("DROP TABLE IF EXISTS sync_state")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                   sheet TEXT NOT NULL,
+                   job_id TEXT NOT NULL,
+                   title TEXT,
+                   company TEXT,
+                   link TEXT,
+                   sheet_row INTEGER,
+                   PRIMARY KEY (sheet, job_id)
+               )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sync_state (
+                   sheet TEXT PRIMARY KEY,
+                   last_row INTEGER NOT NULL
+               )"""
+        )
+        self._conn.commit()
+
+    @property
+    def last_row(self) -> int:
+        """Number of sheet rows (header included) already mirrored locally."""
+        row = self._conn.execute(
+            "SELECT last_row FROM sync_state WHERE sheet = ?", (self._sheet_key(),)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def sync(self) -> int:
+        """
+        Download the key columns of rows appended since the last sync.
+
+        Returns:
+            Number of new rows mirrored
+        """
+        last_row = self.last_row
+        start_row = last_row + 1
+        rows = self.manager.read_rows(start_row=start_row, columns=self.KEY_COLUMNS)
+
+        entries = []
+        for offset, row in enumerate(rows):
+            sheet_row = start_row + offset
+            # Row 1 is the header
+            if sheet_row == 1 or not row or not row[0]:
+                continue
+            entries.append(self._entry(row, sheet_row))
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO jobs (sheet, job_id, title, company, link, sheet_row) VALUES (?, ?, ?, ?, ?, ?)",
+            [(self._sheet_key(),) + entry for entry in entries]
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (sheet, last_row) VALUES (?, ?)",
+            (self._sheet_key(), last_row + len(rows))
+        )
+        self._conn.commit()
+
+        logger.info("Job index synced %s new jobs, %s jobs known", len(entries), len(self))
+        return len(entries)
+
+    def rebuild(self) -> int:
+        """
+        Drop the local mirror and download the key columns again, e.g. after rows were deleted in the sheet.
+
+        Returns:
+            Number of rows mirrored
+        """
+        self._conn.execute("DELETE FROM jobs WHERE sheet = ?", (self._sheet_key(),))
+        self._conn.execute("DELETE FROM sync_state WHERE sheet = ?", (self._sheet_key(),))
+        self._conn.commit()
+        return self.sync()
+
+    def add(self, record: List[Any], sheet_row: Optional[int] = None) -> None:
+        """
+        Register a record that was just written to the sheet.
+
+        The synced row count is left untouched, so rows appended by others in the meantime
+        are still picked up by the next sync.
+        """
+        if not record or not record[0]:
+            return
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO jobs (sheet, job_id, title, company, link, sheet_row) VALUES (?, ?, ?, ?, ?, ?)",
+            (self._sheet_key(),) + self._entry(record, sheet_row)
+        )
+        self._conn.commit()
+
+    def __contains__(self, job_id) -> bool:
+        if job_id is None:
+            return False
+        return self._conn.execute(
+            "SELECT 1 FROM jobs WHERE sheet = ? AND job_id = ?", (self._sheet_key(), str(job_id))
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE sheet = ?", (self._sheet_key(),)
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+    def _sheet_key(self) -> str:
+        """Identify the mirrored sheet, every row and sync state is stored under it so one database can hold several spreadsheets."""
+        return f"{self.manager.spreadsheet_id}/{self.manager.sheet_name}"
+
+    @staticmethod
+    def _entry(row: List[Any], sheet_row: Optional[int]) -> tuple:
+        """Build the (job_id, title, company, link, sheet_row) tuple stored for a row."""
+        padded_row = list(row) + [''] * (8 - len(row))
+        return (str(padded_row[0]), padded_row[2], padded_row[3], padded_row[7], sheet_row)
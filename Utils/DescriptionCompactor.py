@@ -0,0 +1,214 @@
+import logging
+import re
+import threading
+
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class DescriptionCompactor:
+    """
+    Remove boilerplate (EEO statements, benefits lists, company blurbs, legal disclaimers)
+    from job descriptions before they are sent to the LLM, and optionally cap their length.
+
+    The description stored in the sheet is not modified, only the text used in the prompt.
+    """
+
+    # Roughly 4 characters per token for English text
+    CHARS_PER_TOKEN = 4
+
+    # Headings that open a section which is dropped until the next heading
+    BOILERPLATE_HEADINGS = re.compile(
+        r"^\s*(?:#+\s*)?\**\s*(?:"
+        r"benefits?|perks(?:\s+(?:and|&)\s+benefits)?|what we offer|why (?:join us|work here|you'?ll love)[\w\s]*"
+        r"|our benefits|total rewards|compensation (?:and|&) benefits"
+        r"|about (?:us|the company|our company|the team at [\w\s]+)|who we are|our (?:story|mission|culture|values)"
+        r"|equal (?:employment )?opportunity(?: employer)?(?: statement)?|eeo(?: statement)?|diversity(?:,| and| &)? (?:equity|inclusion)[\w\s,&]*"
+        r"|accommodations?|reasonable accommodations?|legal(?: notice| disclaimer)?|disclaimer|privacy(?: notice| policy)?"
+        r"|e-?verify|pay transparency(?: notice| statement)?"
+        r")\s*:?\s*\**\s*:?\s*$",
+        re.IGNORECASE
+    )
+
+    # Legal statements, paragraphs containing them are dropped wherever they appear
+    LEGAL_PHRASES = re.compile(
+        r"equal (?:employment )?opportunity employer|without regard to (?:race|age|sex|religion)"
+        r"|regardless of (?:race|age|sex|gender|religion)|protected (?:veteran|characteristic|class)"
+        r"|affirmative action|fair chance (?:ordinance|act)|arrest (?:and|or) conviction records"
+        r"|consumer privacy act|unsolicited resumes|participates? in e-?verify"
+        r"|(?:contingent (?:up)?on|subject to) (?:a |the )?(?:successful )?(?:background check|drug (?:test|screen))",
+        re.IGNORECASE
+    )
+
+    # Phrases a real responsibility or requirement can contain ('background check products'),
+    # paragraphs containing them are only dropped outside the job content sections
+    BOILERPLATE_PHRASES = re.compile(
+        r"reasonable accommodation|e-?verify|privacy (?:notice|policy)|pay transparency|background check"
+        r"|drug[- ]free workplace|recruitment agencies",
+        re.IGNORECASE
+    )
+
+    # Headings of the job content, they always end a dropped section
+    CONTENT_HEADINGS = re.compile(
+        r"^\s*(?:#+\s*)?\**\s*(?:"
+        r"(?:key |your |primary |core |main )?(?:responsibilities|duties|accountabilities)"
+        r"|(?:minimum |basic |preferred |required |additional |job )?(?:requirements|qualifications)"
+        r"|about (?:the|this) (?:role|job|position|opportunity)|the role|role (?:overview|summary|description)"
+        r"|job (?:description|summary|overview)|position (?:overview|summary)|overview|summary"
+        r"|what you(?:'|’)?ll (?:do|be doing|bring|need)|what you (?:will do|bring|need)|what we(?:'|’)?re looking for"
+        r"|who you are|you (?:have|are|will)|(?:required |preferred |technical )?(?:skills|experience)(?: (?:and|&) (?:experience|qualifications))?"
+        r"|nice to have|bonus points|must haves?|education|salary|compensation|pay range|location"
+        r")\s*:?\s*\**\s*:?\s*$",
+        re.IGNORECASE
+    )
+
+    # A short line that looks like a section heading ('Responsibilities', '## Requirements:', ...)
+    HEADING = re.compile(r"^\s*(?:#+\s*)?\**\s*[A-Z][\w\s&,'/()-]{0,60}:?\s*\**\s*:?\s*$")
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        """
+        Initialize the compactor.
+
+        Args:
+            max_tokens: Optional per-job budget, longer descriptions are cut at a paragraph or word boundary
+        """
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self.descriptions = 0
+        self.original_chars = 0
+        self.compacted_chars = 0
+        self.truncated = 0
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        """Rough token count of text."""
+        return (len(text) + cls.CHARS_PER_TOKEN - 1) // cls.CHARS_PER_TOKEN
+
+    def _drop_boilerplate(self, text: str) -> str:
+        """Remove boilerplate sections and paragraphs, line by line."""
+        kept: List[str] = []
+        in_boilerplate_section = False
+        # Under a CONTENT_HEADINGS heading, until the next blank-line separated heading
+        in_content_section = False
+        # Lines dropped from the current section, and whether the previous line was blank
+        dropped_lines = 0
+        after_blank = False
+
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                kept.append('')
+                after_blank = True
+                continue
+            previous_blank, after_blank = after_blank, False
+
+            if self.BOILERPLATE_HEADINGS.match(stripped):
+                in_boilerplate_section = True
+                in_content_section = False
+                dropped_lines = 0
+                continue
+
+            if self.CONTENT_HEADINGS.match(stripped):
+                in_content_section = True
+            elif previous_blank and self.HEADING.match(stripped) and len(stripped) <= 60:
+                in_content_section = False
+
+            if in_boilerplate_section:
+                # LinkedIn lists are plain short lines, so a line shaped like a heading only ends the
+                # section when it is a known content heading or starts a new blank-line separated block
+                if self.CONTENT_HEADINGS.match(stripped) or (
+                        previous_blank and dropped_lines and self.HEADING.match(stripped) and len(stripped) <= 60):
+                    in_boilerplate_section = False
+                else:
+                    dropped_lines += 1
+                    continue
+
+            if self.LEGAL_PHRASES.search(stripped):
+                continue
+            if not in_content_section and self.BOILERPLATE_PHRASES.search(stripped):
+                continue
+
+            kept.append(stripped)
+
+        return '\n'.join(kept)
+
+    @staticmethod
+    def _collapse_whitespace(text: str) -> str:
+        """Collapse runs of spaces and blank lines."""
+        text = re.sub(r'[ \t ]+', ' ', text)
+        text = re.sub(r'\n\s*\n+', '\n\n', text)
+        return text.strip()
+
+    def _apply_budget(self, text: str) -> str:
+        """Cut text to max_tokens, preferring a paragraph, then a word boundary."""
+        if not self.max_tokens:
+            return text
+
+        max_chars = self.max_tokens * self.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+
+        cut = text[:max_chars]
+        boundary = cut.rfind('\n\n')
+        if boundary < max_chars // 2:
+            boundary = cut.rfind(' ')
+        if boundary > 0:
+            cut = cut[:boundary]
+
+        with self._lock:
+            self.truncated += 1
+        return cut.rstrip()
+
+    def compact(self, description: str) -> str:
+        """
+        Return the description without boilerplate, with collapsed whitespace and within the token budget.
+
+        Args:
+            description: The job description
+
+        Returns:
+            The compacted description, the original text if compaction would leave nothing
+
+        Example:
+            >>> DescriptionCompactor().compact(
+            ...     "Benefits\\nHealth insurance\\nPaid Time Off\\nFlexible Hours\\n401k matching\\n"
+            ...     "Requirements\\n5+ years of product management")
+            'Requirements\\n5+ years of product management'
+            >>> DescriptionCompactor().compact(
+            ...     "Responsibilities\\nBuild fraud and background check products for HR customers.\\n"
+            ...     "Own the e-verify integration roadmap.\\n\\nRequirements\\n5+ years of product management")
+            'Responsibilities\\nBuild fraud and background check products for HR customers.\\nOwn the e-verify integration roadmap.\\n\\nRequirements\\n5+ years of product management'
+        """
+        if not description:
+            return description or ''
+
+        compacted = self._apply_budget(self._collapse_whitespace(self._drop_boilerplate(description)))
+        if not compacted:
+            compacted = self._apply_budget(self._collapse_whitespace(description))
+
+        with self._lock:
+            self.descriptions += 1
+            self.original_chars += len(description)
+            self.compacted_chars += len(compacted)
+
+        return compacted
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Characters and estimated tokens saved since the compactor was created.
+        """
+        with self._lock:
+            saved_chars = self.original_chars - self.compacted_chars
+            return {
+                'descriptions': self.descriptions,
+                'original_chars': self.original_chars,
+                'compacted_chars': self.compacted_chars,
+                'saved_chars': saved_chars,
+                'saved_tokens_estimate': saved_chars // self.CHARS_PER_TOKEN,
+                'saved_percent': round(100.0 * saved_chars / self.original_chars, 1) if self.original_chars else 0.0,
+                'truncated': self.truncated
+            }
+
+    def log_summary(self) -> None:
+        """Write the compaction summary to the log."""
+        logger.info("Description compaction summary: %s", self.summary())
@@ -0,0 +1,44 @@
+import re
+
+from typing import Iterable, List, Tuple
+
+class KeywordMatcher:
+    """
+    Find any of a list of keywords in a text with one compiled regular expression.
+
+    Keywords are lowercased and de-duplicated when the matcher is built and matched
+    case-insensitively, so 'Base pay:' and 'base pay:' are the same keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the matcher.
+
+        Args:
+            keywords: Plain keywords (not regular expressions) to look for
+        """
+        # Longest first, so 'salary range' wins over 'salary' when both start at the same position
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        alternation = '|'.join(re.escape(keyword) for keyword in self.keywords)
+
+        self.pattern = re.compile(alternation, re.IGNORECASE)
+        # Zero-width lookahead reports a hit at every position, including keywords nested in longer ones
+        self._all_pattern = re.compile(f'(?=({alternation}))', re.IGNORECASE)
+
+    def search(self, text: str) -> bool:
+        """
+        Check if any keyword appears in text, stopping at the first hit.
+        """
+        return bool(self.keywords) and self.pattern.search(text) is not None
+
+    def find_all(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Report every keyword hit and where it starts.
+
+        Returns:
+            List of (keyword, start offset) tuples ordered by position, with the longest
+            keyword reported when several start at the same offset
+        """
+        if not self.keywords:
+            return []
+        return [(match.group(1).lower(), match.start()) for match in self._all_pattern.finditer(text)]
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Persistent, content-addressed cache of LLM responses stored in SQLite.
+
+    Entries are keyed by a hash of everything that determines the answer (model, temperature,
+    prompt template, resume and job description), so identical requests are only paid for once.
+    """
+
+    def __init__(self, db_path: str = './Cache/llm_cache.sqlite', max_entries: int = 5000,
+                 max_bytes: int = 200 * 1024 * 1024, max_age_days: float = 30):
+        """
+        Initialize the LLM cache.
+
+        Args:
+            db_path: Path to the SQLite database file, created if it does not exist
+            max_entries: Maximum number of cached responses, least recently used are evicted first
+            max_bytes: Maximum total size of the cached responses in bytes
+            max_age_days: Responses older than this are evicted, None keeps them forever
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_eviction = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                   key TEXT PRIMARY KEY,
+                   value TEXT NOT NULL,
+                   size INTEGER NOT NULL,
+                   created_at REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt_template: str, resume_text: str,
+                 job_description: str, *extra: Any) -> str:
+        """
+        Build the content hash used as cache key.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            prompt_template: The un-rendered prompt template
+            resume_text: All the content of your resume, or its LoadUtils.get_resume_fingerprint
+            job_description: The job description
+            extra: Any other prompt inputs (e.g. recommendations for resume customization)
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        digest = hashlib.sha256()
+        for part in (model, temperature, prompt_template, resume_text, job_description) + extra:
+            encoded = str(part).encode('utf-8')
+            # Length prefix keeps ('ab', 'c') and ('a', 'bc') from colliding
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached response for key, or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self._is_expired(row[1]):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable response under key.
+        """
+        if value is None:
+            return
+
+        serialized = json.dumps(value)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, serialized, len(serialized.encode('utf-8')), now, now)
+            )
+            self._conn.commit()
+            self._puts_since_eviction += 1
+            evict_now = self._puts_since_eviction >= 100
+
+        if evict_now:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then the least recently used ones until the entry and size limits hold.
+
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            self._puts_since_eviction = 0
+            evicted = 0
+
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                evicted += self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,)).rowcount
+
+            count, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+
+            if count > self.max_entries or total_size > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC").fetchall()
+                stale_keys = []
+                for key, size in rows:
+                    if count <= self.max_entries and total_size <= self.max_bytes:
+                        break
+                    stale_keys.append((key,))
+                    count -= 1
+                    total_size -= size
+                self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+                evicted += len(stale_keys)
+
+            self._conn.commit()
+
+        if evicted:
+            logger.info("LLM cache evicted %s entries", evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and current cache size.
+        """
+        with self._lock:
+            count, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': count,
+            'bytes': total_size
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _is_expired(self, created_at: float) -> bool:
+        """Check whether an entry created at created_at is older than max_age_days."""
+        return self.max_age_days is not None and created_at < time.time() - self.max_age_days * 86400
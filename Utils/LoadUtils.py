@@ -1,15 +1,20 @@
+import hashlib
 import json
 import os
 import pandas as pd
 import re
 import logging
+import threading
+import time
 
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Iterable, Optional, List, Tuple
+
+from Utils.KeywordMatcher import KeywordMatcher
+from Utils.ResponseParser import ResponseParser
 
-# LangChain imports
-from langchain_community.document_loaders import PyPDFLoader
 #from markdown_pdf import MarkdownPdf, Section
-from md2pdf.core import md2pdf
+# PyPDFLoader (LangChain) and WeasyPrint are slow to import, they are loaded by the
+# functions that need them so runs that hit the resume cache and render no PDF skip them
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,13 @@ class LoadUtils:
         '100k', '150k', '200k', '160K','250K','300K'  # Common salary patterns
     ]
 
+    # PdfRenderer shared by save_to_pdf, see get_pdf_renderer
+    _pdf_renderer = None
+    _pdf_renderer_lock = threading.Lock()
+
+    # All salary_keywords in one case-insensitive pattern, built once
+    SALARY_KEYWORD_MATCHER = KeywordMatcher(salary_keywords)
+
     # Regex patterns for salary extraction
     SALARY_PATTERNS = [
         # $100,000 - $150,000 or $100,000 to $150,000
@@ -43,6 +55,9 @@ class LoadUtils:
         r'(\d{1,3})k(?:\s|/|$)',
     ]
 
+    # Compiled once, tried in the same priority order as SALARY_PATTERNS
+    COMPILED_SALARY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in SALARY_PATTERNS]
+
     @staticmethod
     def has_salary_info (description:str) -> bool:
         """
@@ -57,11 +72,25 @@ class LoadUtils:
 
         if not description or pd.isna(description):
             return False
+
+        # Check if any keyword exists, in a single scan of the text
+        return LoadUtils.SALARY_KEYWORD_MATCHER.search(str(description))
+
+    @staticmethod
+    def find_salary_keywords(description: str) -> List[Tuple[str, int]]:
+        """
+        List the salary keywords found in the job description.
         
-        description_lower = str(description).lower()
+        Args:
+            description: Job description text
+            
+        Returns:
+            List of (keyword, position) tuples, empty if none found
+        """
+        if not description or pd.isna(description):
+            return []
 
-        # Check if any keyword exists
-        return any(keyword in description_lower for keyword in LoadUtils.salary_keywords)
+        return LoadUtils.SALARY_KEYWORD_MATCHER.find_all(str(description))
     
     @staticmethod
     def extract_salary_info(description: str) -> Dict[str, any]:
@@ -94,8 +123,8 @@ class LoadUtils:
             }
 
         try:
-            for idx, pattern in enumerate(LoadUtils.SALARY_PATTERNS):
-                match = re.search(pattern, description_str, re.IGNORECASE)
+            for pattern in LoadUtils.COMPILED_SALARY_PATTERNS:
+                match = pattern.search(description_str)
                 if match:
                     return {
                         'has_salary': True,
@@ -111,17 +140,19 @@ class LoadUtils:
             return {'has_salary': False, 'salary_text': None, 'amount': None}
 
     @staticmethod
-    def parse_salary_range(description: str) -> Optional[Tuple[float, float]]:
+    def parse_salary_range(description: str, salary_info: Optional[Dict[str, any]] = None) -> Optional[Tuple[float, float]]:
         """
         Parse and return salary range as numeric values.
         
         Args:
             description: Job description text
+            salary_info: Result of extract_salary_info for this description, if already computed
             
         Returns:
             Tuple of (min_salary, max_salary) or None if not found
         """
-        salary_info = LoadUtils.extract_salary_info(description)
+        if salary_info is None:
+            salary_info = LoadUtils.extract_salary_info(description)
         
         if not salary_info['has_salary'] or not salary_info['amount']:
             return None
@@ -157,7 +188,7 @@ class LoadUtils:
     
     @staticmethod
     def meets_minimum_salary(description: str, min_threshold: float, 
-                            check_type: str = 'any') -> bool:
+                            check_type: str = 'any', salary_info: Optional[Dict[str, any]] = None) -> bool:
 
         """
         Check if salary meets a minimum threshold.
@@ -170,11 +201,12 @@ class LoadUtils:
                 - 'max': Maximum salary must be >= threshold
                 - 'avg': Average salary must be >= threshold
                 - 'any': Either min or max must be >= threshold
+            salary_info: Result of extract_salary_info for this description, if already computed
             
         Returns:
             True if salary meets threshold, False otherwise
         """
-        salary_range = LoadUtils.parse_salary_range(description)
+        salary_range = LoadUtils.parse_salary_range(description, salary_info)
 
         if not salary_range:
             return False
@@ -194,49 +226,227 @@ class LoadUtils:
             return False
 
     @staticmethod
-    def get_full_resume() -> str:
+    def extract_salary_columns(descriptions: pd.Series, min_threshold: float,
+                               check_type: str = 'any') -> pd.DataFrame:
+        """
+        Batch version of extract_salary_info, parse_salary_range and meets_minimum_salary.
+        
+        Every description is parsed once per pattern with pandas str.extract instead of
+        once per job, and the numeric range is reused for the threshold check.
+        
+        Args:
+            descriptions: Job descriptions (e.g. the scraped 'Description' column)
+            min_threshold: Minimum salary threshold (e.g., 160000)
+            check_type: How to check - 'min', 'max', 'avg', or 'any' (see meets_minimum_salary)
+            
+        Returns:
+            DataFrame with the same index as descriptions and the columns
+            'has_salary', 'salary_text', 'salary_min', 'salary_max' and 'meets_threshold'
+        """
+        text = descriptions.fillna('').astype(str).str.strip()
+
+        salary_text = pd.Series(None, index=text.index, dtype=object)
+        first_amount = pd.Series(None, index=text.index, dtype=object)
+        second_amount = pd.Series(None, index=text.index, dtype=object)
+
+        for pattern in LoadUtils.COMPILED_SALARY_PATTERNS:
+            pending = salary_text.isna() & (text != '')
+            if not pending.any():
+                break
+
+            # Wrap the pattern so column 0 holds the whole match, like match.group(0)
+            matches = text[pending].str.extract(f'({pattern.pattern})', flags=re.IGNORECASE)
+            matched = matches[0].notna()
+            matched_index = matches.index[matched]
+
+            salary_text.loc[matched_index] = matches.loc[matched, 0]
+            first_amount.loc[matched_index] = matches.loc[matched, 1]
+            # Single amount patterns have one group, the range collapses to (amount, amount)
+            second_column = 2 if pattern.groups >= 2 else 1
+            second_amount.loc[matched_index] = matches.loc[matched, second_column]
+
+        def to_number(amounts: pd.Series) -> pd.Series:
+            numbers = pd.to_numeric(amounts.str.replace(',', '', regex=False).str.strip(), errors='coerce')
+            # If it's in 'k' format (usually < 1000), multiply by 1000
+            return numbers.where(numbers >= 1000, numbers * 1000)
+
+        salary_min = to_number(first_amount)
+        salary_max = to_number(second_amount)
+        has_range = salary_min.notna() & salary_max.notna() & (salary_min != 0) & (salary_max != 0)
+        salary_min = salary_min.where(has_range)
+        salary_max = salary_max.where(has_range)
+
+        # Keyword fallback only for descriptions without a salary pattern
+        has_salary = salary_text.notna()
+        no_pattern = ~has_salary & (text != '')
+        if no_pattern.any():
+            has_salary.loc[no_pattern] = descriptions[no_pattern].map(LoadUtils.has_salary_info).astype(bool)
+
+        if check_type == 'min':
+            meets_threshold = salary_min >= min_threshold
+        elif check_type == 'max':
+            meets_threshold = salary_max >= min_threshold
+        elif check_type == 'avg':
+            meets_threshold = (salary_min + salary_max) / 2 >= min_threshold
+        elif check_type == 'any':
+            meets_threshold = (salary_min >= min_threshold) | (salary_max >= min_threshold)
+        else:
+            meets_threshold = pd.Series(False, index=text.index)
+
+        return pd.DataFrame({
+            'has_salary': has_salary.astype(bool),
+            'salary_text': salary_text,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'meets_threshold': (meets_threshold & has_range).astype(bool)
+        }, index=descriptions.index)
+
+    @staticmethod
+    def get_full_resume(pdf_path: Optional[str] = None, cache_path: Optional[str] = None) -> str:
         """
             Get the full content of all pages in your Resume
 
+            The extracted text is cached by file path, modification time and content hash,
+            so the PDF is only parsed again when the file actually changes.
+
+            Args:
+                pdf_path: Resume PDF, defaults to the pdf_resume environment variable
+                cache_path: JSON cache file, defaults to resume_cache_path or ./Cache/resume_cache.json
+
             Returns:
                 str: Extracted text from PDF
         """
         
         try:
-            # Reload the PDF to get full page content
-            loader = PyPDFLoader(os.environ['pdf_resume'])
-            pages = loader.load()
-            
-            context_resume = ' '.join(page.page_content for page in pages) 
-            context_resume = context_resume.replace('\n', ' ').replace('_', '')
+            pdf_path = pdf_path or os.environ['pdf_resume']
+            cache_path = cache_path or os.environ.get('resume_cache_path', './Cache/resume_cache.json')
+            absolute_path = os.path.abspath(pdf_path)
+
+            file_stat = os.stat(absolute_path)
+            cache = LoadUtils._read_resume_cache(cache_path)
+            entry = cache.get(absolute_path)
+
+            # Same size and modification time: trust the cached text without reading the file
+            if entry and entry['mtime'] == file_stat.st_mtime and entry['size'] == file_stat.st_size:
+                logger.info("Resume loaded from cache, fingerprint %s", entry['fingerprint'])
+                return entry['text']
+
+            with open(absolute_path, 'rb') as pdf_file:
+                file_hash = hashlib.sha256(pdf_file.read()).hexdigest()
+
+            # Touched but identical file: only refresh the modification time
+            if entry and entry['file_hash'] == file_hash:
+                context_resume = entry['text']
+            else:
+                from langchain_community.document_loaders import PyPDFLoader
+
+                # Reload the PDF to get full page content
+                loader = PyPDFLoader(absolute_path)
+                pages = loader.load()
+                
+                context_resume = ' '.join(page.page_content for page in pages) 
+                context_resume = context_resume.replace('\n', ' ').replace('_', '')
+
+            cache[absolute_path] = {
+                'mtime': file_stat.st_mtime,
+                'size': file_stat.st_size,
+                'file_hash': file_hash,
+                'fingerprint': LoadUtils.get_resume_fingerprint(context_resume),
+                'text': context_resume
+            }
+            LoadUtils._write_resume_cache(cache_path, cache)
+            logger.info("Resume parsed from PDF, fingerprint %s", cache[absolute_path]['fingerprint'])
 
             return context_resume
                 
         except Exception as e:
             print(f"Error loading full page resume: {e}")
             return None
+
+    @staticmethod
+    def get_resume_fingerprint(resume_text: str) -> Optional[str]:
+        """
+            Stable fingerprint of the resume text, for use in downstream cache keys.
+
+            Args:
+                resume_text: Text returned by get_full_resume
+
+            Returns:
+                str: Hex SHA-256 of the text, None when there is no text
+        """
+        if resume_text is None:
+            return None
+        return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read_resume_cache(cache_path: str) -> Dict[str, Dict]:
+        """Read the resume cache file, an unreadable or missing file is an empty cache."""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_resume_cache(cache_path: str, cache: Dict[str, Dict]) -> None:
+        """Write the resume cache file atomically."""
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temporary_path = f"{cache_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(temporary_path, cache_path)
         
+    @staticmethod
+    def get_token_usage(response) -> Dict[str, int]:
+        """
+            Read the token counts langchain reports on a chat model response.
+
+            Args:
+                response: AIMessage returned by invoke/ainvoke
+
+            Returns:
+                Dictionary with 'input_tokens', 'output_tokens', 'cached_input_tokens'
+                (prompt tokens served from the provider prompt cache) and 'cache_creation_tokens'
+        """
+        usage = getattr(response, 'usage_metadata', None) or {}
+        details = usage.get('input_token_details') or {}
+
+        return {
+            'input_tokens': usage.get('input_tokens', 0) or 0,
+            'output_tokens': usage.get('output_tokens', 0) or 0,
+            'cached_input_tokens': details.get('cache_read', 0) or 0,
+            'cache_creation_tokens': details.get('cache_creation', 0) or 0
+        }
+
     @staticmethod
     def convert_to_json(input_str):
         """
             Convert String into JSON
             Args:
-                input_str: String that needs to be converted to JSON
+                input_str: LLM response (or its text), fenced in ```json or not
             Returns:
-                str: JSON Output format
+                The parsed JSON, repaired when needed, or None when the output holds no usable JSON
         """
-        
-        json_match = re.search(r'```json\n(.*?)\n```', input_str.content, re.DOTALL)
+        return ResponseParser.extract_json(getattr(input_str, 'content', input_str))
 
-        if json_match:
-            try:
-                parsed_json = json.loads(json_match.group(1))
-                #return parsed_json
-            except Exception as e:
-                    print(f"Error during LLM Output to JSON: {e}")
-        
-        #print(f"Result: {parsed_json}")
-        return parsed_json
+    @staticmethod
+    def get_pdf_renderer() -> 'PdfRenderer':
+        """
+            Return the PdfRenderer shared by every save_to_pdf call of this process, created on first use.
+            The optional pdf_css_path environment variable points to the stylesheet of the resumes.
+        """
+        with LoadUtils._pdf_renderer_lock:
+            if LoadUtils._pdf_renderer is None:
+                LoadUtils._pdf_renderer = PdfRenderer(css_file_path=os.environ.get('pdf_css_path') or None)
+            return LoadUtils._pdf_renderer
+
+    @staticmethod
+    def pdf_file_name(jobid: str, job_title: str) -> str:
+        """Path of the customized resume PDF of a job."""
+        return os.path.join(os.environ['pdf_directory'], f"{jobid}-{job_title}.pdf")
 
     @staticmethod
     def save_to_pdf(input_str, jobid: str, job_title: str ) -> bool:
@@ -247,10 +457,11 @@ class LoadUtils:
             Returns:
                 bool: True if the PDF is created, False if it fails
         """
-        pdf_file_name = os.path.join(os.environ['pdf_directory'], f"{jobid}-{job_title}.pdf")
+        pdf_file_name = LoadUtils.pdf_file_name(jobid, job_title)
 
         try:
-            md2pdf(pdf_file_name, md_content=input_str)
+            seconds = LoadUtils.get_pdf_renderer().render(input_str, pdf_file_name)
+            logger.info("Saved %s in %.2fs", pdf_file_name, seconds)
             #pdf = MarkdownPdf()
             #pdf.meta["title"] = 'Mauricio Ruiz Resume'
             #pdf.add_section(Section(input_str, toc=False))
@@ -258,6 +469,119 @@ class LoadUtils:
 
             return True
         except Exception as e:
-            logger.info(f"Saving to PDF Failure: {e}")
+            logger.info("Saving to PDF Failure: %s", e)
             return False
-    
\ No newline at end of file
+
+    @staticmethod
+    def save_many_to_pdf(documents: Iterable[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """
+            Save many strings into PDF Documents with the shared renderer
+            Args:
+                documents: (input_str, jobid, job_title) tuples
+            Returns:
+                One dictionary per document (see PdfRenderer.render_many)
+        """
+        return LoadUtils.get_pdf_renderer().render_many(
+            (input_str, LoadUtils.pdf_file_name(jobid, job_title)) for input_str, jobid, job_title in documents
+        )
+
+class PdfRenderer:
+    """
+    Long-lived Markdown to PDF renderer.
+
+    md2pdf creates a Markdown converter, parses the stylesheet and sets up the WeasyPrint font
+    configuration again for every document. This renderer does that once and reuses it, so each
+    resume only pays for its own HTML conversion and layout.
+    """
+
+    MARKDOWN_EXTRAS = ['cuddled-lists', 'tables', 'footnotes']
+
+    def __init__(self, css_file_path: Optional[str] = None, css_string: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            css_file_path: Optional stylesheet file applied to every PDF
+            css_string: Optional stylesheet text applied to every PDF, after css_file_path
+            base_url: Base for relative links and images in the Markdown
+        """
+        # The pieces md2pdf is built on, kept alive here instead of being set up for every PDF
+        from markdown2 import Markdown
+        from weasyprint import HTML, CSS
+        try:
+            from weasyprint.text.fonts import FontConfiguration
+        except ImportError:
+            # WeasyPrint < 53
+            from weasyprint.fonts import FontConfiguration
+
+        self._html = HTML
+        self.base_url = base_url
+        self.font_config = FontConfiguration()
+        self.stylesheets = []
+        if css_file_path:
+            self.stylesheets.append(CSS(filename=css_file_path, font_config=self.font_config))
+        if css_string:
+            self.stylesheets.append(CSS(string=css_string, font_config=self.font_config))
+
+        self._markdown = Markdown(extras=self.MARKDOWN_EXTRAS)
+        # The Markdown converter keeps state between documents, one conversion at a time
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.render_seconds = 0.0
+
+    def to_html(self, markdown_text: str) -> str:
+        """Convert Markdown to HTML with the shared converter."""
+        with self._lock:
+            self._markdown.reset()
+            return self._markdown.convert(markdown_text)
+
+    def render(self, markdown_text: str, pdf_path: str) -> float:
+        """
+        Render one Markdown document to a PDF file.
+
+        Returns:
+            Render time in seconds
+
+        Raises:
+            Any conversion or write error
+        """
+        started = time.perf_counter()
+        html = self._html(string=self.to_html(markdown_text), base_url=self.base_url)
+        html.write_pdf(pdf_path, stylesheets=self.stylesheets, font_config=self.font_config)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.rendered += 1
+            self.render_seconds += elapsed
+        return elapsed
+
+    def render_many(self, documents: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Render many Markdown documents, a failing document does not stop the others.
+
+        Args:
+            documents: (markdown_text, pdf_path) tuples
+
+        Returns:
+            One dictionary per document with 'path', 'rendered' (bool), 'seconds' and 'error' keys
+        """
+        results = []
+        for markdown_text, pdf_path in documents:
+            try:
+                seconds = self.render(markdown_text, pdf_path)
+                results.append({'path': pdf_path, 'rendered': True, 'seconds': round(seconds, 3), 'error': None})
+                logger.info("Rendered %s in %.2fs", pdf_path, seconds)
+            except Exception as e:
+                results.append({'path': pdf_path, 'rendered': False, 'seconds': None, 'error': str(e)})
+                logger.info("Saving to PDF Failure for %s: %s", pdf_path, e)
+        return results
+
+    def summary(self) -> Dict[str, Any]:
+        """Documents rendered and the mean render time."""
+        with self._lock:
+            return {
+                'rendered': self.rendered,
+                'mean_render_seconds': round(self.render_seconds / self.rendered, 3) if self.rendered else None
+            }
+    
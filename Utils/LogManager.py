@@ -0,0 +1,159 @@
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+class LogPayload:
+    """
+    Large log argument (prompt, generated resume) rendered according to LogManager.payload_mode.
+
+    The text is only truncated or hashed when a record is actually formatted, so a payload
+    logged below the configured level costs nothing.
+    """
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: Any):
+        self.text = text
+
+    def __str__(self) -> str:
+        return LogManager.render_payload(self.text)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves the formatting to the listener thread.
+
+    The base prepare() formats every record in the logging thread, which renders the LogPayload
+    arguments there. Here the arguments are only snapshotted: LogPayload and immutable values are
+    queued as they are, any other object is turned into its string now, before the caller can
+    change it. The listener's formatter merges the message and renders the payloads.
+    """
+
+    IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+    @classmethod
+    def _snapshot(cls, value: Any) -> Any:
+        if isinstance(value, (LogPayload,) + cls.IMMUTABLE_TYPES):
+            return value
+        return str(value)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A copy, other handlers of the same logger may still read the record
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = {key: self._snapshot(value) for key, value in record.args.items()}
+        elif record.args:
+            record.args = tuple(self._snapshot(value) for value in record.args)
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the record's extra fields (job_id, stage, ...)."""
+
+    # Attributes every LogRecord has, anything else was passed with extra=
+    STANDARD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in self.STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class LogManager:
+    """
+    Non-blocking logging for the whole application.
+
+    Records are put on an in-memory queue by a DeferredQueueHandler and formatted and written to
+    the log file by a QueueListener thread, so the scoring workers never wait for disk I/O or
+    payload rendering. Prompts and generated resumes are logged as LogPayload, truncated or hashed
+    so the log does not grow with the resume.
+    """
+
+    TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+    PAYLOAD_MODES = ('full', 'truncate', 'hash')
+
+    payload_mode = 'truncate'
+    payload_chars = 300
+    _listener: Optional[logging.handlers.QueueListener] = None
+
+    @staticmethod
+    def configure(log_filename: str, level: int = logging.INFO, json_records: bool = False,
+                  payload_mode: str = 'truncate', payload_chars: int = 300) -> logging.handlers.QueueListener:
+        """
+        Route every logger through a queue to the log file.
+
+        Args:
+            log_filename: Log file, written by the listener thread
+            level: Minimum level, records below it are never formatted
+            json_records: Write one JSON object per record instead of the text format
+            payload_mode: 'full', 'truncate' (first payload_chars characters) or 'hash' (length and sha256 only)
+            payload_chars: Characters of a payload kept by 'truncate'
+
+        Returns:
+            The started QueueListener
+        """
+        if payload_mode not in LogManager.PAYLOAD_MODES:
+            raise ValueError(f"Unknown payload mode: {payload_mode}, expected one of {LogManager.PAYLOAD_MODES}")
+        LogManager.payload_mode = payload_mode
+        LogManager.payload_chars = payload_chars
+
+        LogManager.stop()
+
+        file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter() if json_records else logging.Formatter(LogManager.TEXT_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(log_queue))
+        root.setLevel(level)
+
+        LogManager._listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        LogManager._listener.start()
+        # Records still queued when the script exits are written before the file is closed
+        atexit.register(LogManager.stop)
+        return LogManager._listener
+
+    @staticmethod
+    def stop() -> None:
+        """Write the queued records and stop the listener thread."""
+        listener, LogManager._listener = LogManager._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+    @staticmethod
+    def payload(text: Any) -> LogPayload:
+        """Wrap a prompt or generated document for logging, see LogPayload."""
+        return LogPayload(text)
+
+    @staticmethod
+    def render_payload(text: Any) -> str:
+        """Text of a payload according to payload_mode, with its length and hash when shortened."""
+        text = '' if text is None else str(text)
+        if LogManager.payload_mode == 'full':
+            return text
+
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+        if LogManager.payload_mode == 'hash':
+            return f"<{len(text)} chars, sha256 {digest}>"
+        if len(text) <= LogManager.payload_chars:
+            return text
+        return f"{text[:LogManager.payload_chars]}... <{len(text)} chars, sha256 {digest}>"
@@ -0,0 +1,113 @@
+import logging
+import os
+import threading
+import time
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from Utils.LoadUtils import LoadUtils
+
+logger = logging.getLogger(__name__)
+
+def _render_pdf(markdown: str, job_id: str, job_title: str) -> Tuple[str, float]:
+    """Worker process entry point: render one customized resume, raising when the PDF was not written."""
+    started = time.perf_counter()
+    if not LoadUtils.save_to_pdf(markdown, job_id, job_title):
+        raise RuntimeError(f"PDF rendering failed for job {job_id}")
+    return job_id, time.perf_counter() - started
+
+class PdfRenderPool:
+    """
+    Render customized resumes to PDF in a pool of worker processes.
+
+    md2pdf (WeasyPrint layout) is CPU bound and takes from hundreds of milliseconds to seconds per
+    resume, so it is queued here instead of blocking the scoring loop. Rendering throughput scales
+    with the number of cores, failures are logged per job id and close() waits for every PDF.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the render pool, worker processes are only started on the first submit.
+
+        Args:
+            max_workers: Worker processes, defaults to the number of cores
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[Future, str] = {}
+
+        self.submitted = 0
+        self.rendered = 0
+        self.render_seconds = 0.0
+        self.failed: Dict[str, str] = {}
+
+    def submit(self, markdown: str, job_id: str, job_title: str) -> Future:
+        """
+        Queue one resume for rendering and return immediately.
+
+        Args:
+            markdown: Customized resume returned by the LLM
+            job_id: Job id, used in the PDF name and in the failure log
+            job_title: Job title, used in the PDF name
+
+        Returns:
+            Future resolving to (job_id, render seconds)
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(_render_pdf, markdown, job_id, job_title)
+            self._pending[future] = job_id
+            self.submitted += 1
+
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        """Record the outcome of one render, logging failures with their job id."""
+        with self._lock:
+            job_id = self._pending.pop(future, None)
+
+        try:
+            _, seconds = future.result()
+        except Exception as e:
+            with self._lock:
+                self.failed[job_id] = str(e)
+            logger.error("Saving customized resume to PDF failed for job %s: %s", job_id, e)
+            return
+
+        with self._lock:
+            self.rendered += 1
+            self.render_seconds += seconds
+        logger.info("Customized resume PDF for job %s rendered in %.2fs", job_id, seconds)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Wait for every queued PDF and stop the worker processes.
+
+        Returns:
+            The render summary
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        summary = self.summary()
+        logger.info("PDF render summary: %s", summary)
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Submitted, rendered and failed counts, failed job ids and the mean render time."""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'submitted': self.submitted,
+                'rendered': self.rendered,
+                'failed': len(self.failed),
+                'failed_job_ids': list(self.failed),
+                'mean_render_seconds': round(self.render_seconds / self.rendered, 3) if self.rendered else None
+            }
@@ -0,0 +1,339 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+
+from typing import Any, Dict, List, Optional
+
+from Utils.LoadUtils import LoadUtils
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    Callers reserve what they need up front and wait the returned number of seconds, so the
+    bucket works the same from threads (time.sleep) and from the event loop (asyncio.sleep).
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Refill rate, e.g. the provider requests/min or tokens/min quota
+            capacity: Maximum burst, defaults to one minute of quota
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket, going into debt if needed.
+
+        Returns:
+            Seconds to wait before the reserved amount is actually available
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def adjust(self, amount: float) -> None:
+        """Take (or give back, when negative) the difference between an estimate and the real usage."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+class ProviderRateLimiter:
+    """
+    Shared rate limiting layer for one LLM provider.
+
+    Every call goes through a requests/min and a tokens/min token bucket, retries 429, 5xx and
+    timed out attempts with jittered exponential backoff, and adapts how many calls run at once: the
+    limit is halved when the provider throttles and grows back by one after a run of successful calls.
+    The call timeout bounds each attempt at the provider, never the time spent queueing or backing
+    off, so a throttled job is slowed down instead of dropped.
+    """
+
+    RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504, 529}
+
+    # Provider errors that do not expose a status code, matched on the message
+    RETRYABLE_MESSAGE = re.compile(
+        r"\b(?:429|500|502|503|504|529)\b|rate.?limit|resource.?exhausted|quota|overloaded|too many requests"
+        r"|service unavailable|temporarily unavailable|timed? ?out|connection (?:error|reset|aborted)",
+        re.IGNORECASE
+    )
+
+    # Errors that mean the provider is throttling us, which lowers the concurrency limit
+    THROTTLED_MESSAGE = re.compile(r"\b(?:429|529)\b|rate.?limit|resource.?exhausted|quota|overloaded|too many requests",
+                                   re.IGNORECASE)
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: int = 8, min_concurrency: int = 1,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 increase_after: int = 10, expected_output_tokens: int = 800,
+                 call_timeout: Optional[float] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            name: Provider name used in the logs
+            requests_per_minute: Requests/min quota, None for no request limit
+            tokens_per_minute: Input + output tokens/min quota, None for no token limit
+            max_concurrency: Most calls in flight at once, the adaptive limit never goes above it
+            min_concurrency: The adaptive limit never goes below it
+            max_retries: Retries of a throttled or failed (5xx) call before giving up
+            base_delay: First backoff delay in seconds, doubled on every retry
+            max_delay: Longest backoff delay in seconds
+            increase_after: Consecutive successful calls before the concurrency limit grows by one
+            expected_output_tokens: Output tokens reserved per call before the real usage is known
+            call_timeout: Seconds one attempt may wait for the provider before it is retried, None waits
+                          forever. Applies to ainvoke, invoke relies on the client's own request timeout
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.concurrency = self.max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.increase_after = increase_after
+        self.expected_output_tokens = expected_output_tokens
+        self.call_timeout = call_timeout
+        self.poll_interval = 0.05
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._successes_in_a_row = 0
+        self._last_decrease = 0.0
+        self.stats = {'calls': 0, 'retries': 0, 'throttled': 0, 'timed_out': 0, 'failed': 0,
+                      'min_concurrency_seen': self.concurrency}
+
+    # ------------------------------------------------------------------
+    # Concurrency and quota
+    # ------------------------------------------------------------------
+
+    def _try_enter(self) -> bool:
+        with self._lock:
+            if self._in_flight < self.concurrency:
+                self._in_flight += 1
+                return True
+            return False
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Reserve one request and the estimated tokens, returning the seconds to wait."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        return wait
+
+    def _refund(self, estimated_tokens: int, request: bool) -> None:
+        """
+        Give back a reservation the provider did not use.
+
+        Args:
+            estimated_tokens: Tokens reserved for the attempt
+            request: Also give back the request, when the attempt was cancelled before it was sent
+        """
+        if self.tokens is not None:
+            self.tokens.adjust(-estimated_tokens)
+        if request and self.requests is not None:
+            self.requests.adjust(-1)
+
+    @staticmethod
+    def _text(content: Any) -> str:
+        if isinstance(content, list):
+            return ''.join(part.get('text', '') if isinstance(part, dict) else str(part) for part in content)
+        return str(content)
+
+    def estimate_tokens(self, messages: List[Any]) -> int:
+        """Rough input tokens of the messages (4 characters per token) plus the expected output."""
+        characters = sum(len(self._text(getattr(message, 'content', message))) for message in messages)
+        return characters // 4 + self.expected_output_tokens
+
+    def _on_success(self, response, estimated_tokens: int) -> None:
+        if self.tokens is not None:
+            usage = LoadUtils.get_token_usage(response)
+            used = usage['input_tokens'] + usage['output_tokens']
+            if used:
+                self.tokens.adjust(used - estimated_tokens)
+
+        with self._lock:
+            self.stats['calls'] += 1
+            self._successes_in_a_row += 1
+            if self._successes_in_a_row >= self.increase_after and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._successes_in_a_row = 0
+                logger.info("%s rate limiter concurrency raised to %s", self.name, self.concurrency)
+
+    def _on_throttled(self) -> None:
+        with self._lock:
+            self.stats['throttled'] += 1
+            self._successes_in_a_row = 0
+            # Calls throttled together count as one event, so a single burst does not drop the limit to the minimum
+            now = time.monotonic()
+            if now - self._last_decrease < self.base_delay:
+                return
+            reduced = max(self.min_concurrency, self.concurrency // 2)
+            if reduced != self.concurrency:
+                self._last_decrease = now
+                self.concurrency = reduced
+                self.stats['min_concurrency_seen'] = min(self.stats['min_concurrency_seen'], reduced)
+                logger.warning("%s throttled, concurrency lowered to %s", self.name, self.concurrency)
+
+    # ------------------------------------------------------------------
+    # Error classification and backoff
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def status_code(error: Exception) -> Optional[int]:
+        """HTTP status of a provider error (OpenAI/Anthropic status_code, Google code, or the wrapped response)."""
+        for candidate in (getattr(error, 'status_code', None), getattr(error, 'code', None),
+                          getattr(getattr(error, 'response', None), 'status_code', None)):
+            if isinstance(candidate, int):
+                return candidate
+        return None
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """Seconds from the Retry-After header of a throttled response, when the provider sent one."""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            return float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+
+    def is_retryable(self, error: Exception) -> bool:
+        """True for throttling (429), server (5xx), timed out attempts and transient network errors."""
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            return True
+        status = self.status_code(error)
+        if status is not None:
+            return status in self.RETRYABLE_STATUS
+        return bool(self.RETRYABLE_MESSAGE.search(f"{type(error).__name__} {error}"))
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = self.retry_after(error) if error is not None else None
+        return max(delay, min(retry_after, self.max_delay)) if retry_after else delay
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, None when the error is final."""
+        if not self.is_retryable(error) or attempt >= self.max_retries:
+            with self._lock:
+                self.stats['failed'] += 1
+            return None
+
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            with self._lock:
+                self.stats['timed_out'] += 1
+
+        status = self.status_code(error)
+        if status in (429, 529) or (status is None and self.THROTTLED_MESSAGE.search(str(error))):
+            self._on_throttled()
+
+        delay = self.backoff_delay(attempt, error)
+        with self._lock:
+            self.stats['retries'] += 1
+        logger.warning("%s call failed (%s), retry %s of %s in %.1fs", self.name, error or type(error).__name__,
+                       attempt + 1, self.max_retries, delay)
+        return delay
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def invoke(self, llm, messages: List[Any], **kwargs):
+        """
+        Call llm.invoke(messages, **kwargs) within the quota, retrying throttled and 5xx errors.
+
+        Raises:
+            The last error when it is not retryable or the retries are exhausted
+        """
+        estimated_tokens = self.estimate_tokens(messages)
+
+        for attempt in range(self.max_retries + 1):
+            while not self._try_enter():
+                time.sleep(self.poll_interval)
+            try:
+                wait = self._reserve(estimated_tokens)
+                if wait:
+                    time.sleep(wait)
+                response = llm.invoke(messages, **kwargs)
+            except Exception as e:
+                self._refund(estimated_tokens, request=False)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(response, estimated_tokens)
+                return response
+            finally:
+                self._leave()
+
+            time.sleep(delay)
+
+    async def ainvoke(self, llm, messages: List[Any], **kwargs):
+        """
+        Asynchronous version of invoke, calling llm.ainvoke(messages, **kwargs).
+
+        Each attempt is limited to call_timeout seconds and retried like a 5xx error when it runs out.
+        """
+        estimated_tokens = self.estimate_tokens(messages)
+
+        for attempt in range(self.max_retries + 1):
+            while not self._try_enter():
+                await asyncio.sleep(self.poll_interval)
+            sent = False
+            try:
+                wait = self._reserve(estimated_tokens)
+                if wait:
+                    await asyncio.sleep(wait)
+                sent = True
+                # Only the attempt at the provider is timed, not the quota wait above or the backoff below
+                response = await asyncio.wait_for(llm.ainvoke(messages, **kwargs), self.call_timeout)
+            except asyncio.CancelledError:
+                self._refund(estimated_tokens, request=not sent)
+                raise
+            except Exception as e:
+                self._refund(estimated_tokens, request=False)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(response, estimated_tokens)
+                return response
+            finally:
+                self._leave()
+
+            await asyncio.sleep(delay)
+
+    def summary(self) -> Dict[str, Any]:
+        """Calls, retries, throttling events and the current concurrency limit."""
+        with self._lock:
+            return dict(self.stats, concurrency=self.concurrency, max_concurrency=self.max_concurrency)
+
+    def log_summary(self) -> None:
+        """Write the rate limiter summary to the log."""
+        logger.info("%s rate limiter summary: %s", self.name, self.summary())
@@ -0,0 +1,180 @@
+import logging
+import math
+import re
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RelevanceGate:
+    """
+    Cheap, fully offline resume/job similarity used to skip clearly irrelevant postings before the LLM.
+
+    Uses TF-IDF cosine similarity between the resume and each description. Document frequencies
+    are learned from the descriptions seen so far, so it works both for a scraped batch and
+    for postings streamed one at a time.
+    """
+
+    TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+    STOP_WORDS = frozenset("""
+        a about above after all also an and any are as at be been being both but by can could
+        do does each for from had has have having he her here his how i if in into is it its
+        just may more most must no not of on or other our out over own per same she should so
+        some such than that the their them then there these they this those through to too
+        under until up very was we were what when where which while who will with within would
+        you your role team work working company job position candidate candidates including
+        """.split())
+
+    def __init__(self, resume_text: str, cutoff: float = 0.0):
+        """
+        Initialize the relevance gate.
+
+        Args:
+            resume_text: All the content of your resume
+            cutoff: Fit estimate (0-100) below which a posting is not sent to the LLM, 0 never skips
+        """
+        self.cutoff = cutoff
+        self.resume_terms = self._term_frequencies(resume_text or '')
+
+        self._document_frequency = Counter(self.resume_terms.keys())
+        self._documents = 1
+        self._seen_documents = set()
+
+        self.fit_scores: Dict[Any, float] = {}
+        self.llm_scores: Dict[Any, float] = {}
+        self.skipped = 0
+
+    def _tokenize(self, text: str) -> List[str]:
+        """Lowercase words, dropping stop words and single letters."""
+        return [token for token in self.TOKEN_PATTERN.findall(text.lower())
+                if len(token) > 1 and token not in self.STOP_WORDS]
+
+    def _term_frequencies(self, text: str) -> Dict[str, float]:
+        """Sublinear term frequency (1 + log tf) of every term in text."""
+        counts = Counter(self._tokenize(text))
+        return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+    def add_documents(self, descriptions: Iterable[str], keys: Optional[Iterable[Any]] = None) -> None:
+        """
+        Learn document frequencies from descriptions, e.g. a whole scraped batch before scoring it.
+
+        Args:
+            descriptions: Job descriptions
+            keys: Identifiers (job ids) so a description is only counted once
+        """
+        keys = list(keys) if keys is not None else None
+        for position, description in enumerate(descriptions):
+            key = keys[position] if keys is not None else None
+            self._add_document(self._term_frequencies(description or ''), key)
+
+    def _add_document(self, terms: Dict[str, float], key: Any = None) -> None:
+        if key is not None:
+            if key in self._seen_documents:
+                return
+            self._seen_documents.add(key)
+        self._document_frequency.update(terms.keys())
+        self._documents += 1
+
+    def _idf(self, term: str) -> float:
+        return math.log((self._documents + 1) / (self._document_frequency.get(term, 0) + 1)) + 1.0
+
+    def fit_estimate(self, description: str, key: Any = None) -> float:
+        """
+        Estimate how well the resume fits a description.
+
+        Args:
+            description: The job description
+            key: Job id, so the description is only counted once in the document frequencies
+
+        Returns:
+            Cosine similarity of the TF-IDF vectors scaled to 0-100
+        """
+        job_terms = self._term_frequencies(description or '')
+        self._add_document(job_terms, key)
+
+        if not job_terms or not self.resume_terms:
+            return 0.0
+
+        idf = {term: self._idf(term) for term in set(job_terms) | set(self.resume_terms)}
+        dot = sum(weight * idf[term] * self.resume_terms[term] * idf[term]
+                  for term, weight in job_terms.items() if term in self.resume_terms)
+        job_norm = math.sqrt(sum((weight * idf[term]) ** 2 for term, weight in job_terms.items()))
+        resume_norm = math.sqrt(sum((weight * idf[term]) ** 2 for term, weight in self.resume_terms.items()))
+
+        return 100.0 * dot / (job_norm * resume_norm) if job_norm and resume_norm else 0.0
+
+    def should_score(self, job_id: Any, description: str) -> bool:
+        """
+        Decide whether a posting is worth an LLM call and record its fit estimate.
+
+        Returns:
+            False when the fit estimate is below the cutoff
+        """
+        fit = self.fit_estimate(description, job_id)
+        self.fit_scores[job_id] = fit
+
+        if fit < self.cutoff:
+            self.skipped += 1
+            logger.info("Relevance gate skipped job %s: fit %.1f below cutoff %s", job_id, fit, self.cutoff)
+            return False
+
+        logger.info("Relevance gate fit for job %s: %.1f", job_id, fit)
+        return True
+
+    def record_llm_score(self, job_id: Any, overall_score: Any) -> None:
+        """Keep the LLM overall_score next to the fit estimate, to tune the cutoff."""
+        try:
+            self.llm_scores[job_id] = float(overall_score)
+        except (TypeError, ValueError):
+            pass
+
+    @staticmethod
+    def _percentiles(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {}
+        ordered = sorted(values)
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))], 1)
+        return {'min': percentile(0), 'p25': percentile(0.25), 'p50': percentile(0.5),
+                'p75': percentile(0.75), 'max': percentile(1)}
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the gate decisions.
+
+        Returns:
+            Dictionary with evaluated and skipped counts, the fit estimate distribution, the
+            distribution of fit estimates for jobs the LLM scored, and the (fit, overall_score)
+            pairs plus their correlation
+        """
+        pairs: List[Tuple[float, float]] = [
+            (round(self.fit_scores[job_id], 1), score)
+            for job_id, score in self.llm_scores.items() if job_id in self.fit_scores
+        ]
+
+        return {
+            'cutoff': self.cutoff,
+            'evaluated': len(self.fit_scores),
+            'skipped': self.skipped,
+            'fit_distribution': self._percentiles(list(self.fit_scores.values())),
+            'scored_fit_distribution': self._percentiles([fit for fit, _ in pairs]),
+            'fit_vs_llm_correlation': self._correlation(pairs),
+            'fit_vs_llm_score': pairs
+        }
+
+    @staticmethod
+    def _correlation(pairs: List[Tuple[float, float]]) -> Optional[float]:
+        """Pearson correlation between fit estimates and LLM scores, None with fewer than 3 pairs."""
+        if len(pairs) < 3:
+            return None
+        xs, ys = zip(*pairs)
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+        spread = math.sqrt(sum((x - mean_x) ** 2 for x in xs) * sum((y - mean_y) ** 2 for y in ys))
+        return round(covariance / spread, 3) if spread else None
+
+    def log_summary(self) -> None:
+        """Write the gate summary to the log."""
+        logger.info("Relevance gate summary: %s", self.summary())
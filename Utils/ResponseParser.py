@@ -0,0 +1,377 @@
+import json
+import logging
+import re
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+
+logger = logging.getLogger(__name__)
+
+class Recommendation(TypedDict):
+    category: str
+    recommendation: str
+    priority: str
+    example_before: Optional[str]
+    example_after: Optional[str]
+
+class AtsCompatibility(TypedDict):
+    score: Optional[int]
+    issues: Any
+
+class ScoringResult(TypedDict):
+    """Validated RESUME_PROMPT answer. Plain dict at runtime, so it is cached and journaled as JSON."""
+    overall_score: int
+    scoring_breakdown: Dict[str, Optional[int]]
+    gaps: List[str]
+    keyword_analysis: Dict[str, List[str]]
+    improvement_recommendations: List[Recommendation]
+    ats_compatibility: AtsCompatibility
+    summary: str
+
+class ResponseParseError(ValueError):
+    """The LLM answer could not be parsed or repaired into the scoring schema."""
+
+class ResponseParser:
+    """
+    Shared parser of the structured LLM answers of every agent.
+
+    The JSON object is found with or without a ```json fence, common defects are repaired
+    (trailing commas, single quotes, Python literals, output cut off before the closing braces)
+    and the result is validated against the RESUME_PROMPT schema. Only an answer that cannot be
+    repaired is sent back to the model, and the repair and retry rates are reported per provider.
+    """
+
+    FENCE = re.compile(r"```(?:json|JSON)?[ \t]*\n?(.*?)```", re.DOTALL)
+    PYTHON_LITERALS = re.compile(r"(True|False|None)\b")
+    JSON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+    SMART_QUOTES = str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'"})
+    NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+    # Weights of the overall_score formula in RESUME_PROMPT, used when the model leaves it out
+    SCORE_WEIGHTS = {'skills_match': 0.35, 'experience_relevance': 0.35, 'keywords_coverage': 0.20,
+                     'years_of_experience': 0.10}
+    RECOMMENDATION_FIELDS = ('category', 'recommendation', 'priority', 'example_before', 'example_after')
+
+    RETRY_INSTRUCTION = (
+        "Your previous answer could not be parsed ({error}). Answer again with only the single, raw, valid "
+        "JSON object of the required schema, without markdown fences or any text outside the JSON."
+    )
+
+    def __init__(self, name: str = 'llm', max_retries: int = 1):
+        """
+        Initialize the parser.
+
+        Args:
+            name: Provider name used in the logs
+            max_retries: Times an answer that cannot be repaired is asked again, 0 never re-queries
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self.stats = {'responses': 0, 'valid': 0, 'repaired': 0, 'invalid': 0, 'retries': 0, 'recovered_by_retry': 0}
+
+    # ------------------------------------------------------------------
+    # JSON extraction and repair
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _candidate(cls, text: str) -> str:
+        """The JSON object of an answer: the fenced block if any, from the first '{' to the last '}'."""
+        fenced = cls.FENCE.search(text)
+        if fenced:
+            text = fenced.group(1)
+
+        start = text.find('{')
+        if start == -1:
+            raise ResponseParseError("no JSON object in the answer")
+        end = text.rfind('}')
+        # No closing brace left when the output was cut off, repair closes it
+        return text[start:end + 1] if end > start else text[start:]
+
+    @staticmethod
+    def _closes_string(text: str, position: int) -> bool:
+        """A single quote ends a string only before , : } ] or the end, so "candidate's" stays one word."""
+        rest = text[position:].lstrip()
+        return not rest or rest[0] in ',:}]'
+
+    @staticmethod
+    def _strip_trailing_comma(out: List[str]) -> None:
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ',':
+            out.pop()
+
+    @classmethod
+    def repair(cls, text: str) -> str:
+        """
+        Rewrite almost-JSON into JSON in a single pass.
+
+        Single-quoted strings become double-quoted, True/False/None become true/false/null, trailing
+        commas are dropped, and an unterminated string and unclosed objects or arrays are closed.
+        """
+        text = text.translate(cls.SMART_QUOTES)
+        out: List[str] = []
+        closers: List[str] = []
+        quote = None
+        position = 0
+
+        while position < len(text):
+            character = text[position]
+
+            if quote is not None:
+                if character == '\\' and position + 1 < len(text):
+                    escaped = text[position + 1]
+                    # \' is not a JSON escape
+                    out.append("'" if escaped == "'" else character + escaped)
+                    position += 2
+                    continue
+                if character == quote and (quote == '"' or cls._closes_string(text, position + 1)):
+                    out.append('"')
+                    quote = None
+                elif character == '"':
+                    out.append('\\"')
+                else:
+                    out.append(character)
+                position += 1
+                continue
+
+            if character in '"\'':
+                quote = character
+                out.append('"')
+            elif character in '{[':
+                closers.append('}' if character == '{' else ']')
+                out.append(character)
+            elif character in '}]':
+                cls._strip_trailing_comma(out)
+                if closers:
+                    closers.pop()
+                out.append(character)
+            else:
+                literal = cls.PYTHON_LITERALS.match(text, position)
+                if literal and not (position and (text[position - 1].isalnum() or text[position - 1] == '_')):
+                    out.append(cls.JSON_LITERALS[literal.group(1)])
+                    position = literal.end()
+                    continue
+                out.append(character)
+            position += 1
+
+        # Output cut off: close the open string, drop a dangling comma or key separator, close the brackets
+        if quote is not None:
+            out.append('"')
+        cls._strip_trailing_comma(out)
+        if out and out[-1] == ':':
+            out.append('null')
+        out.extend(reversed(closers))
+        return ''.join(out)
+
+    @classmethod
+    def load_json(cls, text: str) -> Tuple[Any, bool]:
+        """
+        Parse the JSON object of an LLM answer, repairing it when needed.
+
+        Args:
+            text: Raw answer, fenced or not
+
+        Returns:
+            Tuple of (parsed value, True when it had to be repaired)
+
+        Raises:
+            ResponseParseError: No JSON object, or one the repair could not fix
+        """
+        candidate = cls._candidate(text.strip())
+        try:
+            return json.loads(candidate, strict=False), False
+        except ValueError:
+            pass
+
+        try:
+            return json.loads(cls.repair(candidate), strict=False), True
+        except ValueError as e:
+            raise ResponseParseError(f"invalid JSON: {e}") from e
+
+    @classmethod
+    def extract_json(cls, text: str) -> Optional[Any]:
+        """Parsed JSON of an LLM answer, None when there is none to be found."""
+        try:
+            return cls.load_json(text)[0]
+        except ResponseParseError as e:
+            logger.warning("LLM output is not JSON: %s", e)
+            return None
+
+    # ------------------------------------------------------------------
+    # Schema validation
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _score(cls, value: Any) -> Optional[int]:
+        """0-100 integer from 85, 85.4, '85' or '85/100', None when there is no number."""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            number = float(value)
+        else:
+            match = cls.NUMBER.search(str(value)) if value is not None else None
+            if not match:
+                return None
+            number = float(match.group(0))
+        return int(min(100, max(0, round(number))))
+
+    @staticmethod
+    def _strings(value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return [str(item) for item in value if item is not None]
+        return [str(value)]
+
+    @classmethod
+    def _recommendation(cls, value: Any) -> Recommendation:
+        if not isinstance(value, dict):
+            value = {'recommendation': str(value)}
+        recommendation = {field: value.get(field) for field in cls.RECOMMENDATION_FIELDS}
+        recommendation['category'] = str(recommendation['category'] or 'General')
+        recommendation['recommendation'] = str(recommendation['recommendation'] or '')
+        recommendation['priority'] = str(recommendation['priority'] or 'Medium')
+        return recommendation
+
+    @classmethod
+    def validate_scoring(cls, data: Any, screening: bool = False) -> Tuple[ScoringResult, List[str]]:
+        """
+        Validate a parsed answer against the RESUME_PROMPT schema and normalize its types.
+
+        Scores are coerced to integers, missing optional sections get empty defaults and a missing
+        overall_score is computed from scoring_breakdown with the prompt formula.
+
+        Args:
+            data: Parsed answer
+            screening: The answer is a SCREENING_PROMPT answer, where only overall_score is expected
+
+        Returns:
+            Tuple of (ScoringResult, list of the fixes applied)
+
+        Raises:
+            ResponseParseError: Not an object, or no overall score can be found or computed
+        """
+        if not isinstance(data, dict):
+            raise ResponseParseError(f"expected a JSON object, got {type(data).__name__}")
+
+        fixes = []
+        breakdown_data = data.get('scoring_breakdown') if isinstance(data.get('scoring_breakdown'), dict) else {}
+        breakdown = {field: cls._score(breakdown_data.get(field)) for field in cls.SCORE_WEIGHTS}
+
+        overall_score = cls._score(data.get('overall_score'))
+        if overall_score is None:
+            weights = {field: weight for field, weight in cls.SCORE_WEIGHTS.items() if breakdown[field] is not None}
+            if not weights:
+                raise ResponseParseError("no overall_score and no scoring_breakdown to compute it")
+            overall_score = round(sum(breakdown[field] * weight for field, weight in weights.items()) / sum(weights.values()))
+            fixes.append('overall_score computed from scoring_breakdown')
+        elif not isinstance(data.get('overall_score'), int) or isinstance(data.get('overall_score'), bool):
+            fixes.append('overall_score coerced to an integer')
+
+        recommendations = data.get('improvement_recommendations')
+        if not isinstance(recommendations, list):
+            if not screening:
+                fixes.append('improvement_recommendations missing')
+            recommendations = [] if recommendations is None else [recommendations]
+
+        ats = data.get('ats_compatibility')
+        if not isinstance(ats, dict):
+            if not screening:
+                fixes.append('ats_compatibility missing')
+            ats = {}
+        ats_issues = ats.get('issues')
+
+        keyword_analysis = data.get('keyword_analysis') if isinstance(data.get('keyword_analysis'), dict) else {}
+
+        result: ScoringResult = {
+            'overall_score': overall_score,
+            'scoring_breakdown': breakdown,
+            'gaps': cls._strings(data.get('gaps')),
+            'keyword_analysis': {'missing_keywords': cls._strings(keyword_analysis.get('missing_keywords'))},
+            'improvement_recommendations': [cls._recommendation(value) for value in recommendations],
+            'ats_compatibility': {
+                'score': cls._score(ats.get('score')),
+                # A list or a sentence, written to the sheet as the model returned it
+                'issues': ats_issues if isinstance(ats_issues, (list, str)) else cls._strings(ats_issues)
+            },
+            'summary': str(data.get('summary') or '')
+        }
+        return result, fixes
+
+    # ------------------------------------------------------------------
+    # Agent entry points
+    # ------------------------------------------------------------------
+
+    def parse_scoring(self, text: str, retry: bool = False, screening: bool = False) -> ScoringResult:
+        """
+        Parse, repair and validate one scoring answer, counting the outcome.
+
+        Args:
+            text: Raw answer of the model
+            retry: True when the answer is the reply to a retry_messages request
+            screening: The answer is a SCREENING_PROMPT answer, see validate_scoring
+
+        Returns:
+            The validated ScoringResult
+
+        Raises:
+            ResponseParseError: The answer cannot be used, see retry_messages
+        """
+        try:
+            data, repaired = self.load_json(text)
+            result, fixes = self.validate_scoring(data, screening)
+        except ResponseParseError as e:
+            with self._lock:
+                self.stats['responses'] += 1
+                self.stats['invalid'] += 1
+            logger.warning("%s answer could not be parsed: %s", self.name, e)
+            raise
+
+        with self._lock:
+            self.stats['responses'] += 1
+            self.stats['repaired' if repaired or fixes else 'valid'] += 1
+            if retry:
+                self.stats['recovered_by_retry'] += 1
+        if repaired or fixes:
+            logger.info("%s answer repaired: %s", self.name, ', '.join((['JSON syntax'] if repaired else []) + fixes))
+        return result
+
+    def retry_messages(self, messages: List[Any], response_text: str, error: Exception) -> List[Any]:
+        """
+        Messages asking the model to answer again after an answer that could not be repaired.
+
+        Args:
+            messages: Messages of the failed call
+            response_text: The unusable answer
+            error: Why it could not be used
+
+        Returns:
+            The original messages followed by the answer and the correction request
+        """
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        with self._lock:
+            self.stats['retries'] += 1
+        return list(messages) + [AIMessage(content=response_text),
+                                 HumanMessage(content=self.RETRY_INSTRUCTION.format(error=error))]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts plus the repair, retry and failure rates over the scored jobs."""
+        with self._lock:
+            stats = dict(self.stats)
+
+        # Every retry follows one invalid answer, the other invalid answers were final failures
+        jobs = stats['responses'] - stats['retries']
+        failed = stats['invalid'] - stats['retries']
+        stats.update({
+            'failed': failed,
+            'repair_rate': round(stats['repaired'] / stats['responses'], 4) if stats['responses'] else None,
+            'retry_rate': round(stats['retries'] / jobs, 4) if jobs else None,
+            'failure_rate': round(failed / jobs, 4) if jobs else None
+        })
+        return stats
+
+    def log_summary(self) -> None:
+        """Write the parser summary to the log."""
+        logger.info("%s response parsing summary: %s", self.name, self.summary())
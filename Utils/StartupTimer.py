@@ -0,0 +1,64 @@
+import importlib
+import logging
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class StartupTimer:
+    """
+    Wall time of each startup stage: module imports, client construction, first sync.
+
+    A module pulled in by an earlier stage is already loaded, so shared dependencies
+    (pandas, langchain_core) are charged to the first stage that imports them.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body of the with block as stage name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({'stage': name, 'seconds': time.perf_counter() - started})
+
+    def import_attribute(self, module_name: str, attribute: Optional[str] = None) -> Any:
+        """
+        Import a module on demand, timing it as its own stage.
+
+        Args:
+            module_name: Dotted module name, e.g. 'Agents.OpenAILLMAgent'
+            attribute: Name to return from the module, the module itself when None
+
+        Returns:
+            The module or its attribute
+        """
+        with self.stage(f"import {module_name}"):
+            module = importlib.import_module(module_name)
+        return getattr(module, attribute) if attribute else module
+
+    def summary(self) -> Dict[str, Any]:
+        """Total seconds since the timer was created and the stages, slowest first."""
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 3),
+            'stages': [{'stage': entry['stage'], 'seconds': round(entry['seconds'], 3)}
+                       for entry in sorted(self.stages, key=lambda entry: entry['seconds'], reverse=True)]
+        }
+
+    def report(self) -> str:
+        """Startup summary as a small text table."""
+        summary = self.summary()
+        width = max([len(entry['stage']) for entry in summary['stages']] + [len('total')])
+        lines = [f"{entry['stage']:<{width}}  {entry['seconds']:7.3f}s" for entry in summary['stages']]
+        lines.append(f"{'total':<{width}}  {summary['total_seconds']:7.3f}s")
+        return '\n'.join(lines)
+
+    def log_summary(self) -> None:
+        """Write the startup summary to the log."""
+        logger.info("Startup time summary: %s", self.summary())
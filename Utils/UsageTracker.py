@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import threading
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class UsageTracker:
+    """
+    Per-run accounting of LLM calls: tokens, wall-clock latency and estimated cost per provider, model and operation.
+
+    Agents report every call (including cache hits and failures), the aggregates are logged and written
+    as JSON next to the run log so spend can be followed without waiting for the provider bill.
+    """
+
+    # USD per million tokens: input, cached input (prompt cache read), cache write, output
+    PRICES = {
+        'gemini-2.0-flash': {'input': 0.10, 'cached_input': 0.025, 'cache_creation': 0.10, 'output': 0.40},
+        'gemini-2.0-flash-lite': {'input': 0.075, 'cached_input': 0.01875, 'cache_creation': 0.075, 'output': 0.30},
+        'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'cache_creation': 0.15, 'output': 0.60},
+        'gpt-4.1-nano': {'input': 0.10, 'cached_input': 0.025, 'cache_creation': 0.10, 'output': 0.40},
+        'claude-3-haiku-20240307': {'input': 0.25, 'cached_input': 0.03, 'cache_creation': 0.30, 'output': 1.25}
+    }
+
+    # Provider batch APIs (operations starting with 'batch_') bill half the interactive price
+    BATCH_DISCOUNT = 0.5
+
+    def __init__(self, prices: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            prices: Optional per-model prices merged over PRICES, same layout (USD per million tokens)
+        """
+        self.prices = dict(self.PRICES)
+        if prices:
+            self.prices.update(prices)
+
+        self._lock = threading.Lock()
+        self._calls: Dict[tuple, Dict[str, Any]] = defaultdict(self._empty_entry)
+
+    @staticmethod
+    def _empty_entry() -> Dict[str, Any]:
+        return {'calls': 0, 'cache_hits': 0, 'errors': 0, 'input_tokens': 0, 'output_tokens': 0,
+                'cached_input_tokens': 0, 'cache_creation_tokens': 0, 'latencies': []}
+
+    def estimate_cost(self, model: str, usage: Dict[str, int], batch: bool = False) -> Optional[float]:
+        """
+        Estimate the USD cost of one call from its token usage.
+
+        Args:
+            model: Model name
+            usage: Token counts as returned by LoadUtils.get_token_usage
+            batch: The call went through a provider batch API, see BATCH_DISCOUNT
+
+        Returns:
+            Cost in USD, None when the model has no known price
+        """
+        price = self.prices.get(model)
+        if price is None:
+            return None
+
+        cached = usage.get('cached_input_tokens', 0)
+        created = usage.get('cache_creation_tokens', 0)
+        # Providers report cache reads and writes as part of the input tokens
+        uncached = max(usage.get('input_tokens', 0) - cached - created, 0)
+
+        cost = (uncached * price['input'] + cached * price['cached_input']
+                + created * price['cache_creation'] + usage.get('output_tokens', 0) * price['output']) / 1_000_000
+        return cost * self.BATCH_DISCOUNT if batch else cost
+
+    def record(self, provider: str, model: str, operation: str, usage: Optional[Dict[str, int]] = None,
+               latency: Optional[float] = None, cache_hit: bool = False, error: bool = False) -> None:
+        """
+        Record one agent call.
+
+        Args:
+            provider: Provider name ('gemini', 'openai', 'claude')
+            model: Model name
+            operation: What the call was for ('screen', 'score', 'customize', 'batch_screen', 'batch_score')
+            usage: Token counts as returned by LoadUtils.get_token_usage, None for cache hits and failures
+            latency: Wall-clock seconds spent waiting for the provider
+            cache_hit: The response was served from the local LLM cache
+            error: The call failed
+        """
+        with self._lock:
+            entry = self._calls[(provider, model, operation)]
+            # A failure after a successful request (e.g. unparsable output) is counted as an error, not as another call
+            entry['calls'] += int(not error)
+            entry['cache_hits'] += int(cache_hit)
+            entry['errors'] += int(error)
+            for name, value in (usage or {}).items():
+                entry[name] = entry.get(name, 0) + value
+            if latency is not None and not cache_hit:
+                entry['latencies'].append(latency)
+
+    @staticmethod
+    def _percentile(ordered: List[float], p: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))], 3)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the recorded calls.
+
+        Returns:
+            Dictionary with one entry per provider/model/operation (calls, cache hits, errors, tokens,
+            p50/p95/max latency in seconds and estimated cost) and the run totals
+        """
+        with self._lock:
+            snapshot = {key: dict(entry, latencies=list(entry['latencies'])) for key, entry in self._calls.items()}
+
+        agents = []
+        total_cost = 0.0
+        totals = self._empty_entry()
+        del totals['latencies']
+
+        for (provider, model, operation), entry in sorted(snapshot.items()):
+            latencies = sorted(entry.pop('latencies'))
+            cost = self.estimate_cost(model, entry, batch=operation.startswith('batch_'))
+            total_cost += cost or 0.0
+            for name in totals:
+                totals[name] += entry.get(name, 0)
+
+            agents.append(dict(
+                entry,
+                provider=provider,
+                model=model,
+                operation=operation,
+                latency_p50=self._percentile(latencies, 0.5),
+                latency_p95=self._percentile(latencies, 0.95),
+                latency_max=self._percentile(latencies, 1),
+                latency_total=round(sum(latencies), 3),
+                estimated_cost_usd=round(cost, 6) if cost is not None else None
+            ))
+
+        totals['estimated_cost_usd'] = round(total_cost, 6)
+        return {'agents': agents, 'totals': totals}
+
+    @staticmethod
+    def summary_path(log_filename: str) -> str:
+        """Return the summary file that goes next to a run log, './Logs/app_log_X.log' -> './Logs/app_log_X_usage.json'."""
+        return f"{os.path.splitext(log_filename)[0]}_usage.json"
+
+    def write_summary(self, path: str) -> Dict[str, Any]:
+        """
+        Write the summary as JSON and log it.
+
+        Args:
+            path: Output file, usually summary_path(log_filename)
+
+        Returns:
+            The written summary
+        """
+        summary = self.summary()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+        logger.info("LLM usage summary: %s written to %s", summary['totals'], path)
+        return summary
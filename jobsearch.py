@@ -1,28 +1,43 @@
 import logging
 import os
-import pandas as pd
-import traceback
 import sys
-import asyncio
+import argparse
 
-from Sheets.GoogleSheetsManager import GoogleSheetsManager
-from Utils.LoadUtils import LoadUtils
-from dotenv import load_dotenv
 from datetime import datetime
-
-# Loading Agents
-from Agents.GeminiLLMAgent import GeminiLLMAgent
-from Agents.OpenAILLMAgent import OpenAILLMAgent
-from Agents.ClaudeLLMAgent import ClaudeLLMAgent
+from Utils.StartupTimer import StartupTimer
+
+# Created before the other imports, so the startup report covers them
+startup_timer = StartupTimer()
+
+with startup_timer.stage('import core modules'):
+    import pandas as pd
+
+    from Sheets.GoogleSheetsManager import GoogleSheetsManager
+    from Sheets.JobIndex import JobIndex
+    from Utils.LoadUtils import LoadUtils
+    from Utils.LogManager import LogManager
+    from Utils.LLMCache import LLMCache
+    from Utils.RelevanceGate import RelevanceGate
+    from Utils.DescriptionCompactor import DescriptionCompactor
+    from Utils.UsageTracker import UsageTracker
+    from Utils.RateLimiter import ProviderRateLimiter
+    from Utils.PdfRenderPool import PdfRenderPool
+    from Agents.CascadeAgent import CascadeAgent
+    from Pipeline.JobPipeline import JobPipeline
+    from Pipeline.JobPosting import JobPosting
+    from Pipeline.RunJournal import RunJournal
+    from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Loading job scraper classes
-from linkedin_jobs_scraper import LinkedinScraper
-from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
-from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
-from linkedin_jobs_scraper.filters import RelevanceFilters, TimeFilters, TypeFilters, ExperienceLevelFilters, OnSiteOrRemoteFilters, SalaryBaseFilters
+# Agents are imported when their provider is enabled, each one pulls in its own LangChain client.
+# The LinkedIn scraper (Selenium) is only imported when the run scrapes, see build_scraper.
+AGENT_CLASSES = {
+    'gemini': ('Agents.GeminiLLMAgent', 'GeminiLLMAgent'),
+    'openai': ('Agents.OpenAILLMAgent', 'OpenAILLMAgent'),
+    'claude': ('Agents.ClaudeLLMAgent', 'ClaudeLLMAgent')
+}
 
 # Generate a timestamped filename for the log file
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -30,245 +45,260 @@ log_filename = f"./Logs/app_log_{timestamp}.log"
 
 if __name__ == '__main__':
 
-    # Configure the logging module
-    logging.basicConfig(
-        filename=log_filename,
+    parser = argparse.ArgumentParser(description="Score LinkedIn jobs against your resume")
+    parser.add_argument('--resume', nargs='?', const='latest', default=None, metavar='RUN_ID',
+                        help="Finish an interrupted run from its journal instead of scraping, the latest unfinished run by default")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="Print how long each import and client construction took before the run starts")
+    args = parser.parse_args()
+
+    log_format = 'text' # 'json' writes one JSON object per log record, per-job records carry job_id and stage fields
+    log_payloads = 'truncate' # How prompts and generated resumes are logged: 'full', 'truncate' or 'hash'
+    log_payload_chars = 300 # Characters of each prompt or resume kept in the log with 'truncate'
+
+    # Configure the logging module, records are written to the file by a background thread
+    LogManager.configure(
+        log_filename,
         level=logging.INFO,  # Set the minimum logging level
-        format='%(asctime)s - %(levelname)s - %(message)s'
+        json_records=(log_format == 'json'),
+        payload_mode=log_payloads,
+        payload_chars=log_payload_chars
     )
 
     # Get a logger instance
     logger = logging.getLogger(__name__)
 
-    # Initialize the Google Sheets manager
-    manager = GoogleSheetsManager(
-        credentials_file=os.environ['google_sheets_credentials'],
-        spreadsheet_id=os.environ['spreadsheet_id'],
-        sheet_name='Jobs'
-    )
+    run_open_ai = False # Set to false if you do not want to run OpenAI LLM
+    run_claude_ai = False # Set to false if you do not want to run Anthropic Claude LLM
+    max_concurrent_llm_calls = 5 # How many jobs can be scored at the same time
+    provider_timeout = 120 # Seconds one LLM provider attempt may take before it is retried, waiting for quota or backing off is not counted
+    streaming = True # Score jobs while the scraper is still running, set to False to scrape everything first
+    scoring_queue_size = 50 # How many scraped jobs can wait for scoring before the scraper pauses
+    relevance_cutoff = 0 # Local resume/job fit (0-100) below which the LLM is not called, 0 only logs the fit estimates
+    description_token_budget = None # Maximum estimated tokens per job description sent to the LLM, None keeps the whole compacted text
+    pdf_render_workers = None # Processes rendering customized resumes to PDF, None uses one per core, 0 renders inline
+    customization_score = 80 # Minimum Gemini score that triggers a customized resume
+    cascade_scoring = False # Screen every job with a short overall-score-only prompt first, the full evaluation only runs above screening_threshold
+    screening_threshold = 60 # Screening score (0-100) needed for the full evaluation, keep it below customization_score
+    screening_models = {'gemini': 'gemini-2.0-flash-lite', 'openai': 'gpt-4.1-nano', 'claude': 'claude-3-haiku-20240307'} # Model of the screening tier per provider
+    provider_batch = False # Score the whole scrape through the provider batch APIs (half price, results within 24h), scrapes everything first like streaming = False
+    batch_poll_interval = 60 # Seconds between two status checks of a provider batch
 
-full_resume = LoadUtils.get_full_resume()
-
-# Fired once for each successfully processed job
-def on_data(data: EventData):
-    #print('[ON_DATA]', data.title, data.company, data.company_link, data.date, data.link, data.insights,
-    #      len(data.description))
-    job_postings.append([data.job_id, data.location, data.title, data.company,data.place, data.date, data.date_text,
-        data.link, data.apply_link, data.insights, data.description, data.skills])
-
-# Fired once for each page (25 jobs)
-def on_metrics(metrics: EventMetrics):
-    print('[ON_METRICS]', str(metrics))
-
-def on_error(error):
-    print('[ON_ERROR]', error)
-
-def on_end():
-    print('[ON_END]')
-
-scraper = LinkedinScraper(
-    chrome_executable_path=f"C:\chromedriver-win64\chromedriver.exe",  # Custom Chrome executable path (e.g. /foo/bar/bin/chromedriver)
-    chrome_binary_location=f"C:\Program Files\Google\Chrome\Application\chrome.exe",  # Custom path to Chrome/Chromium binary (e.g. /foo/bar/chrome-mac/Chromium.app/Contents/MacOS/Chromium)
-    chrome_options=None,  # Custom Chrome options here
-    headless=True,  # Overrides headless mode only if chrome_options is None
-    max_workers=1,  # How many threads will be spawned to run queries concurrently (one Chrome driver for each thread)
-    slow_mo=0.5,  # Slow down the scraper to avoid 'Too many requests 429' errors (in seconds)
-    page_load_timeout=240  # Page load timeout (in seconds)    
-)
-
-# Creating all Agents
-GeminiAgent = GeminiLLMAgent()
-OpenAIAgent = OpenAILLMAgent()
-ClaudeAgent = ClaudeLLMAgent()
-
-run_open_ai = False # Set to false if you do not want to run OpenAI LLM
-run_claude_ai = False # Set to false if you do not want to run Anthropic Claude LLM
-
-# Add event listeners
-scraper.on(Events.DATA, on_data)
-scraper.on(Events.ERROR, on_error)
-scraper.on(Events.END, on_end)
-
-queries = [
-    Query(
-        query='Product Manager',
-        options=QueryOptions(
-            locations=['United States'],
-            apply_link=True,  # Try to extract apply link (easy applies are skipped). If set to True, scraping is slower because an additional page must be navigated. Default to False.
-            skip_promoted_jobs=False,  # Skip promoted jobs. Default to False.
-            page_offset=0,  # How many pages to skip
-            limit=150,
-            filters=QueryFilters(
-                #company_jobs_url='https://www.linkedin.com/jobs/search/?f_C=1441%2C17876832%2C791962%2C2374003%2C18950635%2C16140%2C10440912&geoId=92000000',  # Filter by companies.                
-                relevance=RelevanceFilters.RECENT,
-                time=TimeFilters.DAY,
-                #type=[TypeFilters.FULL_TIME, TypeFilters.INTERNSHIP],
-                type=TypeFilters.FULL_TIME,
-                on_site_or_remote=[OnSiteOrRemoteFilters.REMOTE]
-                #experience=[ExperienceLevelFilters.MID_SENIOR],
-                #base_salary=SalaryBaseFilters.SALARY_160K
-            )
+    # Initialize the Google Sheets manager
+    with startup_timer.stage('connect to Google Sheets'):
+        manager = GoogleSheetsManager(
+            credentials_file=os.environ['google_sheets_credentials'],
+            spreadsheet_id=os.environ['spreadsheet_id'],
+            sheet_name='Jobs'
         )
-    ),
-]
-
-existing_records = manager.read_all_records()
-
-# Skip header row if it exists
-data_rows = existing_records[1:] if len(existing_records) > 1 else []
-
-job_postings = []
-scraper.run(queries)
-df = pd.DataFrame(job_postings, columns=['Job_ID','Location','Title', 'Company','Place','Date', 'Date_Text','Link','Apply_Link','Inisghts', 'Description', 'Skills'])
-logger.info("Using Scraper")
-#df = pd.read_csv("./jobs.csv")
-#logger.info("Using CSV")
-
-#df.to_csv("jobs.csv")
-
-# Create a set of existing URLs for O(1) lookup (index 7 is the URL)
-#existing_urls = {row[7] for row in data_rows if len(row) > 7}
-#It is better to check for duplicates using the job_id
-existing_ids = {row[0] for row in data_rows if len(row) > 0}
-
-for idx, item in df.iterrows():
-    try:
-        record_pd = item.tolist()
-        description = record_pd[10] if len(record_pd) > 10 else ''
-        # Get a logger instance
-        logger.info(f"Title: {record_pd[2]} ")
-        logger.info(f"Company: {record_pd[3]} ")
-        logger.info(f"Len of record_pd: {len(record_pd)}")
-        
-        #logger.debug(f"Description Variable: {description} ")
-        
-        #logger.debug(f"PD Values: {record_pd} ")
-        
-
-        # Extra safety: ensure it's a string
-        if not isinstance(description, str):
-            description = str(description) if description else ''
-        
-        salary_info = LoadUtils.extract_salary_info(description)
-        #print(f"description: {salary_info}")
-        logger.info(f"Has Salary : {salary_info['has_salary']} ")
-        logger.info(f"Has Salary : {salary_info['salary_text']} ")
-        logger.info(f"Has Salary : {salary_info['amount']} ")
-
-        if salary_info['has_salary']:
-            has_salary = True
-            
-            if salary_info['salary_text'] is None:
-                Salary_in_Threshold = True
-            else:
-                Salary_in_Threshold = LoadUtils.meets_minimum_salary(description,160000,'any')
-            """
-            if salary_info['salary_text']:
-                
-                print(f"💰 Salary found: {salary_info['salary_text']} and Salary Amount: {salary_info['amount']}")
-                print(f"Range: {LoadUtils.parse_salary_range(description)}")
-            else:
-                print(f"💰 Salary keywords detected")
-            """
-        else:
-            has_salary = False
-            Salary_in_Threshold = True
-            #print(f"⊘ No salary info")
-
-        logger.info(f"Has Salary in Threshold: {Salary_in_Threshold} ")
-        # Check if URL already exists (index 8)
-        #url = record_pd[8] if len(record_pd) > 8 else None
-        # Check if ID exist
-        record_pd_job_id = record_pd[0] if len(record_pd) > 0 else None
-
-        if Salary_in_Threshold:
-            if record_pd_job_id in existing_ids:
-                print(f"Value exists: {record_pd[3]}")
-                logger.info(f"Job already in Google Sheets ")
+
+    # The PDF is only parsed again when the file changed since the last run
+    with startup_timer.stage('load resume'):
+        full_resume = LoadUtils.get_full_resume()
+    resume_fingerprint = LoadUtils.get_resume_fingerprint(full_resume)
+    logger.info("Resume fingerprint: %s", resume_fingerprint)
+
+    def build_scraper():
+        """Import the LinkedIn scraper, create it and return it with the queries to run."""
+        with startup_timer.stage('import linkedin_jobs_scraper'):
+            from linkedin_jobs_scraper import LinkedinScraper
+            from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
+            from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
+            from linkedin_jobs_scraper.filters import RelevanceFilters, TimeFilters, TypeFilters, ExperienceLevelFilters, OnSiteOrRemoteFilters, SalaryBaseFilters
+
+        # Fired once for each successfully processed job
+        def on_data(data: EventData):
+            #print('[ON_DATA]', data.title, data.company, data.company_link, data.date, data.link, data.insights,
+            #      len(data.description))
+            job_posting = JobPosting.from_event(data)
+
+            if streaming:
+                # Blocks while the scoring queue is full, so the scraper never runs too far ahead
+                pipeline.submit(job_posting)
             else:
-                print(f"Record does not exist:x {record_pd[3]}")
-                logger.info(f"Job will be added to Google Sheets ")
-                
-                llm_response = GeminiAgent.execute_agent(description, full_resume)
-                
-                logger.info(f"Gemini LLM responses: ")
-                
-                recommendations = llm_response['improvement_recommendations']
-                formatted_list = '\n'.join([
-                    f"• [{rec['priority']}] {rec['category']}: {rec['recommendation']}, before: {rec['example_before']} , after: {rec['example_after']} " 
-                    for rec in recommendations
-                ])
-                
-                logger.info(f"Score: {llm_response['overall_score']} ")
-                logger.info(f"Recommendations: {formatted_list} ")
-                logger.info(f"ATS Score: {llm_response['ats_compatibility']['score']} ")
-                logger.info(f"ATS Issues: {llm_response['ats_compatibility']['issues']} ")
-
-                if llm_response['overall_score'] >= 80:
-                    llm_customization_resume_response = GeminiAgent.LLM_Resume_Customization(description, full_resume, formatted_list, llm_response['ats_compatibility']['issues'])
-                    logger.warning(f"Gemini LLM responses for Resume Customization:  {llm_customization_resume_response}")
-
-                    if llm_customization_resume_response is not None:
-                        resume_writing_response = LoadUtils.save_to_pdf(llm_customization_resume_response, record_pd[0], record_pd[2])
-                        if resume_writing_response:
-                            print(f"Saving Custimized Resume correctly.")
-
-                record_pd.append(salary_info['salary_text'])
-                record_pd.append(llm_response['overall_score'])
-                record_pd.append(formatted_list)
-                record_pd.append(llm_response['ats_compatibility']['score'])
-                record_pd.append(llm_response['ats_compatibility']['issues'])
-
-                if run_open_ai:
-                    OpenAIllm_response = OpenAIAgent.execute_agent(description, full_resume)
-
-                    logger.info(f"OpenAI LLM responses: ")
-                
-                    OpenAIrecommendations = OpenAIllm_response['improvement_recommendations']
-                    OpenAIformatted_list = '\n'.join([
-                        f"• [{OAIrec['priority']}] {OAIrec['category']}: {OAIrec['recommendation']}" 
-                        for OAIrec in OpenAIrecommendations
-                    ])
-                    
-                    logger.info(f"Open AI Score: {OpenAIllm_response['overall_score']} ")
-                    logger.info(f"Open AI Recommendations: {OpenAIformatted_list} ")
-                    logger.info(f"Open AI ATS Score: {OpenAIllm_response['ats_compatibility']['score']} ")
-                    logger.info(f"Open AI ATS Issues: {OpenAIllm_response['ats_compatibility']['issues']} ")
-
-                    record_pd.append(OpenAIllm_response['overall_score'])
-                    record_pd.append(OpenAIformatted_list)
-                    record_pd.append(OpenAIllm_response['ats_compatibility']['score'])
-                    record_pd.append(OpenAIllm_response['ats_compatibility']['issues'])
-
-                if run_claude_ai:
-                    Claudellm_response = ClaudeAgent.execute_agent(description, full_resume)
-
-                    logger.info(f"Claude LLM responses: ")
-                
-                    Clauderecommendations = Claudellm_response['improvement_recommendations']
-                    Claudeformatted_list = '\n'.join([
-                        f"• [{CLrec['priority']}] {CLrec['category']}: {CLrec['recommendation']}" 
-                        for CLrec in Clauderecommendations
-                    ])
-                    
-                    logger.info(f"Open AI Score: {Claudellm_response['overall_score']} ")
-                    logger.info(f"Open AI Recommendations: {Claudeformatted_list} ")
-                    logger.info(f"Open AI ATS Score: {Claudellm_response['ats_compatibility']['score']} ")
-                    logger.info(f"Open AI ATS Issues: {Claudellm_response['ats_compatibility']['issues']} ")
-
-                    record_pd.append(Claudellm_response['overall_score'])
-                    record_pd.append(Claudeformatted_list)
-                    record_pd.append(Claudellm_response['ats_compatibility']['score'])
-                    record_pd.append(Claudellm_response['ats_compatibility']['issues'])
-
-                #print(f"Record: {record_pd}")
-                result = manager.add_record(record_pd,key_columns=[8])
-                
-                if result['added']:
-                    existing_ids.add(record_pd_job_id)
-        else:
-            logger.info(f"Skipping Record, salary : {record_pd[2]} , Salary Info Low: {salary_info['salary_text']}")
-
-    except Exception as e:
-        print(f"Error in Jobs Search: {e}")
-        break
\ No newline at end of file
+                job_postings.append(job_posting)
+
+        # Fired once for each page (25 jobs)
+        def on_metrics(metrics: EventMetrics):
+            print('[ON_METRICS]', str(metrics))
+
+        def on_error(error):
+            print('[ON_ERROR]', error)
+
+        def on_end():
+            print('[ON_END]')
+
+        with startup_timer.stage('create LinkedinScraper'):
+            scraper = LinkedinScraper(
+                chrome_executable_path=f"C:\chromedriver-win64\chromedriver.exe",  # Custom Chrome executable path (e.g. /foo/bar/bin/chromedriver)
+                chrome_binary_location=f"C:\Program Files\Google\Chrome\Application\chrome.exe",  # Custom path to Chrome/Chromium binary (e.g. /foo/bar/chrome-mac/Chromium.app/Contents/MacOS/Chromium)
+                chrome_options=None,  # Custom Chrome options here
+                headless=True,  # Overrides headless mode only if chrome_options is None
+                max_workers=1,  # How many threads will be spawned to run queries concurrently (one Chrome driver for each thread)
+                slow_mo=0.5,  # Slow down the scraper to avoid 'Too many requests 429' errors (in seconds)
+                page_load_timeout=240  # Page load timeout (in seconds)    
+            )
+
+        # Add event listeners
+        scraper.on(Events.DATA, on_data)
+        scraper.on(Events.ERROR, on_error)
+        scraper.on(Events.END, on_end)
+
+        queries = [
+            Query(
+                query='Product Manager',
+                options=QueryOptions(
+                    locations=['United States'],
+                    apply_link=True,  # Try to extract apply link (easy applies are skipped). If set to True, scraping is slower because an additional page must be navigated. Default to False.
+                    skip_promoted_jobs=False,  # Skip promoted jobs. Default to False.
+                    page_offset=0,  # How many pages to skip
+                    limit=150,
+                    filters=QueryFilters(
+                        #company_jobs_url='https://www.linkedin.com/jobs/search/?f_C=1441%2C17876832%2C791962%2C2374003%2C18950635%2C16140%2C10440912&geoId=92000000',  # Filter by companies.                
+                        relevance=RelevanceFilters.RECENT,
+                        time=TimeFilters.DAY,
+                        #type=[TypeFilters.FULL_TIME, TypeFilters.INTERNSHIP],
+                        type=TypeFilters.FULL_TIME,
+                        on_site_or_remote=[OnSiteOrRemoteFilters.REMOTE]
+                        #experience=[ExperienceLevelFilters.MID_SENIOR],
+                        #base_salary=SalaryBaseFilters.SALARY_160K
+                    )
+                )
+            ),
+        ]
+
+        return scraper, queries
+
+    # Identical (model, prompt, resume, job) requests are answered from disk instead of calling the LLM again
+    llm_cache = LLMCache(os.environ.get('llm_cache_path', './Cache/llm_cache.sqlite'))
+
+    # Tokens, latency and estimated cost of every LLM call, written next to the log file at the end of the run
+    usage_tracker = UsageTracker()
+
+    # Requests/min and tokens/min quota of each provider, set them to the limits of your API tier
+    provider_rate_limits = {
+        'gemini': {'requests_per_minute': 2000, 'tokens_per_minute': 4000000},
+        'openai': {'requests_per_minute': 500, 'tokens_per_minute': 200000},
+        'claude': {'requests_per_minute': 50, 'tokens_per_minute': 50000}
+    }
+
+    # One shared limiter per provider: quota, 429/5xx retries with backoff and adaptive concurrency
+    rate_limiters = {name: ProviderRateLimiter(name, call_timeout=provider_timeout, **limits)
+                     for name, limits in provider_rate_limits.items()}
+
+    # Only the enabled providers are imported and created, every enabled agent receives the same job at the same time
+    enabled_providers = ['gemini']
+    if run_open_ai:
+        enabled_providers.append('openai')
+    if run_claude_ai:
+        enabled_providers.append('claude')
+
+    enabled_agents = {}
+    for provider_name in enabled_providers:
+        module_name, class_name = AGENT_CLASSES[provider_name]
+        agent_class = startup_timer.import_attribute(module_name, class_name)
+        with startup_timer.stage(f"create {class_name}"):
+            enabled_agents[provider_name] = agent_class(cache=llm_cache, usage_tracker=usage_tracker,
+                                                        rate_limiter=rate_limiters[provider_name])
+            if cascade_scoring:
+                # Both tiers share the provider quota and the answer parser
+                screener = agent_class(model=screening_models[provider_name], cache=llm_cache,
+                                       usage_tracker=usage_tracker, rate_limiter=rate_limiters[provider_name],
+                                       response_parser=enabled_agents[provider_name].response_parser,
+                                       screening=True)
+                enabled_agents[provider_name] = CascadeAgent(screener, enabled_agents[provider_name],
+                                                             screening_threshold=screening_threshold)
+
+    # One batch submission per provider instead of one call per job, the rate limiters are not used
+    batch_scorer = None
+    if provider_batch:
+        batch_scorer_class = startup_timer.import_attribute('Agents.BatchScorer', 'BatchScorer')
+        with startup_timer.stage('create batch backends'):
+            batch_scorer = batch_scorer_class(batch_scorer_class.default_backends(list(enabled_agents)),
+                                              poll_interval=batch_poll_interval)
+
+    # Local mirror of the job ids already in the sheet, only rows added since the last run are downloaded
+    with startup_timer.stage('sync job index'):
+        job_index = JobIndex(manager, os.environ.get('job_index_path', './Cache/job_index.sqlite'))
+        job_index.sync()
+
+    # Stage of every job of the run, an interrupted run is finished with --resume
+    journal_path = os.environ.get('run_journal_path', './Cache/run_journal.sqlite')
+    resume_run_id = RunJournal.latest_unfinished_run(journal_path) if args.resume == 'latest' else args.resume
+    if args.resume and resume_run_id is None:
+        print("No unfinished run to resume")
+        sys.exit(1)
+    journal = RunJournal(journal_path, run_id=resume_run_id)
+    logger.info("Run journal: %s", journal.run_id)
+
+    pipeline = JobPipeline(
+        agents=enabled_agents,
+        manager=manager,
+        job_index=job_index,
+        resume_text=full_resume,
+        min_salary=160000,
+        salary_check='any',
+        max_concurrency=max_concurrent_llm_calls,
+        provider_timeout=provider_timeout,
+        customization_score=customization_score,
+        queue_size=scoring_queue_size,
+        relevance_gate=RelevanceGate(full_resume, cutoff=relevance_cutoff),
+        description_compactor=DescriptionCompactor(max_tokens=description_token_budget),
+        pdf_pool=PdfRenderPool(pdf_render_workers) if pdf_render_workers != 0 else None,
+        journal=journal,
+        batch_scorer=batch_scorer
+    )
+
+    job_postings = []
+
+    # A resumed run replays its journal and never starts Chrome
+    if resume_run_id is None:
+        scraper, queries = build_scraper()
+
+    startup_timer.log_summary()
+    if args.startup_report:
+        print(startup_timer.report())
+
+    if resume_run_id is not None:
+        unfinished_jobs = journal.unfinished()
+        print(f"Resuming run {journal.run_id}: {len(unfinished_jobs)} unfinished jobs")
+        pipeline.run_resume(unfinished_jobs)
+    elif streaming and batch_scorer is None:
+        logger.info("Using Scraper, streaming jobs to the scoring workers")
+        pipeline.run_streaming(lambda: scraper.run(queries))
+    else:
+        scraper.run(queries)
+        logger.info("Using Scraper")
+        #job_postings = [JobPosting.from_row(row) for row in pd.read_csv("./jobs.csv").values.tolist()]
+        #logger.info("Using CSV")
+
+        #JobBatch(job_postings).frame().to_csv("jobs.csv", index=False)
+        pipeline.run_batch(job_postings)
+
+    # Wait for the customized resumes still being rendered
+    if pipeline.pdf_pool is not None:
+        pipeline.pdf_pool.close()
+
+    job_index.close()
+    journal.finish()
+    journal.close()
+    pipeline.relevance_gate.log_summary()
+    pipeline.description_compactor.log_summary()
+    if batch_scorer is not None:
+        batch_scorer.log_summary()
+
+    logger.info("LLM cache stats: %s", llm_cache.stats())
+    for provider_name, provider_agent in enabled_agents.items():
+        logger.info("%s prompt cache stats: %s", provider_name, provider_agent.prompt_cache_stats)
+        rate_limiters[provider_name].log_summary()
+        provider_agent.response_parser.log_summary()
+        # Deletes the Gemini context cache instead of paying for it until its TTL expires
+        if hasattr(provider_agent, 'close'):
+            provider_agent.close()
+        if cascade_scoring:
+            provider_agent.log_summary()
+    llm_cache.close()
+    usage_tracker.write_summary(UsageTracker.summary_path(log_filename))
+
+    # Write the log records still queued
+    LogManager.stop()